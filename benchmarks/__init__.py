@@ -0,0 +1,5 @@
+"""Benchmarks of icalendar.
+
+The benchmarks in benchmarks.py can be run with asv (airspeed velocity) or
+with ``python -m benchmarks.run`` from the root of the repository.
+"""
@@ -0,0 +1,96 @@
+"""Benchmark the CaselessDict that Component, Parameters and vRecur use.
+
+Compares the CaselessDict based on dict with the one based on OrderedDict
+that icalendar used before. The memory per component is measured for
+dictionaries with the properties of a typical event.
+
+Run it with::
+
+    python benchmarks/bench_caselessdict.py
+"""
+from collections import OrderedDict
+import timeit
+import tracemalloc
+
+from icalendar.caselessdict import CaselessDict
+from icalendar.parser_tools import to_unicode
+
+PROPERTIES = [
+    'UID', 'DTSTAMP', 'DTSTART', 'DTEND', 'SUMMARY', 'DESCRIPTION',
+    'LOCATION', 'ORGANIZER', 'ATTENDEE', 'CATEGORIES', 'SEQUENCE', 'STATUS',
+]
+
+
+class OrderedCaselessDict(OrderedDict):
+    """The CaselessDict of icalendar 5.0.11."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for key, value in self.items():
+            key_upper = to_unicode(key).upper()
+            if key != key_upper:
+                super().__delitem__(key)
+                self[key_upper] = value
+
+    def __getitem__(self, key):
+        key = to_unicode(key)
+        return super().__getitem__(key.upper())
+
+    def __setitem__(self, key, value):
+        key = to_unicode(key)
+        super().__setitem__(key.upper(), value)
+
+    def __contains__(self, key):
+        key = to_unicode(key)
+        return super().__contains__(key.upper())
+
+    def get(self, key, default=None):
+        key = to_unicode(key)
+        return super().get(key.upper(), default)
+
+
+def component_class(base):
+    """A class with the attributes that a Component has."""
+    class Component(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.subcomponents = []
+            self.errors = []
+    return Component
+
+
+def bytes_per_component(cls, number=10000):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    components = []
+    for i in range(number):
+        component = cls()
+        for name in PROPERTIES:
+            component[name] = i
+        components.append(component)
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return size / number
+
+
+def operations_per_second(statement, namespace, number=200000):
+    seconds = timeit.timeit(statement, globals=namespace, number=number)
+    return number / seconds
+
+
+def main():
+    classes = [('dict', CaselessDict), ('OrderedDict', OrderedCaselessDict)]
+    for title, cls in classes:
+        print(f'{title:<12} {bytes_per_component(component_class(cls)):>8,.0f}'
+              ' bytes per component')
+    for statement in [
+            "d['DTSTART']", "d['dtstart']", "'TZID' in d", "d.get('UID')",
+            "d['SUMMARY'] = 1", "d['summary'] = 1"]:
+        for title, cls in classes:
+            d = cls((name, 1) for name in PROPERTIES)
+            rate = operations_per_second(statement, {'d': d})
+            print(f'{statement:<18} {title:<12} {rate:>12,.0f} ops/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark splitting content lines into (name, parameters, value) parts.
+
+Compares the single pass tokenizer of Contentline.parts() with the
+character by character scan that is used as a fallback.
+
+Run it with::
+
+    python benchmarks/bench_contentline.py
+"""
+import timeit
+
+from icalendar.parser import Contentline
+
+LINES = [
+    'BEGIN:VEVENT',
+    'UID:040000008200E00074C5B7101A82E00800000000@example.com',
+    'DTSTAMP:20231104T101500Z',
+    'DTSTART;TZID=W. Europe Standard Time:20231106T090000',
+    'DTEND;TZID=W. Europe Standard Time:20231106T100000',
+    'RRULE:FREQ=WEEKLY;UNTIL=20240630T070000Z;INTERVAL=1;BYDAY=MO,WE,FR',
+    'SUMMARY:Weekly planning\\, sync and review',
+    'LOCATION:Room 4.12; second floor',
+    'ORGANIZER;CN="Doe, Jane":mailto:jane.doe@example.com',
+    'ATTENDEE;ROLE=REQ-PARTICIPANT;PARTSTAT=NEEDS-ACTION;RSVP=TRUE;'
+    'CN=John Smith:mailto:john.smith@example.com',
+    'ATTENDEE;CUTYPE=INDIVIDUAL;ROLE=OPT-PARTICIPANT;PARTSTAT=ACCEPTED;'
+    'CN="Müller, Jörg";X-NUM-GUESTS=0:mailto:joerg.mueller@example.com',
+    'DESCRIPTION:Agenda:\\n1. Status\\n2. Planning\\n3. Any other business'
+    '\\nPlease prepare your updates in advance.',
+    'X-MICROSOFT-CDO-BUSYSTATUS:BUSY',
+    'END:VEVENT',
+]
+
+
+def lines_per_second(function, lines, number):
+    seconds = timeit.timeit(
+        lambda: [function(line) for line in lines], number=number)
+    return len(lines) * number / seconds
+
+
+def main(number=20000):
+    lines = [Contentline(line) for line in LINES]
+    for title, function in [
+            ('Contentline.parts()', Contentline.parts),
+            ('Contentline._scan_parts()', Contentline._scan_parts)]:
+        rate = lines_per_second(function, lines, number)
+        print(f'{title:<28} {rate:>12,.0f} lines/sec')
+
+
+if __name__ == '__main__':
+    main()
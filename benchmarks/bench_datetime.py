@@ -0,0 +1,51 @@
+"""Benchmark parsing DATE-TIME and DATE values.
+
+Covers the UTC, floating and TZID forms with vDDDTypes.from_ical(), which
+is used for DTSTART, DTEND, DTSTAMP, EXDATE and others. TZID values are
+parsed with timestamps that repeat, like they do for recurring events, and
+with timestamps that are all different.
+
+Run it with::
+
+    python benchmarks/bench_datetime.py
+"""
+import timeit
+
+from icalendar.prop import vDDDTypes
+
+CASES = [
+    ('UTC', ['20231104T101500Z'], None),
+    ('floating', ['20231104T101500'], None),
+    ('date', ['20231104'], None),
+    ('TZID Olson', ['20231104T101500'], 'Europe/Berlin'),
+    ('TZID Windows', ['20231104T101500'], 'W. Europe Standard Time'),
+    ('TZID unique times',
+     [f'2023{month:02}{day:02}T{hour:02}{minute:02}00'
+      for month in range(1, 13) for day in range(1, 29)
+      for hour in range(0, 24, 6) for minute in range(0, 60, 15)],
+     'Europe/Berlin'),
+]
+
+
+def values_per_second(values, tzid, number):
+    if tzid is None:
+        def parse():
+            for value in values:
+                vDDDTypes.from_ical(value)
+    else:
+        def parse():
+            for value in values:
+                vDDDTypes.from_ical(value, timezone=tzid)
+    seconds = timeit.timeit(parse, number=number)
+    return len(values) * number / seconds
+
+
+def main(count=200000):
+    for title, values, tzid in CASES:
+        number = max(1, count // len(values))
+        rate = values_per_second(values, tzid, number)
+        print(f'{title:<20} {rate:>12,.0f} values/sec')
+
+
+if __name__ == '__main__':
+    main()
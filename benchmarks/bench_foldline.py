@@ -0,0 +1,60 @@
+"""Benchmark folding long content lines.
+
+Compares foldline() and Contentline.to_ical(), which fold non-ASCII lines
+on their UTF-8 bytes, with folding character by character. The lines are
+DESCRIPTIONs of 10 KB and 1 MB.
+
+Run it with::
+
+    python benchmarks/bench_foldline.py
+"""
+import random
+import timeit
+
+from icalendar.parser import Contentline, _fold_characters, foldline
+
+ALPHABETS = {
+    'ASCII': 'abcdefghijklmnopqrstuvwxyz ',
+    'Latin': 'aäöüßéèñ ',
+    'CJK': '会議予定회의',
+    'emoji': '📅✅👍',
+    'mixed': 'abcdefäöü会議📅 ',
+}
+
+SIZES = {'10 KB': 10 * 1024, '1 MB': 1024 * 1024}
+
+
+def description(alphabet, size):
+    """A DESCRIPTION line of about size bytes."""
+    rng = random.Random(size)
+    characters = []
+    length = len('DESCRIPTION:')
+    while length < size:
+        character = rng.choice(alphabet)
+        characters.append(character)
+        length += len(character.encode('utf-8'))
+    return Contentline('DESCRIPTION:' + ''.join(characters))
+
+
+def megabytes_per_second(function, line, number):
+    seconds = timeit.timeit(lambda: function(line), number=number)
+    return len(line.encode('utf-8')) * number / seconds / 1024 / 1024
+
+
+def main():
+    for size_name, size in SIZES.items():
+        number = max(1, 20 * 1024 * 1024 // size)
+        for name, alphabet in ALPHABETS.items():
+            line = description(alphabet, size)
+            for title, function in [
+                    ('foldline()', foldline),
+                    ('Contentline.to_ical()', Contentline.to_ical),
+                    ('by character', lambda line: _fold_characters(
+                        line, 75, '\r\n '))]:
+                rate = megabytes_per_second(function, line, number)
+                print(f'{size_name:<6} {name:<6} {title:<22} '
+                      f'{rate:>10,.1f} MB/sec')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark the free and busy time of many calendars.
+
+Each attendee has a calendar with 50 generated events, which they
+organize. batch_freebusy() with a process pool is compared to parsing the
+calendars and calling Calendar.freebusy() one by one in this process.
+The time window is one month.
+
+Run it with::
+
+    python -m benchmarks.bench_freebusy
+    python -m benchmarks.bench_freebusy 10 100 --workers 4
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import os
+import time
+
+from benchmarks.generate import generate_calendar
+from icalendar import Calendar, batch_freebusy
+
+CALENDARS = [10, 100, 1000]
+EVENTS = 50
+START = datetime(2025, 3, 1)
+END = datetime(2025, 4, 1)
+
+
+def calendars_of(count):
+    """The calendars of the attendees as bytes."""
+    calendars = {}
+    for number in range(count):
+        attendee = f'mailto:user{number}@example.com'
+        calendars[attendee] = generate_calendar(EVENTS, number).replace(
+            b'mailto:jane@example.com', attendee.encode())
+    return calendars
+
+
+def serial(calendars):
+    for attendee, ics in calendars.items():
+        Calendar.from_ical(ics, lazy=True).freebusy(START, END, attendee)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('calendars', type=int, nargs='*', default=CALENDARS,
+                        help='the numbers of calendars')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='the number of worker processes')
+    args = parser.parse_args(argv)
+    print(f'{args.workers} worker processes, {EVENTS} events per calendar')
+    with ProcessPoolExecutor(args.workers) as executor:
+        # start the workers before timing
+        list(executor.map(abs, range(args.workers)))
+        for count in args.calendars:
+            calendars = calendars_of(count)
+            started = time.perf_counter()
+            serial(calendars)
+            serial_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            availability = batch_freebusy(
+                calendars, START, END, executor=executor,
+                chunksize=max(1, count // (args.workers * 4)))
+            batch_seconds = time.perf_counter() - started
+            print(f'{count:>5} calendars  serial {serial_seconds:8.2f}s  '
+                  f'batch {batch_seconds:8.2f}s  '
+                  f'{len(availability.free):>4} free periods')
+
+
+if __name__ == '__main__':
+    main()
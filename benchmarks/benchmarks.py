@@ -0,0 +1,144 @@
+"""Benchmarks of parsing and serializing calendars.
+
+The classes follow the conventions of asv (airspeed velocity): setup()
+prepares the data, methods starting with time_ are timed and methods
+starting with peakmem_ measure the peak memory. Each benchmark runs for
+calendars with 1000, 10000 and 100000 events from
+benchmarks.generate.generate_calendar().
+"""
+import os
+import shutil
+import tempfile
+
+from benchmarks.generate import generate_calendar
+from icalendar import Calendar
+from icalendar.timezone_cache import TimezoneCache, _timezone_cache
+from icalendar.timezone_cache import timezone_from_json, timezone_to_json
+
+EVENTS = [1000, 10000, 100000]
+
+
+class Parse:
+    """Calendar.from_ical()"""
+
+    params = EVENTS
+    param_names = ['events']
+    timeout = 600
+
+    def setup(self, events):
+        self.ics = generate_calendar(events)
+
+    def time_from_ical(self, events):
+        Calendar.from_ical(self.ics)
+
+    def peakmem_from_ical(self, events):
+        Calendar.from_ical(self.ics)
+
+
+class Serialize:
+    """Calendar.to_ical() and Calendar.write_ical()"""
+
+    params = EVENTS
+    param_names = ['events']
+    timeout = 600
+
+    def setup(self, events):
+        self.calendar = Calendar.from_ical(generate_calendar(events))
+
+    def time_to_ical(self, events):
+        self.calendar.to_ical()
+
+    def peakmem_to_ical(self, events):
+        self.calendar.to_ical()
+
+    def time_write_ical(self, events):
+        with open(os.devnull, 'wb') as f:
+            self.calendar.write_ical(f)
+
+    def peakmem_write_ical(self, events):
+        with open(os.devnull, 'wb') as f:
+            self.calendar.write_ical(f)
+
+
+class Walk:
+    """Calendar.walk()"""
+
+    params = EVENTS
+    param_names = ['events']
+    timeout = 600
+
+    def setup(self, events):
+        self.calendar = Calendar.from_ical(generate_calendar(events))
+
+    def time_walk(self, events):
+        self.calendar.walk()
+
+    def time_walk_events(self, events):
+        self.calendar.walk('VEVENT')
+
+
+class Decoded:
+    """Component.decoded() of the common properties of events"""
+
+    params = EVENTS
+    param_names = ['events']
+    timeout = 600
+
+    def setup(self, events):
+        calendar = Calendar.from_ical(generate_calendar(events))
+        self.events = calendar.walk('VEVENT')
+
+    def time_decoded(self, events):
+        for event in self.events:
+            event.decoded('DTSTART')
+            event.decoded('DTEND')
+            event.decoded('SUMMARY')
+            event.decoded('DESCRIPTION')
+
+
+class ToColumns:
+    """Calendar.to_columns() of the common properties of events"""
+
+    params = EVENTS
+    param_names = ['events']
+    timeout = 600
+    fields = ['UID', 'DTSTART', 'DTEND', 'SUMMARY', 'SEQUENCE', 'ATTENDEE']
+
+    def setup(self, events):
+        self.calendar = Calendar.from_ical(generate_calendar(events))
+
+    def time_to_columns(self, events):
+        self.calendar.to_columns(self.fields)
+
+    def peakmem_to_columns(self, events):
+        self.calendar.to_columns(self.fields)
+
+
+class TimezoneToTz:
+    """Timezone.to_tz() of the VTIMEZONEs of the calendars"""
+
+    def setup(self):
+        calendar = Calendar.from_ical(generate_calendar(0))
+        self.timezones = calendar.walk('VTIMEZONE')
+        self.json = [timezone_to_json(timezone.to_tz())
+                     for timezone in self.timezones]
+        self.directory = tempfile.mkdtemp()
+        TimezoneCache(directory=self.directory).compile(self.timezones[0])
+
+    def teardown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_to_tz(self):
+        for timezone in self.timezones:
+            timezone.to_tz()
+
+    def time_compile_cached(self):
+        for timezone in self.timezones:
+            _timezone_cache.compile(timezone)
+
+    def time_from_json(self):
+        for data in self.json:
+            timezone_from_json(data)
+
+    def time_compile_warm_directory(self):
+        TimezoneCache(directory=self.directory).compile(self.timezones[0])
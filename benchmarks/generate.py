@@ -0,0 +1,166 @@
+"""Generate synthetic calendars for the benchmarks.
+
+The calendars contain VTIMEZONEs of the tz database and custom ones,
+recurring events, attendees and long descriptions that are folded.
+They are the same for the same arguments.
+
+Write a calendar to a file with::
+
+    python benchmarks/generate.py 10000 > calendar.ics
+"""
+import random
+import sys
+from functools import lru_cache
+
+VTIMEZONES = {
+    'Europe/Berlin': (
+        'BEGIN:VTIMEZONE',
+        'TZID:Europe/Berlin',
+        'BEGIN:DAYLIGHT',
+        'TZOFFSETFROM:+0100',
+        'TZOFFSETTO:+0200',
+        'TZNAME:CEST',
+        'DTSTART:19700329T020000',
+        'RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU',
+        'END:DAYLIGHT',
+        'BEGIN:STANDARD',
+        'TZOFFSETFROM:+0200',
+        'TZOFFSETTO:+0100',
+        'TZNAME:CET',
+        'DTSTART:19701025T030000',
+        'RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU',
+        'END:STANDARD',
+        'END:VTIMEZONE',
+    ),
+    'Pacific Standard Time': (
+        'BEGIN:VTIMEZONE',
+        'TZID:Pacific Standard Time',
+        'BEGIN:STANDARD',
+        'DTSTART:16010101T020000',
+        'TZOFFSETFROM:-0700',
+        'TZOFFSETTO:-0800',
+        'RRULE:FREQ=YEARLY;INTERVAL=1;BYDAY=1SU;BYMONTH=11',
+        'END:STANDARD',
+        'BEGIN:DAYLIGHT',
+        'DTSTART:16010101T020000',
+        'TZOFFSETFROM:-0800',
+        'TZOFFSETTO:-0700',
+        'RRULE:FREQ=YEARLY;INTERVAL=1;BYDAY=2SU;BYMONTH=3',
+        'END:DAYLIGHT',
+        'END:VTIMEZONE',
+    ),
+    'Custom/Kathmandu': (
+        'BEGIN:VTIMEZONE',
+        'TZID:Custom/Kathmandu',
+        'BEGIN:STANDARD',
+        'DTSTART:19700101T000000',
+        'TZOFFSETFROM:+0545',
+        'TZOFFSETTO:+0545',
+        'TZNAME:+0545',
+        'END:STANDARD',
+        'END:VTIMEZONE',
+    ),
+}
+
+WORDS = (
+    'calendar', 'meeting', 'planning', 'review', 'budget', 'release',
+    'customer', 'agenda', 'follow-up', 'quarterly', 'Besprechung',
+    'Überprüfung', 'réunion', 'équipe', '会議', '予定', '회의', 'встреча',
+    '📅', '✅',
+)
+
+RULES = (
+    'FREQ=WEEKLY;BYDAY=MO,WE,FR',
+    'FREQ=DAILY;COUNT=30',
+    'FREQ=MONTHLY;BYDAY=2TU;UNTIL=20261231T000000Z',
+    'FREQ=YEARLY',
+)
+
+
+def fold(line):
+    """Fold a content line at 75 octets."""
+    result = []
+    size = 0
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > 75:
+            result.append('\r\n ')
+            size = 1
+        result.append(char)
+        size += char_size
+    return ''.join(result)
+
+
+def text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def event_lines(rng, number):
+    """The content lines of an event."""
+    tzid = rng.choice(list(VTIMEZONES))
+    day = rng.randrange(1, 29)
+    month = rng.randrange(1, 13)
+    hour = rng.randrange(7, 19)
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{number:08}-{rng.getrandbits(64):016x}@example.com',
+        f'DTSTAMP:2024{month:02}{day:02}T{hour:02}0000Z',
+        f'SEQUENCE:{rng.randrange(3)}',
+        f'SUMMARY:{text(rng, rng.randrange(2, 6))}',
+    ]
+    if rng.random() < 0.05:
+        lines += [
+            f'DTSTART;VALUE=DATE:2025{month:02}{day:02}',
+            f'DTEND;VALUE=DATE:2025{month:02}{day + 1:02}',
+        ]
+    else:
+        lines += [
+            f'DTSTART;TZID={tzid}:2025{month:02}{day:02}T{hour:02}0000',
+            f'DTEND;TZID={tzid}:2025{month:02}{day:02}T{hour + 1:02}3000',
+        ]
+        if rng.random() < 0.2:
+            lines.append(f'RRULE:{rng.choice(RULES)}')
+            if rng.random() < 0.3:
+                lines.append(f'EXDATE;TZID={tzid}:'
+                             f'2025{month:02}{day:02}T{hour:02}0000')
+    lines += [
+        f'DESCRIPTION:{text(rng, rng.randrange(20, 400))}\\n'
+        f'{text(rng, rng.randrange(0, 40))}',
+        f'LOCATION:Room {rng.randrange(100)}\\, building {rng.randrange(9)}',
+        'ORGANIZER;CN="Organizer, Jane":mailto:jane@example.com',
+    ]
+    for attendee in range(rng.randrange(0, 9)):
+        lines.append(
+            f'ATTENDEE;CUTYPE=INDIVIDUAL;ROLE=REQ-PARTICIPANT;'
+            f'PARTSTAT={rng.choice(("ACCEPTED", "TENTATIVE", "NEEDS-ACTION"))};'
+            f'RSVP=TRUE;CN=Attendee {attendee}:'
+            f'mailto:attendee{attendee}@example.com')
+    lines += [
+        f'CATEGORIES:{rng.choice(WORDS)},{rng.choice(WORDS)}',
+        'TRANSP:OPAQUE',
+        'STATUS:CONFIRMED',
+        'END:VEVENT',
+    ]
+    return lines
+
+
+@lru_cache(maxsize=4)
+def generate_calendar(events=1000, seed=0):
+    """Return a calendar with events as bytes."""
+    rng = random.Random(seed)
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//icalendar//benchmarks//EN',
+        'CALSCALE:GREGORIAN',
+    ]
+    for vtimezone in VTIMEZONES.values():
+        lines.extend(vtimezone)
+    for number in range(events):
+        lines.extend(event_lines(rng, number))
+    lines.append('END:VCALENDAR')
+    return ''.join(fold(line) + '\r\n' for line in lines).encode('utf-8')
+
+
+if __name__ == '__main__':
+    sys.stdout.buffer.write(generate_calendar(int(sys.argv[1])))
@@ -0,0 +1,139 @@
+"""Run the benchmarks of benchmarks.py without asv.
+
+Each time_ method is timed and each time_ and peakmem_ method is run
+again with tracemalloc to record the peak memory that Python allocates.
+The results can be saved as JSON and compared to the results of another
+commit::
+
+    python -m benchmarks.run --events 1000 10000 --output new.json
+    python -m benchmarks.run --events 1000 10000 --compare old.json
+
+Run it from the root of the repository with icalendar installed or with
+PYTHONPATH=src.
+"""
+import argparse
+import gc
+import inspect
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks import benchmarks
+
+
+def benchmark_classes():
+    return [cls for _, cls in inspect.getmembers(benchmarks, inspect.isclass)
+            if cls.__module__ == benchmarks.__name__]
+
+
+def commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure_time(method, args, repeat):
+    """The minimum of repeat runs in seconds."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        method(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure_memory(method, args):
+    """The peak of the memory allocated by method in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        method(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(events, repeat=3, select=None):
+    """Run the benchmarks and return the results by name."""
+    results = {}
+    for cls in benchmark_classes():
+        methods = [name for name in dir(cls)
+                   if name.startswith(('time_', 'peakmem_'))]
+        params = getattr(cls, 'params', None)
+        arguments = [(value,) for value in params if value in events] \
+            if params else [()]
+        for args in arguments:
+            instance = cls()
+            prepared = False
+            for name in methods:
+                key = f'{cls.__name__}.{name}'
+                if args:
+                    key += f'({args[0]})'
+                if select and select not in key:
+                    continue
+                if not prepared:
+                    instance.setup(*args)
+                    prepared = True
+                method = getattr(instance, name)
+                result = {}
+                if name.startswith('time_'):
+                    result['seconds'] = measure_time(method, args, repeat)
+                result['peak_bytes'] = measure_memory(method, args)
+                results[key] = result
+                print(format_result(key, result), flush=True)
+            if prepared and hasattr(instance, 'teardown'):
+                instance.teardown(*args)
+    return results
+
+
+def format_result(key, result, old=None):
+    line = f'{key:<42}'
+    if 'seconds' in result:
+        line += f' {result["seconds"]:>10.4f} s'
+    else:
+        line += ' ' * 13
+    line += f' {result["peak_bytes"] / 2 ** 20:>10.1f} MiB'
+    if old:
+        if 'seconds' in result and 'seconds' in old:
+            line += f'  time x{result["seconds"] / old["seconds"]:.2f}'
+        if old['peak_bytes']:
+            line += f'  memory x{result["peak_bytes"] / old["peak_bytes"]:.2f}'
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--events', type=int, nargs='+', default=[1000, 10000],
+                        help='the numbers of events of the calendars')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='how often each benchmark is timed')
+    parser.add_argument('--select', help='run benchmarks with this in the name')
+    parser.add_argument('--output', help='save the results in a JSON file')
+    parser.add_argument('--compare', help='compare to the results of a file')
+    args = parser.parse_args(argv)
+
+    results = run(args.events, args.repeat, args.select)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'commit': commit(),
+                'python': platform.python_version(),
+                'results': results,
+            }, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print(f'\ncompared to {old.get("commit")}:')
+        for key, result in results.items():
+            print(format_result(key, result, old['results'].get(key)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,10 @@ from icalendar.cal import (
     Alarm,
     ComponentFactory,
 )
+from icalendar.aio import aiter_components
+from icalendar.availability import batch_freebusy
+from icalendar.index import CalendarIndex
+from icalendar.patch import CalendarPatch
 # Property Data Value Types
 from icalendar.prop import (
     vBinary,
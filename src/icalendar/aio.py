@@ -0,0 +1,85 @@
+"""Parse calendars from asyncio streams.
+
+aiter_components() is the asynchronous version of
+Component.iter_components(). It reads an asyncio.StreamReader or any
+asynchronous iterator of bytes in chunks, unfolds the lines of each chunk
+and yields the parsed components one by one::
+
+    reader, writer = await asyncio.open_connection(host, port)
+    async for component in aiter_components(reader):
+        ...
+
+Parsing does not await anything, so it gives control back to the event
+loop after every yield_every content lines.
+"""
+import asyncio
+
+from icalendar.cal import _ComponentBuilder
+from icalendar.parser import unfold_lines
+
+
+# the number of bytes read at once from objects with a read() coroutine
+CHUNK_SIZE = 64 * 1024
+
+
+async def _chunks(reader):
+    """The chunks of a stream reader or an asynchronous iterator."""
+    if hasattr(reader, 'read'):
+        while True:
+            chunk = await reader.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in reader:
+            yield chunk
+
+
+async def _line_batches(reader):
+    """Split the chunks into lists of complete lines.
+
+    A line that could be continued by a folded line in the next chunk is
+    kept back, so that each list can be unfolded on its own.
+    """
+    rest = None
+    async for chunk in _chunks(reader):
+        if not chunk:
+            continue
+        if rest:
+            chunk = rest + chunk
+        newline = b'\n' if isinstance(chunk, bytes) else '\n'
+        lines = chunk.split(newline)
+        start = len(lines) - 1
+        while start > 0 and (not lines[start].strip()
+                             or lines[start][:1] in (' ', '\t', b' ', b'\t')):
+            start -= 1
+        if start:
+            yield lines[:start]
+        rest = newline.join(lines[start:])
+    if rest:
+        yield rest.split(b'\n' if isinstance(rest, bytes) else '\n')
+
+
+async def aiter_components(reader, lazy=False, yield_every=1000):
+    """Parse a stream and yield the subcomponents of the calendar one by one.
+
+    The components are the same as the ones of Component.iter_components().
+
+    :param reader: An asyncio.StreamReader, an object with a read()
+                   coroutine or an asynchronous iterator of bytes or str.
+                   The chunks do not need to end at line breaks.
+    :param lazy: Decode property values on first access, see from_ical().
+    :param yield_every: The number of content lines after which control
+                        is given back to the event loop.
+    """
+    builder = _ComponentBuilder(detach=True, lazy=lazy)
+    count = 0
+    async for lines in _line_batches(reader):
+        for line in unfold_lines(lines):
+            component = builder.feed(line)
+            if component is not None:
+                yield component
+            count += 1
+            if count >= yield_every:
+                count = 0
+                await asyncio.sleep(0)
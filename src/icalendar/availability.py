@@ -0,0 +1,106 @@
+"""Free and busy time of many calendars at once.
+
+batch_freebusy() computes the busy periods of the calendars of many
+attendees in worker processes and the free time that they have in common,
+e.g. to find a time for a meeting::
+
+    availability = batch_freebusy({
+        'mailto:alice@example.com': alice_ics,
+        'mailto:bob@example.com': bob_calendar,
+    }, start, end, duration=timedelta(minutes=30))
+    availability.free  # [(start, end), ...] in UTC
+
+The calendars can be Calendar objects or the bytes or strings of .ics
+files. Raw .ics files are parsed in the worker processes, so they are
+cheaper to send to them than Calendar objects, which are pickled.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge
+from itertools import repeat
+
+import pytz
+
+from icalendar.cal import Calendar
+from icalendar.cal import Component
+from icalendar.freebusy import BUSY
+from icalendar.freebusy import BUSY_TENTATIVE
+from icalendar.freebusy import busy_periods
+from icalendar.freebusy import free_periods
+from icalendar.freebusy import merge_periods
+from icalendar.recurrence import normalize
+
+
+Availability = namedtuple('Availability', ('busy', 'free'))
+Availability.__doc__ = """The result of batch_freebusy().
+
+busy is a dictionary of the attendees and their busy periods by FBTYPE,
+see icalendar.freebusy.busy_periods(). free is a sorted list of the
+(start, end) periods in UTC in which all attendees are free.
+"""
+
+
+def _busy_periods_of(calendar, attendee, start, end, tzinfo):
+    """Parse a calendar if needed and return its busy periods.
+
+    This runs in the worker processes.
+    """
+    if not isinstance(calendar, Component):
+        calendar = Calendar.from_ical(calendar, lazy=True)
+    return busy_periods(calendar.walk('VEVENT'), start, end, attendee,
+                        tzinfo)
+
+
+def batch_freebusy(calendars, start, end, duration=None, tentative=True,
+                   tzinfo=pytz.utc, max_workers=None, executor=None,
+                   chunksize=1):
+    """Returns the busy time of many attendees and their common free time.
+
+    Each calendar is parsed and its busy periods are merged in a worker
+    process. The busy periods of all attendees are then merged with one
+    sweep over the sorted lists to find the free time.
+
+    :param calendars: A dictionary of the calendar user addresses of the
+                      attendees and their calendars, which are Calendar
+                      objects or .ics files as bytes or str. Events that an
+                      attendee declined are free, see
+                      icalendar.freebusy.busy_type().
+    :param start: the start of the time window, a date or datetime
+    :param end: the end of the time window, excluded
+    :param duration: If given, only free periods of at least this
+                     timedelta are returned.
+    :param tentative: If true, BUSY-TENTATIVE time is not free time.
+    :param tzinfo: The timezone of floating times and dates.
+    :param max_workers: The number of processes to create if no executor
+                        is given.
+    :param executor: A concurrent.futures.Executor to use, e.g. a
+                     ProcessPoolExecutor that you reuse.
+    :param chunksize: The number of calendars that are sent to a worker
+                      process in one task.
+    :returns: an Availability with the busy and the free periods
+    """
+    calendars = dict(calendars)
+    attendees = list(calendars)
+    arguments = (
+        [calendars[attendee] for attendee in attendees], attendees,
+        repeat(start), repeat(end), repeat(tzinfo))
+    if executor is None:
+        with ProcessPoolExecutor(max_workers) as executor:
+            results = list(executor.map(_busy_periods_of, *arguments,
+                                        chunksize=chunksize))
+    else:
+        results = list(executor.map(_busy_periods_of, *arguments,
+                                    chunksize=chunksize))
+    busy = dict(zip(attendees, results))
+
+    fbtypes = (BUSY, BUSY_TENTATIVE) if tentative else (BUSY,)
+    # the periods of each attendee are sorted already
+    taken = merge_periods(merge(*(
+        periods[fbtype] for periods in results for fbtype in fbtypes)))
+    free = free_periods(taken,
+                        normalize(start, tzinfo).astimezone(pytz.utc),
+                        normalize(end, tzinfo).astimezone(pytz.utc))
+    if duration is not None:
+        free = [(free_start, free_end) for free_start, free_end in free
+                if free_end - free_start >= duration]
+    return Availability(busy, free)
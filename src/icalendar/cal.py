@@ -3,21 +3,42 @@ files according to rfc2445.
 
 These are the defined components.
 """
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from hashlib import blake2b
+from mmap import ACCESS_READ
+from mmap import mmap as memory_map
 from icalendar.caselessdict import CaselessDict
 from icalendar.parser import Contentline
 from icalendar.parser import Contentlines
 from icalendar.parser import Parameters
 from icalendar.parser import q_join
 from icalendar.parser import q_split
+from icalendar.parser import unfold_lines
+from icalendar.parser import unfold
 from icalendar.parser_tools import DEFAULT_ENCODING
+from icalendar.parser_tools import to_unicode
+from icalendar.prop import ParamsBase
 from icalendar.prop import TypesFactory
-from icalendar.prop import vText, vDDDLists
+from icalendar.prop import vCalAddress, vPeriod, vText, vDDDLists
+from icalendar.columns import to_columns
+from icalendar.freebusy import busy_periods
+from icalendar.patch import apply_patch
+from icalendar.patch import diff_calendars
+from icalendar.recurrence import calendar_occurrences
+from icalendar.recurrence import normalize
+from icalendar.recurrence import occurrences
+from icalendar.timezone_cache import _make_timezone
 from icalendar.timezone_cache import _timezone_cache
+from icalendar.timezone_cache import resolve_tzid
+from icalendar.tools import UIDGenerator
 
+import os
 import pytz
+import re
+import sys
 import dateutil.rrule, dateutil.tz
-from pytz.tzinfo import DstTzInfo
 
 
 
@@ -54,6 +75,87 @@ INLINE = CaselessDict({
 
 _marker = []
 
+# The values of these properties take the TZID parameter into account.
+DATETIME_NAMES = ('DTSTART', 'DTEND', 'RECURRENCE-ID', 'DUE', 'RDATE', 'EXDATE')
+# the properties whose values depend on their TZID parameter
+TZID_NAMES = frozenset(DATETIME_NAMES + ('FREEBUSY',))
+
+
+def _decode_property(name, params, vals, timezone=None):
+    """Parse the value of a content line into a list of property values.
+
+    Raises a ValueError if the value cannot be parsed.
+
+    :param timezone: the tzinfo of the TZID parameter if it was resolved
+                     before, see _LazyValue
+    """
+    factory = types_factory.for_property(name)
+    if timezone is None and 'TZID' in params:
+        timezone = params['TZID']
+    if name == 'FREEBUSY':
+        vals = vals.split(',')
+        if timezone is not None:
+            parsed_components = [factory(factory.from_ical(val, timezone)) for val in vals]
+        else:
+            parsed_components = [factory(factory.from_ical(val)) for val in vals]
+    elif name in DATETIME_NAMES and timezone is not None:
+        parsed_components = [factory(factory.from_ical(vals, timezone))]
+    else:
+        parsed_components = [factory(factory.from_ical(vals))]
+    for parsed_component in parsed_components:
+        if isinstance(parsed_component, ParamsBase):
+            parsed_component._params = params or None
+        else:
+            parsed_component.params = params
+    return parsed_components
+
+
+class _LazyValue:
+    """A property value which is not decoded yet.
+
+    It keeps the content line it was parsed from, so that the property is
+    written back unchanged if it is never accessed. The line is split into
+    its parts again when the value is decoded. The timezone of a TZID
+    parameter is resolved when the line is parsed, as later VTIMEZONEs can
+    define the TZID differently.
+    """
+    __slots__ = ('line', 'timezone')
+
+    def __init__(self, line, timezone=None):
+        self.line = line
+        self.timezone = timezone
+
+    @classmethod
+    def of(cls, name, line):
+        """Return the lazy value of a content line with the property name.
+
+        :returns: None if the value has to be decoded now because its TZID
+                  is not known
+        """
+        if name not in TZID_NAMES:
+            return cls(line)
+        match = TZID_PARAMETER.search(line)
+        if match is None:
+            return cls(line)
+        timezone = resolve_tzid(match.group(1).strip('"'))
+        if timezone is None:
+            return None
+        return cls(line, timezone)
+
+    @property
+    def name(self):
+        return PROPERTY_NAME.match(self.line).group(1)
+
+    def decode(self):
+        return _decode_property(*self.line.parts(), timezone=self.timezone)
+
+    def __reduce__(self):
+        # needed for the pickle protocols 0 and 1, as there are __slots__
+        return type(self), (self.line, self.timezone)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({str(self.line)!r})'
+
 
 class Component(CaselessDict):
     """Component is the base object for calendar, Event and the other
@@ -72,6 +174,11 @@ class Component(CaselessDict):
                                 # component, we will silently ignore
                                 # it, rather than let the exception
                                 # propagate upwards
+    _lazy = False   # True if some property values may not be decoded yet,
+                    # see from_ical(lazy=True)
+    _properties_hash = None     # the hash of the properties, see
+                                # content_hash()
+    _ical_digest = None     # the digest of the text, see update_from_ical()
     # not_compliant = ['']  # List of non-compliant properties.
 
     def __init__(self, *args, **kwargs):
@@ -104,7 +211,125 @@ class Component(CaselessDict):
     def is_empty(self):
         """Returns True if Component has no items or subcomponents, else False.
         """
-        return True if not (list(self.values()) + self.subcomponents) else False  # noqa
+        return not (len(self) or self.subcomponents)
+
+    #############################
+    # changes of properties
+
+    def __setitem__(self, key, value):
+        if self._properties_hash is not None:
+            self._properties_hash = None
+        if self._ical_digest is not None:
+            self._ical_digest = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        if self._properties_hash is not None:
+            self._properties_hash = None
+        if self._ical_digest is not None:
+            self._ical_digest = None
+        super().__delitem__(key)
+
+    def popitem(self):
+        self._properties_hash = None
+        if self._ical_digest is not None:
+            self._ical_digest = None
+        return super().popitem()
+
+    def clear(self):
+        self._properties_hash = None
+        if self._ical_digest is not None:
+            self._ical_digest = None
+        super().clear()
+
+    #############################
+    # lazily decoded property values
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if self._lazy and isinstance(value, (_LazyValue, list)):
+            value = self._decode_lazy(key, value)
+        return value
+
+    def __iter__(self):
+        # Without an own __iter__, dict(), {**component} and dict.update()
+        # copy the stored values of dict subclasses and skip __getitem__.
+        return super().__iter__()
+
+    def _decode_lazy(self, key, value):
+        """Decode the values of a property that were stored by
+        from_ical(lazy=True) and store the result.
+        """
+        values = value if isinstance(value, list) else [value]
+        if not any(isinstance(v, _LazyValue) for v in values):
+            return value
+        decoded = []
+        for v in values:
+            if not isinstance(v, _LazyValue):
+                decoded.append(v)
+                continue
+            try:
+                decoded.extend(v.decode())
+            except ValueError as e:
+                if not self.ignore_exceptions:
+                    raise
+                self.errors.append((v.name.upper(), str(e)))
+        if not decoded:
+            super().__delitem__(key)
+            raise KeyError(key)
+        value = decoded[0] if len(decoded) == 1 else decoded
+        super().__setitem__(key, value)
+        return value
+
+    def _decode_all(self):
+        """Decode all lazily parsed property values."""
+        if not self._lazy:
+            return
+        for key in list(self.keys()):
+            try:
+                self[key]
+            except KeyError:
+                pass
+        self._lazy = False
+
+    def get(self, key, default=None):
+        if self._lazy:
+            try:
+                return self[key]
+            except KeyError:
+                return default
+        return super().get(key, default)
+
+    def pop(self, key, default=None):
+        if self._lazy and key in self:
+            try:
+                self[key]
+            except KeyError:
+                return default
+        if key in self:
+            self._properties_hash = None
+            if self._ical_digest is not None:
+                self._ical_digest = None
+        return super().pop(key, default)
+
+    def setdefault(self, key, value=None):
+        if key in self:
+            try:
+                return self[key]
+            except KeyError:
+                pass
+        self._properties_hash = None
+        if self._ical_digest is not None:
+            self._ical_digest = None
+        return super().setdefault(key, value)
+
+    def items(self):
+        self._decode_all()
+        return super().items()
+
+    def values(self):
+        self._decode_all()
+        return super().values()
 
     @property
     def is_broken(self):
@@ -137,7 +362,7 @@ class Component(CaselessDict):
         """
         if not encode:
             return value
-        if isinstance(value, types_factory.all_types):
+        if types_factory.is_encoded(value):
             # Don't encode already encoded values.
             obj = value
         else:
@@ -196,7 +421,7 @@ class Component(CaselessDict):
         # set value
         if name in self:
             # If property already exists, append it.
-            oldval = self[name]
+            oldval = super().__getitem__(name)
             if isinstance(oldval, list):
                 if isinstance(value, list):
                     value = oldval + value
@@ -268,6 +493,8 @@ class Component(CaselessDict):
     def add_component(self, component):
         """Add a subcomponent to this component.
         """
+        if self._ical_digest is not None:
+            self._ical_digest = None
         self.subcomponents.append(component)
 
     def _walk(self, name):
@@ -303,7 +530,8 @@ class Component(CaselessDict):
             property_names = self.keys()
 
         for name in property_names:
-            values = self[name]
+            # undecoded values are written as they were read
+            values = super().__getitem__(name)
             if isinstance(values, list):
                 # normally one property is one line
                 for value in values:
@@ -318,87 +546,119 @@ class Component(CaselessDict):
         return properties
 
     @classmethod
-    def from_ical(cls, st, multiple=False):
+    def from_ical(cls, st, multiple=False, lazy=False):
         """Populates the component recursively from a string.
+
+        If lazy is true, property values are decoded when they are accessed
+        for the first time and not while parsing. Property values that are
+        never accessed are written back by to_ical() as they were read.
+        Errors in property values are then also raised on first access.
+        """
+        # raw parsing
+        return cls._from_lines(Contentlines.from_ical(st), st, multiple, lazy)
+
+    @classmethod
+    def _from_lines(cls, lines, source, multiple=False, lazy=False):
+        """Build the components of unfolded content lines.
+
+        :param source: The parsed string or file for error messages.
         """
-        stack = []  # a stack of components
+        builder = _ComponentBuilder(lazy=lazy)
         comps = []
-        for line in Contentlines.from_ical(st):  # raw parsing
-            if not line:
-                continue
+        for line in lines:
+            component = builder.feed(line)
+            if component is not None:
+                comps.append(component)
 
-            try:
-                name, params, vals = line.parts()
-            except ValueError as e:
-                # if unable to parse a line within a component
-                # that ignores exceptions, mark the component
-                # as broken and skip the line. otherwise raise.
-                component = stack[-1] if stack else None
-                if not component or not component.ignore_exceptions:
-                    raise
-                component.errors.append((None, str(e)))
-                continue
+        if multiple:
+            return comps
+        if len(comps) > 1:
+            raise ValueError(cls._format_error(
+                'Found multiple components where only one is allowed',
+                source))
+        if len(comps) < 1:
+            raise ValueError(cls._format_error(
+                'Found no components where exactly one is required', source))
+        return comps[0]
 
-            uname = name.upper()
-            # check for start of component
-            if uname == 'BEGIN':
-                # try and create one of the components defined in the spec,
-                # otherwise get a general Components for robustness.
-                c_name = vals.upper()
-                c_class = component_factory.get(c_name, Component)
-                # If component factory cannot resolve ``c_name``, the generic
-                # ``Component`` class is used which does not have the name set.
-                # That's opposed to the usage of ``cls``, which represents a
-                # more concrete subclass with a name set (e.g. VCALENDAR).
-                component = c_class()
-                if not getattr(component, 'name', ''):  # undefined components
-                    component.name = c_name
-                stack.append(component)
-            # check for end of event
-            elif uname == 'END':
-                # we are done adding properties to this component
-                # so pop it from the stack and add it to the new top.
-                if not stack:
-                    # The stack is currently empty, the input must be invalid
-                    raise ValueError('END encountered without an accompanying BEGIN!')
-
-                component = stack.pop()
-                if not stack:  # we are at the end
-                    comps.append(component)
-                else:
-                    stack[-1].add_component(component)
-                if vals == 'VTIMEZONE' and \
-                        'TZID' in component and \
-                        component['TZID'] not in pytz.all_timezones and \
-                        component['TZID'] not in _timezone_cache:
-                    _timezone_cache[component['TZID']] = component.to_tz()
-            # we are adding properties to the current top of the stack
-            else:
-                factory = types_factory.for_property(name)
-                component = stack[-1] if stack else None
-                if not component:
-                    raise ValueError(f'Property "{name}" does not have a parent component.')
-                datetime_names = ('DTSTART', 'DTEND', 'RECURRENCE-ID', 'DUE',
-                                  'RDATE', 'EXDATE')
-                try:
-                    if name == 'FREEBUSY':
-                        vals = vals.split(',')
-                        if 'TZID' in params:
-                            parsed_components = [factory(factory.from_ical(val, params['TZID'])) for val in vals]
-                        else:
-                            parsed_components = [factory(factory.from_ical(val)) for val in vals]
-                    elif name in datetime_names and 'TZID' in params:
-                        parsed_components = [factory(factory.from_ical(vals, params['TZID']))]
-                    else:
-                        parsed_components = [factory(factory.from_ical(vals))]
-                except ValueError as e:
-                    if not component.ignore_exceptions:
-                        raise
-                    component.errors.append((uname, str(e)))
-                else:
-                    for parsed_component in parsed_components:
-                        parsed_component.params = params
-                        component.add(name, parsed_component, encode=0)
+    @classmethod
+    def from_file(cls, path, mmap=True, multiple=False, lazy=False):
+        """Populates the component recursively from an .ics file.
+
+        The result is the same as the one of from_ical() for the content of
+        the file. The file is not read into a string. Its lines are read one
+        by one from a memory map of the file, or from the file object if mmap
+        is false, and unfolded and decoded as UTF-8 one by one. So only the
+        parsed components need memory.
+
+        :param path: The path of the file.
+        :param mmap: Whether to read the file with a memory map.
+        :param multiple: Return a list of all components, see from_ical().
+        :param lazy: Decode property values on first access, see from_ical().
+        """
+        with open(path, 'rb') as f:
+            if mmap and os.fstat(f.fileno()).st_size:
+                with memory_map(f.fileno(), 0, access=ACCESS_READ) as data:
+                    return cls._from_lines(
+                        unfold_lines(iter(data.readline, b'')),
+                        os.fspath(path), multiple, lazy)
+            return cls._from_lines(unfold_lines(f), os.fspath(path),
+                                   multiple, lazy)
+
+    @classmethod
+    def iter_components(cls, fp, lazy=False):
+        """Parse a file object or any other iterable of lines and yield the
+        subcomponents of the calendar one by one.
+
+        A subcomponent of a VCALENDAR (VEVENT, VTODO, VTIMEZONE, ...) is
+        yielded as soon as its END line is read and it is not added to the
+        calendar. Top level components which are not a VCALENDAR are yielded
+        as a whole. Only the component that is currently being parsed is kept
+        in memory, so this can be used for files of any size.
+
+        :param fp: A file object opened in text or binary mode or an
+                   iterable of str or bytes lines.
+        :param lazy: Decode property values on first access, see from_ical().
+        """
+        builder = _ComponentBuilder(detach=True, lazy=lazy)
+        for line in unfold_lines(fp):
+            component = builder.feed(line)
+            if component is not None:
+                yield component
+
+    @classmethod
+    def from_ical_parallel(cls, st, multiple=False, max_workers=None,
+                           executor=None, chunksize=None):
+        """Populates the components from a string using several processes.
+
+        The result is the same as the one of from_ical(). If the string
+        contains several components, e.g. concatenated VCALENDARs, each of
+        them is parsed in a worker process. A single component is split at
+        its subcomponents, e.g. VEVENTs, which are parsed in chunks.
+        VTIMEZONEs are parsed first, so that all workers know them. The
+        timezones that the workers create are added to the timezone cache of
+        this process.
+
+        :param max_workers: The number of processes to create if no executor
+                            is given. The number of chunks is chosen for
+                            this number of workers or the number of CPUs.
+        :param executor: A concurrent.futures.Executor to parse with, e.g. a
+                         ProcessPoolExecutor that you reuse.
+        :param chunksize: The number of subcomponents to parse in one task.
+        """
+        unfolded = unfold(to_unicode(st))
+        spans = _split_components(unfolded)
+        if not spans:
+            # let from_ical() handle empty and invalid input
+            return cls.from_ical(st, multiple=multiple)
+
+        if executor is None:
+            with ProcessPoolExecutor(max_workers) as executor:
+                comps = cls._parse_spans(unfolded, spans, executor, chunksize,
+                                         max_workers)
+        else:
+            comps = cls._parse_spans(unfolded, spans, executor, chunksize,
+                                     max_workers)
 
         if multiple:
             return comps
@@ -410,6 +670,177 @@ class Component(CaselessDict):
                 'Found no components where exactly one is required', st))
         return comps[0]
 
+    @classmethod
+    def _parse_spans(cls, st, spans, executor, chunksize=None,
+                     max_workers=None):
+        """Parse the components found by _split_components() in parallel.
+
+        Without chunksize, the subcomponents are split into about four
+        chunks for each of the max_workers or CPUs.
+        """
+        workers = max_workers or os.cpu_count() or 1
+        if len(spans) > 1:
+            chunks = [st[start:end] for start, end, _ in spans]
+            return [comp for comps in _parse_chunks(
+                        chunks, [{}] * len(chunks), executor)
+                    for comp in comps]
+
+        # split a single component at its subcomponents
+        start, end, children = spans[0]
+        header = []
+        timezones = {}
+        chunk_timezones = []  # the timezones for each chunk
+        pieces = []  # parsed subcomponents or index of a chunk
+        chunks = []
+        run = []  # subcomponents for the next chunk
+        position = start
+        if chunksize is None:
+            chunksize = max(1, len(children) // (workers * 4))
+        for name, child_start, child_end in children:
+            header.append(st[position:child_start])
+            position = child_end
+            if name == 'VTIMEZONE':
+                # parse timezones here, so that the workers can use them
+                if run:
+                    pieces.append(len(chunks))
+                    chunks.append(''.join(run))
+                    run = []
+                timezone = Component.from_ical(st[child_start:child_end])
+                tzid = str(timezone.get('TZID', ''))
+                if tzid in _timezone_cache:
+                    timezones[tzid] = _timezone_cache[tzid]
+                pieces.append([timezone])
+                continue
+            if not run:
+                # the chunk uses the timezones defined before it
+                chunk_timezones.append(dict(timezones))
+            run.append(st[child_start:child_end])
+            if len(run) >= chunksize:
+                pieces.append(len(chunks))
+                chunks.append(''.join(run))
+                run = []
+        if run:
+            pieces.append(len(chunks))
+            chunks.append(''.join(run))
+        header.append(st[position:end])
+
+        component = cls.from_ical(''.join(header))
+        results = _parse_chunks(chunks, chunk_timezones, executor)
+        for piece in pieces:
+            if isinstance(piece, int):
+                piece = results[piece]
+            component.subcomponents.extend(piece)
+        return [component]
+
+    def update_from_ical(self, st, lazy=False):
+        """Update the component from a new version of the string it was
+        parsed from.
+
+        Only the subcomponents that changed are parsed. Subcomponents with
+        the same text as before are kept as they are, so that they are the
+        same Python objects. The properties of the component itself are
+        always parsed again. If a VTIMEZONE changed, the subcomponents that
+        use its TZID are parsed again, too.
+
+        The texts of the subcomponents are remembered by this method. For
+        subcomponents that were not created by it or that were changed
+        with methods like add() or add_component() since, to_ical() is
+        compared to the new text. Changes of property values in place, like
+        ``event['DTSTART'].dt = ...``, are not noticed. So start with an
+        empty component::
+
+            calendar = Calendar()
+            calendar.update_from_ical(ics)
+            ...
+            calendar.update_from_ical(changed_ics)
+
+        :param lazy: Decode property values on first access, see from_ical().
+        :returns: the subcomponents that were parsed
+        :raises ValueError: if the string does not contain exactly one
+                            component with the name of this component
+        """
+        st = to_unicode(st)
+        # BEGIN and END lines are usually not folded, so the folded text is
+        # split and remembered, as unfolding large strings takes long
+        spans = _split_components(st)
+        if spans is None:
+            st = unfold(st)
+            spans = _split_components(st)
+        if not spans or len(spans) != 1:
+            raise ValueError(Component._format_error(
+                'Expected exactly one component', st))
+        start, end, children = spans[0]
+
+        # the subcomponents that can be reused by the digest of their text
+        unchanged = {}
+        for subcomponent in self.subcomponents:
+            digest = getattr(subcomponent, '_ical_digest', None)
+            if digest is None or any(
+                    component._ical_digest is None
+                    for component in subcomponent.walk()):
+                digest = _span_digest(
+                    subcomponent.to_ical().decode(DEFAULT_ENCODING))
+            unchanged.setdefault(digest, []).append(subcomponent)
+
+        header = []
+        texts = []
+        subcomponents = []
+        position = start
+        for name, child_start, child_end in children:
+            header.append(st[position:child_start])
+            position = child_end
+            text = st[child_start:child_end]
+            digest = _span_digest(text)
+            reused = unchanged.get(digest)
+            texts.append((name, text, digest))
+            subcomponents.append(reused.pop(0) if reused else None)
+        header.append(st[position:end])
+
+        # Changed VTIMEZONEs are parsed first. The subcomponents that refer
+        # to their TZIDs or to removed ones are parsed again, as their
+        # values are localized to the timezones that they had when they
+        # were parsed.
+        parsed = set()
+        changed_tzids = {
+            str(subcomponent['TZID'])
+            for subcomponents_left in unchanged.values()
+            for subcomponent in subcomponents_left
+            if subcomponent.name == 'VTIMEZONE' and 'TZID' in subcomponent}
+        for index, (name, text, digest) in enumerate(texts):
+            if name == 'VTIMEZONE' and subcomponents[index] is None:
+                subcomponent = Component.from_ical(text, lazy=lazy)
+                subcomponents[index] = subcomponent
+                parsed.add(index)
+                if 'TZID' in subcomponent:
+                    changed_tzids.add(str(subcomponent['TZID']))
+        for subcomponent in subcomponents:
+            if subcomponent is not None and subcomponent.name == 'VTIMEZONE':
+                # the last VTIMEZONE defines the timezone like when parsing
+                _register_timezone(subcomponent)
+        for index, (name, text, digest) in enumerate(texts):
+            subcomponent = subcomponents[index]
+            if subcomponent is None or name != 'VTIMEZONE' and \
+                    changed_tzids and _tzids(text) & changed_tzids:
+                subcomponent = Component.from_ical(text, lazy=lazy)
+                subcomponents[index] = subcomponent
+                parsed.add(index)
+            for component in subcomponent.walk():
+                component._ical_digest = True
+            subcomponent._ical_digest = digest
+
+        component = Component.from_ical(''.join(header), lazy=lazy)
+        if self.name is None:
+            self.name = component.name
+        elif component.name != self.name:
+            raise ValueError(
+                f'Expected a {self.name} component, got {component.name}.')
+        self.clear()
+        dict.update(self, dict.items(component))
+        self._lazy = component._lazy
+        self.errors = component.errors
+        self.subcomponents[:] = subcomponents
+        return [subcomponents[index] for index in sorted(parsed)]
+
     def _format_error(error_description, bad_input, elipsis='[...]'):
         # there's three character more in the error, ie. ' ' x2 and a ':'
         max_error_length = 100 - 3
@@ -422,7 +853,14 @@ class Component(CaselessDict):
     def content_line(self, name, value, sorted=True):
         """Returns property as content line.
         """
-        params = getattr(value, 'params', Parameters())
+        if isinstance(value, _LazyValue):
+            # the value was never accessed, so it is unchanged
+            return value.line
+        if isinstance(value, ParamsBase):
+            # do not create parameters for values without them
+            params = getattr(value, '_params', None) or Parameters()
+        else:
+            params = getattr(value, 'params', Parameters())
         return Contentline.from_parts(name, params, value, sorted=sorted)
 
     def content_lines(self, sorted=True):
@@ -444,11 +882,50 @@ class Component(CaselessDict):
         content_lines = self.content_lines(sorted=sorted)
         return content_lines.to_ical()
 
+    def iter_ical(self, sorted=True):
+        """Generates the component as folded and encoded bytes.
+
+        The chunks are the same as the result of to_ical() when they are
+        joined. A chunk contains the BEGIN line and the properties of a
+        component, followed by the chunks of the subcomponents and the END
+        line. Only one component is converted at a time.
+
+        :param sorted: Whether parameters and properties should be
+                       lexicographically sorted.
+        """
+        items = self.property_items(recursive=False, sorted=sorted)
+        lines = []
+        for name, value in items[:-1]:
+            line = self.content_line(name, value, sorted=sorted)
+            if line:
+                lines.append(line.to_ical())
+                lines.append(b'\r\n')
+        yield b''.join(lines)
+        for subcomponent in self.subcomponents:
+            yield from subcomponent.iter_ical(sorted=sorted)
+        name, value = items[-1]
+        yield self.content_line(name, value, sorted=sorted).to_ical() + \
+            b'\r\n'
+
+    def write_ical(self, fp, sorted=True):
+        """Writes the component to a binary file object.
+
+        The bytes are the same as the result of to_ical(), but the calendar
+        is written component by component and never held in memory as a
+        whole.
+
+        :param fp: a file object opened for writing bytes
+        :param sorted: Whether parameters and properties should be
+                       lexicographically sorted.
+        """
+        for chunk in self.iter_ical(sorted=sorted):
+            fp.write(chunk)
+
     def __repr__(self):
         """String representation of class with all of it's subcomponents.
         """
         subs = ', '.join(str(it) for it in self.subcomponents)
-        return f"{self.name or type(self).__name__}({dict(self)}{', ' + subs if subs else ''})"
+        return f"{self.name or type(self).__name__}({dict(self.items())}{', ' + subs if subs else ''})"
 
     def __eq__(self, other):
         if len(self.subcomponents) != len(other.subcomponents):
@@ -458,17 +935,323 @@ class Component(CaselessDict):
         if not properties_equal:
             return False
 
-        # The subcomponents might not be in the same order,
-        # neither there's a natural key we can sort the subcomponents by nor
-        # are the subcomponent types hashable, so  we cant put them in a set to
-        # check for set equivalence. We have to iterate over the subcomponents
-        # and look for each of them in the list.
+        # The subcomponents might not be in the same order, so each of them
+        # is compared to the subcomponents of the other component with the
+        # same content hash.
+        candidates = {}
+        for subcomponent in other.subcomponents:
+            candidates.setdefault(
+                subcomponent.content_hash(), []).append(subcomponent)
         for subcomponent in self.subcomponents:
-            if subcomponent not in other.subcomponents:
-                return False
+            same_hash = candidates.get(subcomponent.content_hash(), ())
+            if not any(subcomponent == candidate for candidate in same_hash):
+                # equal values can be written differently, like a str and
+                # a vText, and have different hashes
+                if subcomponent not in other.subcomponents:
+                    return False
 
         return True
 
+    def content_hash(self):
+        """Returns a hash of the properties and subcomponents as a string.
+
+        Equal components have the same hash. The order of the properties and
+        of the subcomponents does not change it. The hash of the properties
+        is computed from their content lines and remembered until they are
+        changed with methods like add() or del. Changes of property values
+        in place, like ``event['DTSTART'].dt = ...``, are not noticed. Set
+        the property again after such a change.
+        """
+        properties_hash = self._properties_hash
+        if properties_hash is None:
+            # lazily parsed values are written like decoded ones
+            self._decode_all()
+            content = '\n'.join(
+                self.content_line(name, value)
+                for name, value in self.property_items(recursive=False))
+            properties_hash = self._properties_hash = blake2b(
+                content.encode(DEFAULT_ENCODING), digest_size=16).hexdigest()
+        if not self.subcomponents:
+            return properties_hash
+        hashes = sorted(subcomponent.content_hash()
+                        for subcomponent in self.subcomponents)
+        return blake2b(''.join([properties_hash] + hashes).encode('ascii'),
+                       digest_size=16).hexdigest()
+
+    def diff(self, other):
+        """Compare the subcomponents of this component with the ones of
+        another version of it.
+
+        Subcomponents with the same content hash are unchanged. The other
+        subcomponents are changed if they have the same name and the same
+        UID, RECURRENCE-ID and TZID, else they are added or removed.
+
+        :returns: a ComponentDiff with the lists of the added and removed
+                  subcomponents and a list of (old, new) pairs of changed
+                  subcomponents. The properties of this component are not
+                  compared.
+        """
+        unchanged = {}
+        for subcomponent in self.subcomponents:
+            unchanged.setdefault(
+                subcomponent.content_hash(), []).append(subcomponent)
+        new = []
+        for subcomponent in other.subcomponents:
+            same_hash = unchanged.get(subcomponent.content_hash())
+            if same_hash:
+                same_hash.pop()
+            else:
+                new.append(subcomponent)
+        remaining = {id(subcomponent) for same_hash in unchanged.values()
+                     for subcomponent in same_hash}
+        old = {}
+        for subcomponent in self.subcomponents:
+            if id(subcomponent) in remaining:
+                old.setdefault(_identity(subcomponent), []).append(
+                    subcomponent)
+
+        added = []
+        changed = []
+        for subcomponent in new:
+            key = _identity(subcomponent)
+            candidates = old.get(key, [])
+            # the hashes of equal components can differ if their values
+            # were changed in place
+            candidate = next((candidate for candidate in candidates
+                              if candidate == subcomponent), None)
+            if candidate is None and key[1:] and candidates:
+                candidate = candidates[0]
+                changed.append((candidate, subcomponent))
+            if candidate is None:
+                added.append(subcomponent)
+            else:
+                candidates.remove(candidate)
+                remaining.discard(id(candidate))
+        removed = [subcomponent for subcomponent in self.subcomponents
+                   if id(subcomponent) in remaining]
+        return ComponentDiff(added, removed, changed)
+
+
+ComponentDiff = namedtuple('ComponentDiff', ('added', 'removed', 'changed'))
+
+# the properties which identify a subcomponent in Component.diff()
+IDENTITY_PROPERTIES = ('UID', 'RECURRENCE-ID', 'TZID')
+
+
+def _identity(component):
+    """The name of a component and the lines of its identity properties."""
+    key = [component.name]
+    for name in IDENTITY_PROPERTIES:
+        values = component.get(name)
+        if values is None:
+            continue
+        if not isinstance(values, list):
+            values = [values]
+        key.extend(component.content_line(name, value) for value in values)
+    return tuple(key)
+
+
+# BEGIN and END lines of unfolded content
+BEGIN_END = re.compile('^(BEGIN|END):(.*?)\r?$', re.MULTILINE | re.IGNORECASE)
+TZID_PARAMETER = re.compile(r';TZID=("[^"]*"|[^;:,\r\n]*)', re.IGNORECASE)
+
+
+def _tzids(st):
+    """Return the values of the TZID parameters in a text."""
+    return {match.group(1).strip('"')
+            for match in TZID_PARAMETER.finditer(unfold(st))}
+
+
+def _register_timezone(timezone):
+    """Define the TZID of a parsed VTIMEZONE if it is not in the tz database.
+    """
+    if 'TZID' in timezone and \
+            timezone['TZID'] not in pytz.all_timezones_set:
+        # the last VTIMEZONE defines the TZID, compiled only once
+        _timezone_cache[timezone['TZID']] = _timezone_cache.compile(timezone)
+
+
+def _span_digest(st):
+    """Identify the text of a component."""
+    return blake2b(st.encode(DEFAULT_ENCODING), digest_size=16).digest()
+
+
+def _split_components(st):
+    """Find the components and their direct subcomponents in unfolded text.
+
+    :returns: a list of (start, end, subcomponents) for each component, where
+              subcomponents is a list of (name, start, end) or None if the
+              BEGIN and END lines do not match.
+    """
+    spans = []
+    depth = 0
+    for match in BEGIN_END.finditer(st):
+        line_end = st.find('\n', match.end()) + 1 or len(st)
+        if match.group(1).upper() == 'BEGIN':
+            if depth == 0:
+                start = match.start()
+                children = []
+            elif depth == 1:
+                child_start = match.start()
+                child_name = match.group(2).upper()
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 1:
+                children.append((child_name, child_start, line_end))
+            elif depth == 0:
+                spans.append((start, line_end, children))
+            elif depth < 0:
+                return None
+    if depth:
+        return None
+    return spans
+
+
+def _parse_chunk(st, timezones):
+    """Parse components in a worker process of from_ical_parallel().
+
+    :param timezones: the timezones of the calendar by TZID, which are
+                      defined before the components of the chunk
+    :returns: the components and the timezones that were created for them
+    """
+    for tzid, tz in timezones.items():
+        _timezone_cache[tzid] = tz
+    comps = Component.from_ical(st, multiple=True)
+    created = {}
+    for comp in comps:
+        for timezone in comp.walk('VTIMEZONE'):
+            tzid = str(timezone.get('TZID', ''))
+            if tzid in _timezone_cache:
+                created[tzid] = _timezone_cache[tzid]
+    return comps, created
+
+
+def _parse_chunks(chunks, timezones, executor):
+    """Parse the chunks with the executor and keep their order.
+
+    Like when parsing them one after the other, the last VTIMEZONE of a
+    TZID defines its timezone in this process.
+
+    :param timezones: the timezones for each chunk, see _parse_chunk()
+    :returns: a list with the components of each chunk
+    """
+    results = []
+    for comps, created in executor.map(_parse_chunk, chunks, timezones):
+        for tzid, tz in created.items():
+            _timezone_cache[tzid] = tz
+        results.append(comps)
+    return results
+
+
+# the name of a content line without escaped characters
+PROPERTY_NAME = re.compile(r'([\w.-]+)[;:]')
+
+
+class _ComponentBuilder:
+    """Builds components from content lines which are fed one by one.
+
+    If detach is true, subcomponents of a VCALENDAR are returned when they
+    are complete instead of being added to the calendar.
+    If lazy is true, property values are decoded on first access.
+    """
+
+    def __init__(self, detach=False, lazy=False):
+        self.stack = []  # a stack of components
+        self.detach = detach
+        self.lazy = lazy
+
+    def feed(self, line):
+        """Process one content line.
+
+        :returns: the component that is completed by this line or None
+        """
+        if not line:
+            return None
+        stack = self.stack
+
+        if self.lazy and stack:
+            # only the name of a property is needed to store it for later
+            match = PROPERTY_NAME.match(line)
+            if match is not None:
+                uname = match.group(1).upper()
+                if uname != 'BEGIN' and uname != 'END':
+                    value = _LazyValue.of(uname, line)
+                    if value is not None:
+                        stack[-1].add(sys.intern(uname), value, encode=0)
+                        return None
+
+        try:
+            name, params, vals = line.parts()
+        except ValueError as e:
+            # if unable to parse a line within a component
+            # that ignores exceptions, mark the component
+            # as broken and skip the line. otherwise raise.
+            component = stack[-1] if stack else None
+            if not component or not component.ignore_exceptions:
+                raise
+            component.errors.append((None, str(e)))
+            return None
+
+        uname = name.upper()
+        # check for start of component
+        if uname == 'BEGIN':
+            # try and create one of the components defined in the spec,
+            # otherwise get a general Components for robustness.
+            c_name = vals.upper()
+            c_class = component_factory.get(c_name, Component)
+            # If component factory cannot resolve ``c_name``, the generic
+            # ``Component`` class is used which does not have the name set.
+            # That's opposed to the usage of ``cls``, which represents a
+            # more concrete subclass with a name set (e.g. VCALENDAR).
+            component = c_class()
+            if not getattr(component, 'name', ''):  # undefined components
+                component.name = c_name
+            if self.lazy:
+                component._lazy = True
+            stack.append(component)
+        # check for end of event
+        elif uname == 'END':
+            # we are done adding properties to this component
+            # so pop it from the stack and add it to the new top.
+            if not stack:
+                # The stack is currently empty, the input must be invalid
+                raise ValueError('END encountered without an accompanying BEGIN!')
+
+            component = stack.pop()
+            if vals == 'VTIMEZONE':
+                _register_timezone(component)
+            if not stack:  # we are at the end
+                if not self.detach or component.name != 'VCALENDAR':
+                    return component
+            elif self.detach and len(stack) == 1 and \
+                    stack[0].name == 'VCALENDAR':
+                return component
+            else:
+                stack[-1].add_component(component)
+        # we are adding properties to the current top of the stack
+        else:
+            component = stack[-1] if stack else None
+            if not component:
+                raise ValueError(f'Property "{name}" does not have a parent component.')
+            # all components share the strings of the property names
+            uname = sys.intern(uname)
+            if self.lazy:
+                value = _LazyValue.of(uname, line)
+                if value is not None:
+                    component.add(uname, value, encode=0)
+                    return None
+            try:
+                parsed_components = _decode_property(name, params, vals)
+            except ValueError as e:
+                if not component.ignore_exceptions:
+                    raise
+                component.errors.append((uname, str(e)))
+            else:
+                for parsed_component in parsed_components:
+                    component.add(uname, parsed_component, encode=0)
+        return None
+
 #######################################
 # components defined in RFC 5545
 
@@ -496,6 +1279,19 @@ class Event(Component):
     )
     ignore_exceptions = True
 
+    def occurrences(self, start, end):
+        """Returns the occurrences of the event in a time window.
+
+        RRULE and RDATE are expanded and EXDATE is removed. The occurrences
+        are generated in the order of their start, as many as needed.
+
+        :param start: The start of the window, a date or datetime.
+        :param end: The end of the window, excluded.
+        :returns: A generator of icalendar.recurrence.Occurrence with start,
+                  end and component.
+        """
+        return occurrences(self, start, end)
+
 
 class Todo(Component):
 
@@ -680,13 +1476,7 @@ class Timezone(Component):
             assert dst_offset is not False
             transition_info.append((osto, dst_offset, name))
 
-        cls = type(zone, (DstTzInfo,), {
-            'zone': zone,
-            '_utc_transition_times': transition_times,
-            '_transition_info': transition_info
-        })
-
-        return cls()
+        return _make_timezone(zone, transition_times, transition_info)
 
 
 class TimezoneStandard(Component):
@@ -724,6 +1514,129 @@ class Calendar(Component):
     required = ('PRODID', 'VERSION', )
     singletons = ('PRODID', 'VERSION', 'CALSCALE', 'METHOD')
 
+    def occurrences(self, start, end):
+        """Returns the occurrences of the events in a time window.
+
+        Events with a RECURRENCE-ID replace the occurrences of the event with
+        the same UID. See Event.occurrences().
+        """
+        return calendar_occurrences(self.walk('VEVENT'), start, end)
+
+    def to_columns(self, fields, name='VEVENT', tzinfo=pytz.utc):
+        """Returns the properties of the components as columns.
+
+        There is one row for each component with the name, in the order of
+        walk(name). Recurring components are not expanded.
+
+        >>> from datetime import datetime
+        >>> calendar = Calendar()
+        >>> event = Event()
+        >>> event.add('summary', 'Meeting')
+        >>> event.add('dtstart', datetime(2024, 1, 2, 10))
+        >>> calendar.add_component(event)
+        >>> columns = calendar.to_columns(['summary', 'dtstart', 'dtend'])
+        >>> columns['summary']
+        ['Meeting']
+        >>> columns['dtstart']
+        array('q', [1704189600000000])
+
+        :param fields: The names of the properties.
+        :param tzinfo: The timezone of floating times and dates.
+        :returns: a dictionary of the fields and their columns,
+                  see icalendar.columns.to_columns()
+        """
+        return to_columns(self.walk(name), fields, tzinfo,
+                          types_factory.types_map)
+
+    def make_patch(self, other):
+        """Returns the changes from this calendar to another version of it.
+
+        The subcomponents are compared by their UID and RECURRENCE-ID, and
+        only the changed properties of changed components are in the
+        patch. Use diff() to compare the subcomponents by their
+        content.
+
+        >>> old = Calendar()
+        >>> event = Event()
+        >>> event.add('uid', 'meeting@example.com')
+        >>> event.add('summary', 'Meeting')
+        >>> old.add_component(event)
+        >>> new = Calendar.from_ical(old.to_ical())
+        >>> new.subcomponents[0]['SUMMARY'] = 'Moved meeting'
+        >>> patch = old.make_patch(new)
+        >>> patch.modified[0].properties
+        {'SUMMARY': 'Moved meeting'}
+        >>> old.apply_patch(patch)
+        >>> old == new
+        True
+
+        :returns: a CalendarPatch, see icalendar.patch
+        """
+        return diff_calendars(self, other)
+
+    def apply_patch(self, patch):
+        """Changes the calendar with a CalendarPatch from make_patch().
+
+        Components that have a higher SEQUENCE in this calendar than in the
+        patch are not changed.
+
+        :raises ValueError: if the patch does not fit this calendar. The
+                            calendar is not changed then.
+        """
+        apply_patch(self, patch)
+
+    def freebusy(self, start, end, attendee=None, tzinfo=pytz.utc):
+        """Returns the busy time of the events in a time window.
+
+        Recurring events are expanded. Events that are TRANSPARENT or
+        CANCELLED are free and TENTATIVE events are BUSY-TENTATIVE. The
+        overlapping occurrences are merged into one FREEBUSY period for each
+        busy time.
+
+        >>> from datetime import datetime
+        >>> calendar = Calendar()
+        >>> for hour in 9, 10, 14:
+        ...     event = Event()
+        ...     event.add('dtstart', datetime(2024, 1, 2, hour))
+        ...     event.add('duration', timedelta(hours=1, minutes=30))
+        ...     calendar.add_component(event)
+        >>> freebusy = calendar.freebusy(datetime(2024, 1, 2),
+        ...                              datetime(2024, 1, 3))
+        >>> for period in freebusy['FREEBUSY']:
+        ...     print(period.to_ical().decode())
+        20240102T090000Z/20240102T113000Z
+        20240102T140000Z/20240102T153000Z
+
+        :param attendee: If given, only the events that this calendar user
+                         address organizes or attends and the events without
+                         ORGANIZER and ATTENDEE are busy time. Declined
+                         events are free and events that are not accepted
+                         yet are BUSY-TENTATIVE.
+        :param tzinfo: The timezone of floating times and dates.
+        :returns: a FreeBusy component with UID, DTSTAMP, DTSTART and DTEND
+                  in UTC, the ATTENDEE and the FREEBUSY periods, see
+                  icalendar.freebusy.busy_periods()
+        """
+        freebusy = FreeBusy()
+        freebusy.add('uid', UIDGenerator.uid())
+        freebusy.add('dtstamp', datetime.now(pytz.utc))
+        periods = busy_periods(self.walk('VEVENT'), start, end, attendee,
+                               tzinfo)
+        freebusy.add('dtstart', normalize(start, tzinfo).astimezone(pytz.utc))
+        freebusy.add('dtend', normalize(end, tzinfo).astimezone(pytz.utc))
+        if attendee is not None:
+            freebusy.add('attendee', vCalAddress(attendee))
+        for period, fbtype in sorted(
+                (period, fbtype) for fbtype, fbtype_periods in periods.items()
+                for period in fbtype_periods):
+            value = vPeriod(period)
+            # FREEBUSY is always a period in UTC and BUSY by default
+            value.params = Parameters()
+            if fbtype != 'BUSY':
+                value.params['FBTYPE'] = fbtype
+            freebusy.add('freebusy', value)
+        return freebusy
+
 # These are read only singleton, so one instance is enough for the module
 types_factory = TypesFactory()
 component_factory = ComponentFactory()
@@ -1,7 +1,5 @@
 from icalendar.parser_tools import to_unicode
 
-from collections import OrderedDict
-
 
 def canonsort_keys(keys, canonical_order=None):
     """Sorts leading keys according to canonical_order.  Keys not specified in
@@ -20,40 +18,47 @@ def canonsort_items(dict1, canonical_order=None):
             in canonsort_keys(dict1.keys(), canonical_order)]
 
 
-class CaselessDict(OrderedDict):
+class CaselessDict(dict):
     """A dictionary that isn't case sensitive, and only uses strings as keys.
     Values retain their case.
+
+    All keys are stored in uppercase. Keys that are uppercase already are
+    used as they are.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         """Set keys to upper for initial dict.
         """
-        super().__init__(*args, **kwargs)
-        for key, value in self.items():
-            key_upper = to_unicode(key).upper()
-            if key != key_upper:
-                super().__delitem__(key)
-                self[key_upper] = value
+        super().__init__()
+        if args or kwargs:
+            self.update(*args, **kwargs)
 
     def __getitem__(self, key):
-        key = to_unicode(key)
-        return super().__getitem__(key.upper())
+        if type(key) is not str or not key.isupper():
+            key = to_unicode(key).upper()
+        return dict.__getitem__(self, key)
 
     def __setitem__(self, key, value):
-        key = to_unicode(key)
-        super().__setitem__(key.upper(), value)
+        if type(key) is not str or not key.isupper():
+            key = to_unicode(key).upper()
+        dict.__setitem__(self, key, value)
 
     def __delitem__(self, key):
-        key = to_unicode(key)
-        super().__delitem__(key.upper())
+        if type(key) is not str or not key.isupper():
+            key = to_unicode(key).upper()
+        dict.__delitem__(self, key)
 
     def __contains__(self, key):
-        key = to_unicode(key)
-        return super().__contains__(key.upper())
+        if type(key) is not str or not key.isupper():
+            key = to_unicode(key).upper()
+        return dict.__contains__(self, key)
 
     def get(self, key, default=None):
-        key = to_unicode(key)
-        return super().get(key.upper(), default)
+        if type(key) is not str or not key.isupper():
+            key = to_unicode(key).upper()
+        return dict.get(self, key, default)
 
     def setdefault(self, key, value=None):
         key = to_unicode(key)
@@ -67,8 +72,7 @@ class CaselessDict(OrderedDict):
         return super().popitem()
 
     def has_key(self, key):
-        key = to_unicode(key)
-        return super().__contains__(key.upper())
+        return key in self
 
     def update(self, *args, **kwargs):
         # Multiple keys where key1.upper() == key2.upper() will be lost.
@@ -80,10 +84,10 @@ class CaselessDict(OrderedDict):
                 self[key] = value
 
     def copy(self):
-        return type(self)(super().copy())
+        return type(self)(self.items())
 
     def __repr__(self):
-        return f'{type(self).__name__}({dict(self)})'
+        return f'{type(self).__name__}({dict(self.items())})'
 
     def __eq__(self, other):
         return self is other or dict(self.items()) == dict(other.items())
@@ -78,10 +78,9 @@ def main():
     argv = parser.parse_args()
 
     for calendar_file in argv.calendar_files:
-        with open(calendar_file) as f:
-            calendar = Calendar.from_ical(f.read())
-            for event in calendar.walk('vevent'):
-                argv.output.write(view(event) + '\n\n')
+        calendar = Calendar.from_file(calendar_file)
+        for event in calendar.walk('vevent'):
+            argv.output.write(view(event) + '\n\n')
 
 if __name__ == '__main__':
     main()
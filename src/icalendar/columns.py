@@ -0,0 +1,140 @@
+"""Export the properties of components as columns.
+
+The columns are made from the property values directly, without decoding
+the properties with Component.decoded(). Date and time columns are arrays
+of 64 bit integers, the microseconds since the epoch in UTC. numpy reads
+them without copying::
+
+    numpy.frombuffer(columns['DTSTART'], dtype='datetime64[us]')
+
+Missing values are -2**63, which is NaT for numpy and pandas. Floating
+times are local times in the timezone of the export, which is UTC by
+default. A date is the midnight at the start of that day.
+"""
+from array import array
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from icalendar.parser_tools import DEFAULT_ENCODING
+from icalendar.prop import TypesFactory
+from icalendar.prop import vCategory
+from icalendar.recurrence import localize
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=pytz.utc)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+# the value of missing dates, times and durations, NaT in numpy and pandas
+MISSING = -2 ** 63
+
+
+def _instant(value, tzinfo, dates):
+    """Microseconds since the epoch of a date or datetime or MISSING."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            return (value - EPOCH) // MICROSECOND
+        if tzinfo is pytz.utc:
+            return (value - NAIVE_EPOCH) // MICROSECOND
+        return (localize(value, tzinfo) - EPOCH) // MICROSECOND
+    if isinstance(value, date):
+        # dates repeat a lot, so they are converted once
+        instant = dates.get(value)
+        if instant is None:
+            instant = dates[value] = _instant(
+                datetime(value.year, value.month, value.day), tzinfo, dates)
+        return instant
+    return MISSING
+
+
+def _text(value):
+    """The text of a property value."""
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, vCategory):
+        return [str(category) for category in value.cats]
+    ical = value.to_ical()
+    if isinstance(ical, bytes):
+        ical = ical.decode(DEFAULT_ENCODING)
+    return ical
+
+
+def _texts(values):
+    """The texts of a property that occurs several times."""
+    texts = []
+    for value in values:
+        text = _text(value)
+        if isinstance(text, list):
+            texts.extend(text)
+        else:
+            texts.append(text)
+    return texts
+
+
+def _values(components, name, first=False):
+    """The value of a property of each component or None.
+
+    If first is true, only the first value of properties that occur
+    several times is used.
+    """
+    get = dict.get
+    values = [
+        component.get(name) if component._lazy else get(component, name)
+        for component in components
+    ]
+    if first:
+        values = [value[0] if isinstance(value, list) else value
+                  for value in values]
+    return values
+
+
+def to_columns(components, fields, tzinfo=pytz.utc,
+               types_map=TypesFactory.types_map):
+    """Return the values of the properties of the components as columns.
+
+    :param fields: The names of the properties.
+    :param tzinfo: The timezone of floating times and dates.
+    :param types_map: The value types of properties by their name.
+    :returns: a dictionary of the fields and their columns. There is one
+              row for each component. Columns of DATE-TIME properties,
+              like DTSTART, are array('q') of microseconds since the
+              epoch. DURATION columns are array('q') of microseconds.
+              Missing values are MISSING. Columns of INTEGER properties
+              are lists of int or None. All other columns are lists of
+              text or None. Properties that occur several times, like
+              ATTENDEE, and CATEGORIES are lists of texts.
+    """
+    fields = list(fields)
+    components = list(components)
+    columns = []
+    dates = {}
+    for field in fields:
+        name = str(field).upper()
+        value_type = types_map.get(name, 'text')
+        values = _values(components, name, first=value_type in (
+            'date-time', 'duration', 'integer'))
+        if value_type == 'date-time':
+            column = array('q', [
+                MISSING if value is None else
+                _instant(getattr(value, 'dt', value), tzinfo, dates)
+                for value in values
+            ])
+        elif value_type == 'duration':
+            column = array('q', [
+                value.dt // MICROSECOND
+                if isinstance(getattr(value, 'dt', None), timedelta)
+                else MISSING
+                for value in values
+            ])
+        elif value_type == 'integer':
+            column = [None if value is None else int(value)
+                      for value in values]
+        else:
+            column = [
+                None if value is None else
+                _texts(value) if isinstance(value, list) else _text(value)
+                for value in values
+            ]
+        columns.append(column)
+    return dict(zip(fields, columns))
@@ -0,0 +1,169 @@
+"""Free and busy time of the events of a calendar.
+
+The occurrences of the events in a time window are expanded with
+icalendar.recurrence. Events that are TRANSPARENT or CANCELLED take no
+time. TENTATIVE events and events that an attendee has not accepted yet
+are tentatively busy. The busy periods of each FBTYPE are merged by
+sorting them and sweeping over them once, so this takes O(n log n) for n
+occurrences.
+
+All periods are in UTC. Floating times are local times in the timezone
+of the query, which is UTC by default. A date is the midnight at the start
+of that day.
+"""
+from itertools import chain
+
+import pytz
+
+from icalendar.recurrence import calendar_occurrences
+from icalendar.recurrence import normalize
+
+
+BUSY = 'BUSY'
+BUSY_TENTATIVE = 'BUSY-TENTATIVE'
+
+# PARTSTAT values of attendees and the time they are busy
+PARTICIPATION = {
+    'ACCEPTED': BUSY,
+    'DELEGATED': None,
+    'DECLINED': None,
+    'TENTATIVE': BUSY_TENTATIVE,
+    'NEEDS-ACTION': BUSY_TENTATIVE,
+}
+
+
+def merge_periods(periods):
+    """Merge overlapping and adjacent periods.
+
+    :param periods: an iterable of (start, end) pairs
+    :returns: a sorted list of (start, end) pairs that do not overlap
+    """
+    merged = []
+    for start, end in sorted(periods):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_periods(periods, other):
+    """Remove the merged periods other from the merged periods.
+
+    Both lists are sorted, so they are swept over once.
+    """
+    result = []
+    position = 0
+    for start, end in periods:
+        while position < len(other) and other[position][1] <= start:
+            position += 1
+        index = position
+        while index < len(other) and other[index][0] < end:
+            other_start, other_end = other[index]
+            if other_start > start:
+                result.append((start, other_start))
+            start = max(start, other_end)
+            index += 1
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def _address(address):
+    """Normalize a calendar user address for comparison."""
+    address = str(address).strip().lower()
+    if address.startswith('mailto:'):
+        address = address[7:]
+    return address
+
+
+def _as_list(values):
+    if values is None:
+        return []
+    return values if isinstance(values, list) else [values]
+
+
+def busy_type(component, attendee=None):
+    """Return the FBTYPE of the time of a component or None if it is free.
+
+    :param attendee: If given, a component with an ORGANIZER or ATTENDEE
+                     only takes the time of this calendar user address if
+                     it is the organizer or an attendee who did not
+                     decline. Components without them are busy time of
+                     the owner of the calendar.
+    """
+    if str(component.get('TRANSP', 'OPAQUE')).upper() == 'TRANSPARENT':
+        return None
+    status = str(component.get('STATUS', 'CONFIRMED')).upper()
+    if status == 'CANCELLED':
+        return None
+    fbtype = BUSY_TENTATIVE if status == 'TENTATIVE' else BUSY
+    if attendee is None:
+        return fbtype
+    organizers = _as_list(component.get('ORGANIZER'))
+    attendees = _as_list(component.get('ATTENDEE'))
+    if not organizers and not attendees:
+        return fbtype
+    attendee = _address(attendee)
+    if any(_address(organizer) == attendee
+           for organizer in organizers):
+        return fbtype
+    for address in attendees:
+        if _address(address) != attendee:
+            continue
+        params = getattr(address, 'params', {})
+        participation = PARTICIPATION.get(
+            str(params.get('PARTSTAT', 'NEEDS-ACTION')).upper(), BUSY)
+        if participation is None:
+            return None
+        return BUSY_TENTATIVE if BUSY_TENTATIVE in (
+            participation, fbtype) else BUSY
+    return None
+
+
+def busy_periods(components, start, end, attendee=None, tzinfo=pytz.utc):
+    """Return the merged busy periods of the components in a time window.
+
+    :param components: the components, e.g. the events of a calendar
+    :param start: the start of the window, a date or datetime
+    :param end: the end of the window, excluded
+    :param attendee: the calendar user address to compute the time of, see
+                     busy_type()
+    :param tzinfo: The timezone of floating times and dates.
+    :returns: a dictionary of the FBTYPEs BUSY and BUSY-TENTATIVE and their
+              sorted (start, end) periods in UTC, clipped to the window.
+              Tentative periods do not overlap busy ones.
+    """
+    window_start = normalize(start, tzinfo).astimezone(tzinfo)
+    window_end = normalize(end, tzinfo).astimezone(tzinfo)
+    utc_start = window_start.astimezone(pytz.utc)
+    utc_end = window_end.astimezone(pytz.utc)
+    periods = {BUSY: [], BUSY_TENTATIVE: []}
+    for occurrence in calendar_occurrences(
+            components, window_start, window_end):
+        fbtype = busy_type(occurrence.component, attendee)
+        if fbtype is None:
+            continue
+        period_start = max(
+            normalize(occurrence.start, tzinfo).astimezone(pytz.utc),
+            utc_start)
+        period_end = min(
+            normalize(occurrence.end, tzinfo).astimezone(pytz.utc), utc_end)
+        if period_start < period_end:
+            periods[fbtype].append((period_start, period_end))
+    busy = merge_periods(periods[BUSY])
+    tentative = subtract_periods(merge_periods(periods[BUSY_TENTATIVE]), busy)
+    return {BUSY: busy, BUSY_TENTATIVE: tentative}
+
+
+def free_periods(busy, start, end):
+    """Return the gaps between merged busy periods in a window."""
+    free = []
+    for busy_start, busy_end in chain(busy, [(end, end)]):
+        if busy_start > start:
+            free.append((start, min(busy_start, end)))
+        start = max(start, busy_end)
+        if start >= end:
+            break
+    return free
@@ -0,0 +1,266 @@
+"""An index of the components of a calendar for time-range queries.
+
+All times are stored as instants in microseconds since the epoch in UTC.
+Floating times are local times in the timezone of the index, which is UTC
+by default. A date is the midnight at the start of that day in the timezone
+of the index. Events with a date as DTSTART and without end last one day.
+Components without duration are found by windows that contain their start.
+
+Components without recurrence are stored in arrays sorted by their start
+with an implicit interval tree over them, like cgranges does it. Queries
+take O(log n + k) for k results. Recurring components are expanded at
+query time with icalendar.recurrence.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+import pytz
+
+from icalendar.recurrence import Occurrence
+from icalendar.recurrence import _duration
+from icalendar.recurrence import _occurrence_end
+from icalendar.recurrence import _value
+from icalendar.recurrence import normalize
+from icalendar.recurrence import occurrences
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=pytz.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+# the components which are indexed
+INDEXED_COMPONENTS = ('VEVENT', 'VTODO', 'VJOURNAL')
+
+
+class CalendarIndex:
+    """Answer which components of a calendar are in a time range.
+
+    >>> from datetime import datetime
+    >>> from icalendar import Calendar, Event
+    >>> calendar = Calendar()
+    >>> event = Event()
+    >>> event.add('summary', 'Meeting')
+    >>> event.add('dtstart', datetime(2024, 1, 2, 10))
+    >>> event.add('dtend', datetime(2024, 1, 2, 11))
+    >>> calendar.add_component(event)
+    >>> index = CalendarIndex(calendar)
+    >>> for start, end, component in index.overlapping(
+    ...         datetime(2024, 1, 2, 9), datetime(2024, 1, 2, 17)):
+    ...     print(start, component['summary'])
+    2024-01-02 10:00:00 Meeting
+    """
+
+    def __init__(self, calendar=None, tzinfo=pytz.utc):
+        """Create an index of the components of calendar.
+
+        :param tzinfo: The timezone of floating times and dates.
+        """
+        self.tzinfo = tzinfo
+        self._starts = []
+        self._ends = []
+        self._occurrences = []
+        self._max_ends = []
+        self._root = -1
+        self._changed = False
+        # recurring components and the components with a RECURRENCE-ID
+        self._recurring = {}
+        self._overrides = {}
+        if calendar is not None:
+            entries = []
+            for component in calendar.walk():
+                if component.name in INDEXED_COMPONENTS:
+                    entry = self._entry(component)
+                    if entry is not None:
+                        entries.append(entry)
+            entries.sort(key=lambda entry: entry[0])
+            for start, end, occurrence in entries:
+                self._starts.append(start)
+                self._ends.append(end)
+                self._occurrences.append(occurrence)
+            self._changed = True
+
+    def __len__(self):
+        return len(self._occurrences) + \
+            sum(len(c) for c in self._recurring.values()) + \
+            sum(len(c) for c in self._overrides.values())
+
+    def _instant(self, value):
+        """Microseconds since the epoch of a date or datetime."""
+        return (normalize(value, self.tzinfo) - EPOCH) // MICROSECOND
+
+    def _span(self, occurrence):
+        start = self._instant(occurrence.start)
+        # components without duration overlap the instant of their start
+        return start, max(self._instant(occurrence.end), start + 1)
+
+    def _entry(self, component):
+        """Return (start, end, occurrence) of a component without recurrence.
+
+        Recurring components are remembered and None is returned.
+        """
+        start = _value(component, 'DTSTART')
+        if start is None:
+            return None
+        uid = str(component.get('UID', ''))
+        if 'RECURRENCE-ID' in component:
+            self._overrides.setdefault(uid, []).append(component)
+        elif 'RRULE' in component or 'RDATE' in component:
+            self._recurring.setdefault(uid, []).append(component)
+        else:
+            occurrence = Occurrence(
+                start, _occurrence_end(start, _duration(component, start)),
+                component)
+            return self._span(occurrence) + (occurrence,)
+        return None
+
+    def add(self, component):
+        """Add a component to the index.
+
+        Components without DTSTART are ignored.
+        """
+        entry = self._entry(component)
+        if entry is not None:
+            start, end, occurrence = entry
+            i = bisect_right(self._starts, start)
+            self._starts.insert(i, start)
+            self._ends.insert(i, end)
+            self._occurrences.insert(i, occurrence)
+            self._changed = True
+
+    def remove(self, component):
+        """Remove a component from the index.
+
+        :raises ValueError: if the component is not in the index.
+        """
+        uid = str(component.get('UID', ''))
+        for components in (self._overrides.get(uid, ()),
+                           self._recurring.get(uid, ())):
+            for i, other in enumerate(components):
+                if other is component:
+                    del components[i]
+                    return
+        start = _value(component, 'DTSTART')
+        i = 0
+        if start is not None:
+            # the component is found quickly if DTSTART is unchanged
+            i = bisect_left(self._starts, self._instant(start))
+        for indices in (range(i, len(self._occurrences)), range(i)):
+            for i in indices:
+                if self._occurrences[i].component is component:
+                    del self._starts[i]
+                    del self._ends[i]
+                    del self._occurrences[i]
+                    self._changed = True
+                    return
+        raise ValueError(f'{component!r} is not in the index')
+
+    def _index(self):
+        """Compute the maximum end of each subtree of the implicit tree."""
+        ends = self._ends
+        n = len(ends)
+        self._max_ends = max_ends = list(ends)
+        self._changed = False
+        if n == 0:
+            self._root = -1
+            return
+        last_i = (n - 1) & ~1
+        last = ends[last_i]
+        k = 1
+        while 1 << k <= n:
+            x = 1 << (k - 1)
+            step = x << 2
+            for i in range((x << 1) - 1, n, step):
+                end_right = max_ends[i + x] if i + x < n else last
+                max_ends[i] = max(ends[i], max_ends[i - x], end_right)
+            last_i = last_i - x if last_i >> k & 1 else last_i + x
+            if last_i < n and max_ends[last_i] > last:
+                last = max_ends[last_i]
+            k += 1
+        self._root = k - 1
+
+    def _overlapping_indices(self, start, end):
+        """The indices of the stored spans that overlap [start, end)."""
+        if self._changed:
+            self._index()
+        if self._root < 0:
+            return []
+        starts = self._starts
+        ends = self._ends
+        max_ends = self._max_ends
+        n = len(starts)
+        result = []
+        stack = [((1 << self._root) - 1, self._root, False)]
+        while stack:
+            x, k, left_done = stack.pop()
+            if k <= 3:
+                # scan small subtrees
+                i = x >> k << k
+                i1 = min(i + (1 << (k + 1)) - 1, n)
+                while i < i1 and starts[i] < end:
+                    if start < ends[i]:
+                        result.append(i)
+                    i += 1
+            elif not left_done:
+                stack.append((x, k, True))
+                left = x - (1 << (k - 1))
+                if left >= n or max_ends[left] > start:
+                    stack.append((left, k - 1, False))
+            elif x < n and starts[x] < end:
+                if start < ends[x]:
+                    result.append(x)
+                stack.append((x + (1 << (k - 1)), k - 1, False))
+        return result
+
+    def _recurring_occurrences(self, start, end):
+        window_start = normalize(start, self.tzinfo)
+        window_end = normalize(end, self.tzinfo)
+        for uid, components in self._recurring.items():
+            overrides = self._overrides.get(uid, ())
+            for component in components:
+                yield from occurrences(component, window_start, window_end,
+                                       overrides)
+        for uid, overrides in self._overrides.items():
+            if self._recurring.get(uid):
+                continue
+            for component in overrides:
+                yield from occurrences(component, window_start, window_end)
+
+    def _sorted(self, occurrences):
+        return sorted(occurrences,
+                      key=lambda occurrence: self._instant(occurrence.start))
+
+    def overlapping(self, start, end):
+        """Return the occurrences that overlap the time range [start, end).
+
+        :returns: a list of icalendar.recurrence.Occurrence sorted by start
+        """
+        indices = self._overlapping_indices(self._instant(start),
+                                            self._instant(end))
+        indices.sort()
+        result = [self._occurrences[i] for i in indices]
+        recurring = list(self._recurring_occurrences(start, end))
+        if recurring:
+            result = self._sorted(result + recurring)
+        return result
+
+    def within(self, start, end):
+        """Return the occurrences that start and end in the range [start, end).
+
+        :returns: a list of icalendar.recurrence.Occurrence sorted by start
+        """
+        first = self._instant(start)
+        last = self._instant(end)
+        ends = self._ends
+        result = [
+            self._occurrences[i]
+            for i in range(bisect_left(self._starts, first),
+                           bisect_left(self._starts, last))
+            if ends[i] <= last
+        ]
+        recurring = []
+        for occurrence in self._recurring_occurrences(start, end):
+            occurrence_start, occurrence_end = self._span(occurrence)
+            if occurrence_start >= first and occurrence_end <= last:
+                recurring.append(occurrence)
+        if recurring:
+            result = self._sorted(result + recurring)
+        return result
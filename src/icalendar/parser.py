@@ -12,6 +12,7 @@ from icalendar.parser_tools import SEQUENCE_TYPES
 from icalendar.parser_tools import to_unicode
 
 import re
+from sys import intern
 
 
 def escape_char(text):
@@ -81,6 +82,44 @@ def foldline(line, limit=75, fold_sep='\r\n '):
             line[i:i + limit - 1] for i in range(0, len(line), limit - 1)
         )
 
+    if limit < 5:
+        # a character can be longer than a folded line
+        return _fold_characters(line, limit, fold_sep)
+    return fold_bytes(
+        line.encode(DEFAULT_ENCODING), limit, fold_sep.encode(DEFAULT_ENCODING)
+    ).decode(DEFAULT_ENCODING)
+
+
+# UTF-8 continuation bytes are not the first byte of a character
+_FOLD_REGEXES = {
+    limit: re.compile(
+        b'.{1,%d}(?![\x80-\xbf])' % (limit - 1), re.DOTALL)
+    for limit in (75,)
+}
+
+
+def fold_bytes(line, limit=75, fold_sep=b'\r\n '):
+    """Fold a UTF-8 encoded content line like foldline().
+
+    The bytes are split in bulk by a regular expression that only splits
+    before the first byte of a character, so that no character is broken.
+    The result is the same as the one of foldline() encoded.
+    """
+    if len(line) < limit:
+        return line
+    if limit < 5:
+        return _fold_characters(
+            line.decode(DEFAULT_ENCODING), limit,
+            fold_sep.decode(DEFAULT_ENCODING)).encode(DEFAULT_ENCODING)
+    regex = _FOLD_REGEXES.get(limit)
+    if regex is None:
+        regex = _FOLD_REGEXES[limit] = re.compile(
+            b'.{1,%d}(?![\x80-\xbf])' % (limit - 1), re.DOTALL)
+    return fold_sep.join(regex.findall(line))
+
+
+def _fold_characters(line, limit, fold_sep):
+    """Fold a line character by character, counting the bytes of each."""
     ret_chars = []
     byte_count = 0
     for char in line:
@@ -121,6 +160,22 @@ uFOLD = re.compile('(\r?\n)+[ \t]')
 NEWLINE = re.compile(r'\r?\n')
 
 
+def unfold(st):
+    """Remove the folds of a str or bytes, like uFOLD.sub('', st).
+
+    If all line breaks are CRLF and there are no empty lines, the folds are
+    CRLF followed by a space or a tab. They are removed with replace(),
+    which is much faster than the regular expression.
+    """
+    if isinstance(st, bytes):
+        crlf, lf, space, tab, empty = b'\r\n', b'\n', b' ', b'\t', b''
+    else:
+        crlf, lf, space, tab, empty = '\r\n', '\n', ' ', '\t', ''
+    if st.count(lf) == st.count(crlf) and crlf + crlf not in st:
+        return st.replace(crlf + space, empty).replace(crlf + tab, empty)
+    return (FOLD if isinstance(st, bytes) else uFOLD).sub(empty, st)
+
+
 def validate_token(name):
     match = NAME.findall(name)
     if len(match) == 1 and name == match[0]:
@@ -284,10 +339,25 @@ def unescape_list_or_string(val):
 #########################################
 # parsing and generation of content lines
 
+# Content lines without escaped characters in the name and the parameters
+# are split in one pass by these expressions. Parameter values are validated
+# like in Parameters.from_ical().
+_UNQUOTED_VALUE = r'[^\x00-\x08\x0a-\x1f\x7f",:;\\%]*'
+_QUOTED_VALUE = r'"[^\x00-\x08\x0a-\x1f\x7f"\\%]*"'
+_PARAM_VALUES = (f'(?:{_QUOTED_VALUE}|{_UNQUOTED_VALUE})'
+                 f'(?:,(?:{_QUOTED_VALUE}|{_UNQUOTED_VALUE}))*')
+CONTENT_LINE = re.compile(
+    rf'([\w.-]+)((?:;[\w.-]+={_PARAM_VALUES})*):(.*)', re.DOTALL)
+PARAMETER = re.compile(rf';([\w.-]+)=({_PARAM_VALUES})')
+
+
 class Contentline(str):
     """A content line is basically a string that can be folded and parsed into
     parts.
     """
+
+    __slots__ = ('strict',)
+
     def __new__(cls, value, strict=False, encoding=DEFAULT_ENCODING):
         value = to_unicode(value, encoding=encoding)
         assert '\n' not in value, ('Content line can not contain unescaped '
@@ -296,6 +366,10 @@ class Contentline(str):
         self.strict = strict
         return self
 
+    def __reduce__(self):
+        # needed for the pickle protocols 0 and 1, as there are __slots__
+        return type(self), (str(self), self.strict)
+
     @classmethod
     def from_parts(cls, name, params, values, sorted=True):
         """Turn a parts into a content line.
@@ -320,6 +394,32 @@ class Contentline(str):
     def parts(self):
         """Split the content line up into (name, parameters, values) parts.
         """
+        match = CONTENT_LINE.match(self)
+        if match is None:
+            # escaped characters in name or parameters or an invalid line
+            return self._scan_parts()
+        name, params_string, values = match.groups()
+        params = Parameters()
+        for key, vals in PARAMETER.findall(params_string):
+            vals = vals.split(',') if '"' not in vals else q_split(vals)
+            for i, v in enumerate(vals):
+                if v.startswith('"'):
+                    vals[i] = v[1:-1]
+                else:
+                    # values like ACCEPTED or a TZID repeat in many lines
+                    vals[i] = intern(v.upper() if self.strict else v)
+            params[intern(key.upper())] = vals[0] if len(vals) == 1 else vals
+        if '\\' in values or '%' in values:
+            values = unescape_string(escape_string(values))
+        return (name, params, values)
+
+    def _scan_parts(self):
+        """Split the content line up into (name, parameters, values) parts
+        character by character.
+
+        This handles escaped characters anywhere in the line and reports
+        invalid lines.
+        """
         try:
             st = escape_string(self)
             name_split = None
@@ -359,19 +459,19 @@ class Contentline(str):
         """
         ical = to_unicode(ical)
         # a fold is carriage return followed by either a space or a tab
-        return cls(uFOLD.sub('', ical), strict=strict)
+        return cls(unfold(ical), strict=strict)
 
     def to_ical(self):
         """Long content lines are folded so they are less than 75 characters
         wide.
         """
-        return foldline(self).encode(DEFAULT_ENCODING)
+        return fold_bytes(self.encode(DEFAULT_ENCODING))
 
 
 class Contentlines(list):
     """I assume that iCalendar files generally are a few kilobytes in size.
-    Then this should be efficient. for Huge files, an iterator should probably
-    be used instead.
+    Then this should be efficient. for Huge files, use unfold_lines() which
+    is an iterator instead.
     """
 
     def to_ical(self):
@@ -382,18 +482,53 @@ class Contentlines(list):
     @classmethod
     def from_ical(cls, st):
         """Parses a string into content lines.
+
+        Bytes are unfolded and split into lines before each line is decoded.
         """
-        st = to_unicode(st)
+        if not isinstance(st, bytes):
+            st = to_unicode(st)
         try:
             # a fold is carriage return followed by either a space or a tab
-            unfolded = uFOLD.sub('', st)
+            unfolded = unfold(st)
+            if isinstance(unfolded, bytes):
+                crlf, lf = b'\r\n', b'\n'
+            else:
+                crlf, lf = '\r\n', '\n'
+            # like NEWLINE.split(), but faster
             lines = cls(Contentline(line) for
-                        line in NEWLINE.split(unfolded) if line)
+                        line in unfolded.replace(crlf, lf).split(lf) if line)
             lines.append('')  # '\r\n' at the end of every content line
             return lines
         except Exception:
             raise ValueError('Expected StringType with content lines')
 
 
+def unfold_lines(lines):
+    """Unfold physical lines into content lines, one at a time.
+
+    ``lines`` is any iterable of str or bytes lines, e.g. a file object opened
+    in text or binary mode. A line starting with a space or a tab continues
+    the previous line. Only the content line that is currently being unfolded
+    is kept in memory, so this works for files of any size.
+
+    Bytes are joined before they are decoded, so that a multi-byte character
+    which was folded in the middle is not broken.
+    """
+    pending = None
+    for line in lines:
+        line = line.rstrip('\r\n' if isinstance(line, str) else b'\r\n')
+        if not line:
+            # empty lines are ignored, also between folded lines
+            continue
+        if line[:1] in (' ', '\t', b' ', b'\t') and pending is not None:
+            pending.append(line[1:])
+            continue
+        if pending is not None:
+            yield Contentline(pending[0][:0].join(pending))
+        pending = [line]
+    if pending is not None:
+        yield Contentline(pending[0][:0].join(pending))
+
+
 # XXX: what kind of hack is this? import depends to be at end
 from icalendar.prop import vText
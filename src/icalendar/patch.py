@@ -0,0 +1,194 @@
+"""The changes between two versions of a calendar.
+
+Calendar.make_patch() compares the subcomponents of two calendars by their UID
+and RECURRENCE-ID in dictionaries and returns a CalendarPatch. The patch
+contains the added components, the keys of the removed ones and only the
+properties that changed in the other components. Calendar.apply_patch()
+applies it to a calendar, for example to another copy of the old version.
+VTIMEZONEs are identified by their TZID. Components without UID and TZID
+are identified by their content hash, so they are only added or removed.
+If several components of a calendar have the same key, only the last one
+of them is compared and changed.
+"""
+from collections import namedtuple
+
+
+class ComponentChange(namedtuple('ComponentChange', (
+        'key', 'sequence', 'properties', 'subcomponents'))):
+    """The changes of a component in a CalendarPatch.
+
+    :param key: the key of the changed component, see component_key()
+    :param sequence: the SEQUENCE of the new version or None
+    :param properties: a dictionary of the changed properties and their new
+                       values. Removed properties have the value None.
+    :param subcomponents: the new subcomponents, like VALARMs, or None if
+                          they did not change
+    """
+
+
+class CalendarPatch:
+    """The changes between two versions of a calendar.
+
+    :param added: the new components
+    :param removed: the keys of the removed components, see component_key()
+    :param modified: a ComponentChange for each changed component
+    :param properties: the changed properties of the calendar itself, with
+                       the value None for removed properties
+    """
+
+    def __init__(self, added=(), removed=(), modified=(), properties=None):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.modified = list(modified)
+        self.properties = dict(properties or {})
+
+    def __bool__(self):
+        """Returns True if the patch changes something."""
+        return bool(self.added or self.removed or self.modified or
+                    self.properties)
+
+    def __eq__(self, other):
+        if not isinstance(other, CalendarPatch):
+            return NotImplemented
+        return (self.added, self.removed, self.modified, self.properties) == (
+            other.added, other.removed, other.modified, other.properties)
+
+    def __repr__(self):
+        return (f'{type(self).__name__}(added={len(self.added)}, '
+                f'removed={len(self.removed)}, '
+                f'modified={len(self.modified)}, '
+                f'properties={sorted(self.properties)})')
+
+
+def component_key(component):
+    """Return the key that identifies a subcomponent of a calendar.
+
+    The key is the name of the component with its UID and the time of its
+    RECURRENCE-ID. Only the name and TZID identify VTIMEZONEs and the name
+    and the content hash other components without UID.
+    """
+    uid = _first(component.get('UID'))
+    if uid is None:
+        tzid = _first(component.get('TZID'))
+        if tzid is not None:
+            return (component.name, str(tzid))
+        return (component.name, component.content_hash())
+    recurrence_id = _first(component.get('RECURRENCE-ID'))
+    return (component.name, str(uid),
+            getattr(recurrence_id, 'dt', recurrence_id))
+
+
+def _first(value):
+    """The first value of a property that occurs several times."""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+def _sequence(component):
+    try:
+        return int(_first(component.get('SEQUENCE', 0)))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _index(components):
+    """Map the keys of the components to their position."""
+    return {component_key(component): position
+            for position, component in enumerate(components)}
+
+
+def _property_changes(old, new):
+    """The properties of new that differ from the ones of old."""
+    changes = {}
+    for name in new.keys():
+        value = new[name]
+        if name not in old or old[name] != value:
+            changes[name] = value
+    for name in old.keys():
+        if name not in new:
+            changes[name] = None
+    return changes
+
+
+def _subcomponent_hashes(component):
+    return sorted(subcomponent.content_hash()
+                  for subcomponent in component.subcomponents)
+
+
+def diff_calendars(old, new):
+    """Return the CalendarPatch that changes the calendar old into new.
+
+    Components with the same key and content hash are unchanged. Both
+    calendars are indexed once, so this takes linear time.
+    """
+    old_index = _index(old.subcomponents)
+    new_index = _index(new.subcomponents)
+    added = []
+    modified = []
+    for key, position in new_index.items():
+        component = new.subcomponents[position]
+        if key not in old_index:
+            added.append(component)
+            continue
+        old_component = old.subcomponents[old_index[key]]
+        if old_component.content_hash() == component.content_hash():
+            continue
+        properties = _property_changes(old_component, component)
+        subcomponents = None
+        if _subcomponent_hashes(old_component) != \
+                _subcomponent_hashes(component):
+            subcomponents = list(component.subcomponents)
+        if properties or subcomponents is not None:
+            sequence = component.get('SEQUENCE')
+            modified.append(ComponentChange(
+                key, None if sequence is None else _sequence(component),
+                properties, subcomponents))
+    removed = [key for key in old_index if key not in new_index]
+    return CalendarPatch(added, removed, modified,
+                         _property_changes(old, new))
+
+
+def apply_patch(calendar, patch):
+    """Change the calendar with a CalendarPatch.
+
+    Changes of components with a higher SEQUENCE in the calendar than in
+    the patch are skipped, as the calendar has a newer version of them.
+    The components and values of the patch are used and not copied.
+
+    :raises ValueError: if a component to remove or change is not in the
+                        calendar or an added one is in it already. The
+                        calendar is not changed then.
+    """
+    index = _index(calendar.subcomponents)
+    keys = list(patch.removed) + [change.key for change in patch.modified]
+    for key in keys:
+        if key not in index:
+            raise ValueError(f'The component {key} is not in the calendar.')
+    for component in patch.added:
+        key = component_key(component)
+        if key in index:
+            raise ValueError(f'The component {key} is in the calendar.')
+
+    for change in patch.modified:
+        component = calendar.subcomponents[index[change.key]]
+        if change.sequence is not None and \
+                _sequence(component) > change.sequence:
+            continue
+        _apply_properties(component, change.properties)
+        if change.subcomponents is not None:
+            component.subcomponents[:] = change.subcomponents
+    _apply_properties(calendar, patch.properties)
+    removed = {index[key] for key in patch.removed}
+    calendar.subcomponents[:] = [
+        component for position, component in
+        enumerate(calendar.subcomponents) if position not in removed
+    ] + patch.added
+
+
+def _apply_properties(component, properties):
+    for name, value in properties.items():
+        if value is None:
+            component.pop(name)
+        else:
+            component[name] = value
@@ -39,6 +39,7 @@ from datetime import datetime
 from datetime import time
 from datetime import timedelta
 from datetime import tzinfo
+from functools import lru_cache
 
 try:
     from dateutil.tz import tzutc
@@ -54,8 +55,7 @@ from icalendar.parser_tools import DEFAULT_ENCODING
 from icalendar.parser_tools import SEQUENCE_TYPES
 from icalendar.parser_tools import to_unicode
 from icalendar.parser_tools import from_unicode
-from icalendar.timezone_cache import _timezone_cache
-from icalendar.windows_to_olson import WINDOWS_TO_OLSON
+from icalendar.timezone_cache import resolve_tzid
 
 import base64
 import binascii
@@ -66,6 +66,7 @@ import time as _time
 DURATION_REGEX = re.compile(r'([-+]?)P(?:(\d+)W)?(?:(\d+)D)?'
                             r'(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
 
+
 WEEKDAY_RULE = re.compile(r'(?P<signal>[+-]?)(?P<relative>[\d]{0,2})'
                           r'(?P<weekday>[\w]{2})$')
 
@@ -123,13 +124,67 @@ class LocalTimezone(tzinfo):
         return tt.tm_isdst > 0
 
 
-class vBinary:
+class ParamsBase:
+    """The parameters of a property value.
+
+    Most values have no parameters. Their Parameters are only created when
+    they are used.
+    """
+
+    __slots__ = ()
+
+    @property
+    def params(self):
+        try:
+            params = self._params
+        except AttributeError:
+            # a subclass did not initialize the value
+            params = None
+        if params is None:
+            params = self._params = Parameters()
+        return params
+
+    @params.setter
+    def params(self, params):
+        self._params = params
+
+    def __getstate__(self):
+        """Return the attributes like the values without __slots__ did,
+        so that pickles are the same for earlier versions.
+        """
+        state = dict(getattr(self, '__dict__', ()))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if hasattr(self, name):
+                    state[name] = getattr(self, name)
+        params = state.pop('_params', None)
+        state['params'] = Parameters() if params is None else params
+        return state
+
+    def __setstate__(self, state):
+        """Restore the attributes of __getstate__() and of pickles made
+        by earlier versions.
+        """
+        if isinstance(state, tuple):
+            # the __dict__ and the slots of the default pickling of slots
+            dict_state, slots_state = state
+            state = {**(dict_state or {}), **(slots_state or {})}
+        else:
+            state = dict(state)
+        self._params = state.pop('params', state.pop('_params', None))
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class vBinary(ParamsBase):
     """Binary property values are base 64 encoded.
     """
 
+    __slots__ = ('obj', '_params')
+
     def __init__(self, obj):
         self.obj = to_unicode(obj)
-        self.params = Parameters(encoding='BASE64', value="BINARY")
+        self._params = Parameters(encoding='BASE64', value="BINARY")
 
     def __repr__(self):
         return f"vBinary('{self.to_ical()}')"
@@ -149,14 +204,14 @@ class vBinary:
         return isinstance(other, vBinary) and self.obj == other.obj
 
 
-class vBoolean(int):
+class vBoolean(ParamsBase, int):
     """Returns specific string according to state.
     """
     BOOL_MAP = CaselessDict({'true': True, 'false': False})
 
     def __new__(cls, *args, **kwargs):
         self = super().__new__(cls, *args, **kwargs)
-        self.params = Parameters()
+        self._params = None
         return self
 
     def to_ical(self):
@@ -170,14 +225,16 @@ class vBoolean(int):
             raise ValueError(f"Expected 'TRUE' or 'FALSE'. Got {ical}")
 
 
-class vCalAddress(str):
+class vCalAddress(ParamsBase, str):
     """This just returns an unquoted string.
     """
 
+    __slots__ = ('_params',)
+
     def __new__(cls, value, encoding=DEFAULT_ENCODING):
         value = to_unicode(value, encoding=encoding)
         self = super().__new__(cls, value)
-        self.params = Parameters()
+        self._params = None
         return self
 
     def __repr__(self):
@@ -191,13 +248,15 @@ class vCalAddress(str):
         return cls(ical)
 
 
-class vFloat(float):
+class vFloat(ParamsBase, float):
     """Just a float.
     """
 
+    __slots__ = ('_params',)
+
     def __new__(cls, *args, **kwargs):
         self = super().__new__(cls, *args, **kwargs)
-        self.params = Parameters()
+        self._params = None
         return self
 
     def to_ical(self):
@@ -211,13 +270,13 @@ class vFloat(float):
             raise ValueError(f'Expected float value, got: {ical}')
 
 
-class vInt(int):
+class vInt(ParamsBase, int):
     """Just an int.
     """
 
     def __new__(cls, *args, **kwargs):
         self = super().__new__(cls, *args, **kwargs)
-        self.params = Parameters()
+        self._params = None
         return self
 
     def to_ical(self):
@@ -231,15 +290,18 @@ class vInt(int):
             raise ValueError(f'Expected int, got: {ical}')
 
 
-class vDDDLists:
+class vDDDLists(ParamsBase):
     """A list of vDDDTypes values.
     """
 
+    __slots__ = ('dts', '_params')
+
     def __init__(self, dt_list):
         if not hasattr(dt_list, '__iter__'):
             dt_list = [dt_list]
         vDDD = []
         tzid = None
+        self._params = None
         for dt in dt_list:
             dt = vDDDTypes(dt)
             vDDD.append(dt)
@@ -248,7 +310,7 @@ class vDDDLists:
 
         if tzid:
             # NOTE: no support for multiple timezones here!
-            self.params = Parameters({'TZID': tzid})
+            self._params = Parameters({'TZID': tzid})
         self.dts = vDDD
 
     def to_ical(self):
@@ -269,13 +331,15 @@ class vDDDLists:
         return self.dts == other.dts
 
 
-class vCategory:
+class vCategory(ParamsBase):
+
+    __slots__ = ('cats', '_params')
 
     def __init__(self, c_list):
         if not hasattr(c_list, '__iter__') or isinstance(c_list, str):
             c_list = [c_list]
         self.cats = [vText(c) for c in c_list]
-        self.params = Parameters()
+        self._params = None
 
     def to_ical(self):
         return b",".join([c.to_ical() for c in self.cats])
@@ -291,9 +355,11 @@ class vCategory:
         return isinstance(other, vCategory) and self.cats == other.cats
 
 
-class TimeBase:
+class TimeBase(ParamsBase):
     """Make classes with a datetime/date comparable."""
 
+    __slots__ = ()
+
     def __eq__(self, other):
         """self == other"""
         if isinstance(other, TimeBase):
@@ -310,18 +376,20 @@ class vDDDTypes(TimeBase):
     So this is practical.
     """
 
+    __slots__ = ('dt', '_params')
+
     def __init__(self, dt):
         if not isinstance(dt, (datetime, date, timedelta, time, tuple)):
             raise ValueError('You must use datetime, date, timedelta, '
                              'time or tuple (for periods)')
         if isinstance(dt, (datetime, timedelta)):
-            self.params = Parameters()
+            self._params = None
         elif isinstance(dt, date):
-            self.params = Parameters({'value': 'DATE'})
+            self._params = Parameters({'value': 'DATE'})
         elif isinstance(dt, time):
-            self.params = Parameters({'value': 'TIME'})
+            self._params = Parameters({'value': 'TIME'})
         elif isinstance(dt, tuple):
-            self.params = Parameters({'value': 'PERIOD'})
+            self._params = Parameters({'value': 'PERIOD'})
 
         tzid = tzid_from_dt(dt) if isinstance(dt, (datetime, time)) else None
         if not tzid is None and tzid != 'UTC':
@@ -348,10 +416,10 @@ class vDDDTypes(TimeBase):
     def from_ical(cls, ical, timezone=None):
         if isinstance(ical, cls):
             return ical.dt
-        u = ical.upper()
-        if u.startswith(('P', '-P', '+P')):
+        prefix = ical[:2].upper()
+        if prefix[:1] == 'P' or prefix in ('-P', '+P'):
             return vDuration.from_ical(ical)
-        if '/' in u:
+        if '/' in ical:
             return vPeriod.from_ical(ical, timezone=timezone)
 
         if len(ical) in (15, 16):
@@ -370,15 +438,38 @@ class vDDDTypes(TimeBase):
         return f"{self.__class__.__name__}({self.dt}, {self.params})"
 
 
+def _parse_date(ical):
+    """Return the date of a string like 20240101."""
+    return date(int(ical[:4]), int(ical[4:6]), int(ical[6:8]))
+
+
+def _parse_datetime(ical):
+    """Return the naive datetime of a string like 20240101T100000."""
+    return datetime(int(ical[:4]), int(ical[4:6]), int(ical[6:8]),
+                    int(ical[9:11]), int(ical[11:13]), int(ical[13:15]))
+
+
+try:
+    # Python 3.11 parses the basic format of ISO 8601 a lot faster
+    if datetime.fromisoformat('20240102T030405') == \
+            datetime(2024, 1, 2, 3, 4, 5):
+        _parse_date = date.fromisoformat
+        _parse_datetime = datetime.fromisoformat
+except ValueError:
+    pass
+
+
 class vDate(TimeBase):
     """Render and generates iCalendar date format.
     """
 
+    __slots__ = ('dt', '_params')
+
     def __init__(self, dt):
         if not isinstance(dt, date):
             raise ValueError('Value MUST be a date instance')
         self.dt = dt
-        self.params = Parameters({'value': 'DATE'})
+        self._params = Parameters({'value': 'DATE'})
 
     def to_ical(self):
         s = f"{self.dt.year:04}{self.dt.month:02}{self.dt.day:02}"
@@ -386,6 +477,12 @@ class vDate(TimeBase):
 
     @staticmethod
     def from_ical(ical):
+        if len(ical) == 8 and ical.isdigit():
+            # fast path for the usual format
+            try:
+                return _parse_date(ical)
+            except ValueError:
+                raise ValueError(f'Wrong date format {ical}')
         try:
             timetuple = (
                 int(ical[:4]),  # year
@@ -409,9 +506,11 @@ class vDatetime(TimeBase):
     DATE-TIME components in the icalendar standard.
     """
 
+    __slots__ = ('dt', '_params')
+
     def __init__(self, dt):
         self.dt = dt
-        self.params = Parameters()
+        self._params = None
 
     def to_ical(self):
         dt = self.dt
@@ -427,15 +526,24 @@ class vDatetime(TimeBase):
     @staticmethod
     def from_ical(ical, timezone=None):
         tzinfo = None
-        if timezone:
+        if isinstance(timezone, str):
+            tzinfo = resolve_tzid(timezone)
+        elif timezone:
+            # a tzinfo that was resolved before
+            tzinfo = timezone
+
+        if ical[8:9] == 'T' and ical[15:] in ('', 'Z') and \
+                ical[:8].isdigit() and ical[9:15].isdigit():
+            # fast path for the usual format
             try:
-                tzinfo = pytz.timezone(timezone.strip('/'))
-            except pytz.UnknownTimeZoneError:
-                if timezone in WINDOWS_TO_OLSON:
-                    tzinfo = pytz.timezone(
-                        WINDOWS_TO_OLSON.get(timezone.strip('/')))
-                else:
-                    tzinfo = _timezone_cache.get(timezone, None)
+                if tzinfo:
+                    return _localize(tzinfo, ical[:15])
+                value = _parse_datetime(ical[:15])
+            except ValueError:
+                raise ValueError(f'Wrong datetime format: {ical}')
+            if ical[15:]:
+                return value.replace(tzinfo=pytz.utc)
+            return value
 
         try:
             timetuple = (
@@ -458,16 +566,31 @@ class vDatetime(TimeBase):
             raise ValueError(f'Wrong datetime format: {ical}')
 
 
+@lru_cache(maxsize=4096)
+def _localize(tzinfo, ical):
+    """Return the datetime of ical in the timezone.
+
+    Localizing is slow with pytz, so the results are remembered for
+    timestamps that repeat, like the ones of recurring events.
+    """
+    value = _parse_datetime(ical)
+    if hasattr(tzinfo, 'localize'):
+        return tzinfo.localize(value)
+    return value.replace(tzinfo=tzinfo)
+
+
 class vDuration(TimeBase):
     """Subclass of timedelta that renders itself in the iCalendar DURATION
     format.
     """
 
+    __slots__ = ('td', '_params')
+
     def __init__(self, td):
         if not isinstance(td, timedelta):
             raise ValueError('Value MUST be a timedelta instance')
         self.td = td
-        self.params = Parameters()
+        self._params = None
 
     def to_ical(self):
         sign = ""
@@ -525,6 +648,8 @@ class vPeriod(TimeBase):
     """A precise period of time.
     """
 
+    __slots__ = ('start', 'end', 'by_duration', 'duration', '_params')
+
     def __init__(self, per):
         start, end_or_duration = per
         if not (isinstance(start, datetime) or isinstance(start, date)):
@@ -545,7 +670,7 @@ class vPeriod(TimeBase):
         if start > end:
             raise ValueError("Start time is greater than end time")
 
-        self.params = Parameters({'value': 'PERIOD'})
+        self._params = Parameters({'value': 'PERIOD'})
         # set the timezone identifier
         # does not support different timezones for start and end
         tzid = tzid_from_dt(start)
@@ -594,9 +719,12 @@ class vPeriod(TimeBase):
         return (self.start, (self.duration if self.by_duration else self.end))
 
 
-class vWeekday(str):
+class vWeekday(ParamsBase, str):
     """This returns an unquoted weekday abbrevation.
     """
+
+    __slots__ = ('relative', '_params')
+
     week_days = CaselessDict({
         "SU": 0, "MO": 1, "TU": 2, "WE": 3, "TH": 4, "FR": 5, "SA": 6,
     })
@@ -614,7 +742,7 @@ class vWeekday(str):
         if weekday not in vWeekday.week_days or sign not in '+-':
             raise ValueError(f'Expected weekday abbrevation, got: {self}')
         self.relative = relative and int(relative) or None
-        self.params = Parameters()
+        self._params = None
         return self
 
     def to_ical(self):
@@ -628,10 +756,12 @@ class vWeekday(str):
             raise ValueError(f'Expected weekday abbrevation, got: {ical}')
 
 
-class vFrequency(str):
+class vFrequency(ParamsBase, str):
     """A simple class that catches illegal values.
     """
 
+    __slots__ = ('_params',)
+
     frequencies = CaselessDict({
         "SECONDLY": "SECONDLY",
         "MINUTELY": "MINUTELY",
@@ -647,7 +777,7 @@ class vFrequency(str):
         self = super().__new__(cls, value)
         if self not in vFrequency.frequencies:
             raise ValueError(f'Expected frequency, got: {self}')
-        self.params = Parameters()
+        self._params = None
         return self
 
     def to_ical(self):
@@ -661,10 +791,12 @@ class vFrequency(str):
             raise ValueError(f'Expected frequency, got: {ical}')
 
 
-class vRecur(CaselessDict):
+class vRecur(ParamsBase, CaselessDict):
     """Recurrence definition.
     """
 
+    __slots__ = ('_params',)
+
     frequencies = ["SECONDLY", "MINUTELY", "HOURLY", "DAILY", "WEEKLY",
                    "MONTHLY", "YEARLY"]
 
@@ -695,7 +827,7 @@ class vRecur(CaselessDict):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.params = Parameters()
+        self._params = None
 
     def to_ical(self):
         result = []
@@ -736,15 +868,17 @@ class vRecur(CaselessDict):
             raise ValueError(f'Error in recurrence rule: {ical}')
 
 
-class vText(str):
+class vText(ParamsBase, str):
     """Simple text.
     """
 
+    __slots__ = ('encoding', '_params')
+
     def __new__(cls, value, encoding=DEFAULT_ENCODING):
         value = to_unicode(value, encoding=encoding)
         self = super().__new__(cls, value)
         self.encoding = encoding
-        self.params = Parameters()
+        self._params = None
         return self
 
     def __repr__(self):
@@ -763,6 +897,8 @@ class vTime(TimeBase):
     """Render and generates iCalendar time format.
     """
 
+    __slots__ = ('dt', '_params')
+
     def __init__(self, *args):
         if len(args) == 1:
             if not isinstance(args[0], (time, datetime)):
@@ -770,7 +906,7 @@ class vTime(TimeBase):
             self.dt = args[0]
         else:
             self.dt = time(*args)
-        self.params = Parameters({'value': 'TIME'})
+        self._params = Parameters({'value': 'TIME'})
 
     def to_ical(self):
         return self.dt.strftime("%H%M%S")
@@ -785,14 +921,16 @@ class vTime(TimeBase):
             raise ValueError(f'Expected time, got: {ical}')
 
 
-class vUri(str):
+class vUri(ParamsBase, str):
     """Uniform resource identifier is basically just an unquoted string.
     """
 
+    __slots__ = ('_params',)
+
     def __new__(cls, value, encoding=DEFAULT_ENCODING):
         value = to_unicode(value, encoding=encoding)
         self = super().__new__(cls, value)
-        self.params = Parameters()
+        self._params = None
         return self
 
     def to_ical(self):
@@ -806,10 +944,12 @@ class vUri(str):
             raise ValueError(f'Expected , got: {ical}')
 
 
-class vGeo:
+class vGeo(ParamsBase):
     """A special type that is only indirectly defined in the rfc.
     """
 
+    __slots__ = ('latitude', 'longitude', '_params')
+
     def __init__(self, geo):
         try:
             latitude, longitude = (geo[0], geo[1])
@@ -820,7 +960,7 @@ class vGeo:
                              'latitude and longitude')
         self.latitude = latitude
         self.longitude = longitude
-        self.params = Parameters()
+        self._params = None
 
     def to_ical(self):
         return f'{self.latitude};{self.longitude}'
@@ -837,10 +977,12 @@ class vGeo:
         return self.to_ical() == other.to_ical()
 
 
-class vUTCOffset:
+class vUTCOffset(ParamsBase):
     """Renders itself as a utc offset.
     """
 
+    __slots__ = ('td', '_params')
+
     ignore_exceptions = False  # if True, and we cannot parse this
 
     # component, we will silently ignore
@@ -851,7 +993,7 @@ class vUTCOffset:
         if not isinstance(td, timedelta):
             raise ValueError('Offset value MUST be a timedelta instance')
         self.td = td
-        self.params = Parameters()
+        self._params = None
 
     def to_ical(self):
 
@@ -899,16 +1041,18 @@ class vUTCOffset:
         return self.td == other.td
 
 
-class vInline(str):
+class vInline(ParamsBase, str):
     """This is an especially dumb class that just holds raw unparsed text and
     has parameters. Conversion of inline values are handled by the Component
     class, so no further processing is needed.
     """
 
+    __slots__ = ('_params',)
+
     def __new__(cls, value, encoding=DEFAULT_ENCODING):
         value = to_unicode(value, encoding=encoding)
         self = super().__new__(cls, value)
-        self.params = Parameters()
+        self._params = None
         return self
 
     def to_ical(self):
@@ -919,6 +1063,43 @@ class vInline(str):
         return cls(ical)
 
 
+class TypesMap(CaselessDict):
+    """The names of the value types of properties and parameters.
+
+    The generation is increased with every change, so that the types of the
+    properties can be looked up in advance.
+    """
+
+    generation = 0
+
+    def _changed(self):
+        self.generation += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def setdefault(self, key, value=None):
+        self._changed()
+        return super().setdefault(key, value)
+
+    def pop(self, key, default=None):
+        self._changed()
+        return super().pop(key, default)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
 class TypesFactory(CaselessDict):
     """All Value types defined in rfc 2445 are registered in this factory
     class.
@@ -929,6 +1110,11 @@ class TypesFactory(CaselessDict):
 
     def __init__(self, *args, **kwargs):
         "Set keys to upper for initial dict"
+        # the type classes of property and parameter names
+        self._property_types = {}
+        self._generation = None
+        # whether instances of a class are encoded already
+        self._encoded_classes = {}
         super().__init__(*args, **kwargs)
         self.all_types = (
             vBinary,
@@ -976,7 +1162,7 @@ class TypesFactory(CaselessDict):
     # Property types
 
     # These are the default types
-    types_map = CaselessDict({
+    types_map = TypesMap({
         ####################################
         # Property value types
         # Calendar Properties
@@ -1059,10 +1245,61 @@ class TypesFactory(CaselessDict):
         'value': 'text',
     })
 
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._generation = None
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._generation = None
+
     def for_property(self, name):
         """Returns a the default type for a property or parameter
         """
-        return self[self.types_map.get(name, 'text')]
+        types_map = self.types_map
+        # a types_map without generation cannot be looked up in advance
+        generation = getattr(types_map, 'generation', None)
+        if generation is None:
+            return self[types_map.get(name, 'text')]
+        if self._generation == generation:
+            try:
+                return self._property_types[name]
+            except KeyError:
+                pass
+        else:
+            self._property_types = {
+                name: self[value_type]
+                for name, value_type in types_map.items()
+            }
+            self._generation = generation
+        type_class = self[types_map.get(name, 'text')]
+        if len(self._property_types) < 4096:
+            # unknown names are remembered, too, but not without limit
+            self._property_types[name] = type_class
+        return type_class
+
+    def register(self, name, value_type):
+        """Register the value type of a property or parameter.
+
+        This is for X- and other properties that are not in rfc 5545,
+        e.g. ``types_factory.register('X-SOMETIME', 'time')``. Properties
+        without a registered type are text.
+
+        :raises ValueError: if there is no such value type
+        """
+        if value_type not in self:
+            raise ValueError(f'Unknown value type {value_type!r}.')
+        self.types_map[name] = value_type
+
+    def is_encoded(self, value):
+        """Whether value is of one of the value types already."""
+        cls = type(value)
+        try:
+            return self._encoded_classes[cls]
+        except KeyError:
+            encoded = self._encoded_classes[cls] = \
+                issubclass(cls, self.all_types)
+            return encoded
 
     def to_ical(self, name, value):
         """Encodes a named value from a primitive python type to an icalendar
@@ -0,0 +1,410 @@
+"""Expansion of recurring components into occurrences.
+
+The occurrences of a component are computed from its DTSTART, RRULE, RDATE
+and EXDATE properties. Components with a RECURRENCE-ID replace single
+occurrences of the component with the same UID.
+
+Occurrences are generated lazily in the order of their start. Rules without
+COUNT start close to the requested time window, so that the cost depends
+on the size of the window and not on the history of the rule.
+
+Naive values (floating times) are compared to timezone-aware values as if
+they were local times in the timezone of the other value. A date is the
+midnight at the start of that day.
+"""
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from heapq import merge
+
+import dateutil.rrule
+
+
+class Occurrence(namedtuple('Occurrence', ('start', 'end', 'component'))):
+    """An occurrence of a component.
+
+    start and end are of the type of the DTSTART of the component: a date,
+    a naive datetime or a datetime in the timezone of DTSTART.
+    component is the component itself or the component that replaces this
+    occurrence with its RECURRENCE-ID.
+    """
+
+    __slots__ = ()
+
+
+def to_datetime(value):
+    """Return a date as datetime at midnight and a datetime unchanged."""
+    if isinstance(value, datetime):
+        return value
+    return datetime(value.year, value.month, value.day)
+
+
+def localize(value, tzinfo):
+    """Attach the timezone to a naive datetime."""
+    if tzinfo is None:
+        return value
+    if hasattr(tzinfo, 'localize'):
+        return tzinfo.localize(value)
+    return value.replace(tzinfo=tzinfo)
+
+
+def normalize(value, tzinfo):
+    """Return a datetime which can be compared to datetimes with tzinfo.
+
+    Naive values are localized to tzinfo. If tzinfo is None, aware values
+    are replaced by their local time.
+    """
+    value = to_datetime(value)
+    if tzinfo is None:
+        return value.replace(tzinfo=None)
+    if value.tzinfo is None:
+        return localize(value, tzinfo)
+    return value
+
+
+def _local_time(value, tzinfo):
+    """Return a naive datetime in the local time of tzinfo."""
+    value = to_datetime(value)
+    if value.tzinfo is not None and tzinfo is not None:
+        value = value.astimezone(tzinfo)
+    return value.replace(tzinfo=None)
+
+
+def _value(component, name):
+    """Return the first value of a date-like property or None."""
+    value = component.get(name)
+    if isinstance(value, list):
+        value = value[0] if value else None
+    return getattr(value, 'dt', value)
+
+
+def _values(component, name):
+    """Return all values of a property with a list of dates like RDATE."""
+    values = component.get(name, [])
+    if not isinstance(values, list):
+        values = [values]
+    for value in values:
+        dts = getattr(value, 'dts', None)
+        if dts is None:
+            yield getattr(value, 'dt', value)
+        else:
+            for dt in dts:
+                yield dt.dt
+
+
+def _duration(component, start):
+    """The duration of the component with the start value."""
+    end = _value(component, 'DTEND')
+    if end is None:
+        end = _value(component, 'DUE')
+    if end is not None:
+        if isinstance(start, datetime) and isinstance(end, datetime) and \
+                end.tzinfo is not None and start.tzinfo is not None:
+            # keep the duration of local time across DST changes
+            end = end.astimezone(start.tzinfo)
+            return end.replace(tzinfo=None) - start.replace(tzinfo=None)
+        return to_datetime(end).replace(tzinfo=None) - \
+            to_datetime(start).replace(tzinfo=None)
+    duration = _value(component, 'DURATION')
+    if duration is not None:
+        return duration
+    if isinstance(start, datetime):
+        return timedelta(0)
+    return timedelta(days=1)
+
+
+_WEEKDAYS = {
+    'MO': dateutil.rrule.MO, 'TU': dateutil.rrule.TU,
+    'WE': dateutil.rrule.WE, 'TH': dateutil.rrule.TH,
+    'FR': dateutil.rrule.FR, 'SA': dateutil.rrule.SA,
+    'SU': dateutil.rrule.SU,
+}
+
+_INTEGER_PARTS = {
+    'BYSETPOS': 'bysetpos', 'BYMONTH': 'bymonth',
+    'BYMONTHDAY': 'bymonthday', 'BYYEARDAY': 'byyearday',
+    'BYWEEKNO': 'byweekno', 'BYHOUR': 'byhour', 'BYMINUTE': 'byminute',
+    'BYSECOND': 'bysecond',
+}
+
+_PERIODS = {
+    dateutil.rrule.DAILY: timedelta(days=1),
+    dateutil.rrule.WEEKLY: timedelta(weeks=1),
+    dateutil.rrule.HOURLY: timedelta(hours=1),
+    dateutil.rrule.MINUTELY: timedelta(minutes=1),
+    dateutil.rrule.SECONDLY: timedelta(seconds=1),
+}
+
+
+def _weekday(value):
+    value = str(value).upper()
+    weekday = _WEEKDAYS[value[-2:]]
+    if len(value) > 2:
+        return weekday(int(value[:-2]))
+    return weekday
+
+
+def _first(values):
+    if isinstance(values, list):
+        return values[0]
+    return values
+
+
+def _as_list(values):
+    if isinstance(values, list):
+        return values
+    return [values]
+
+
+def rrule_arguments(rule, dtstart, tzinfo):
+    """Convert a vRecur to keyword arguments of dateutil.rrule.rrule.
+
+    The rule is computed in naive local time of tzinfo from the naive
+    dtstart. The defaults that dateutil takes from dtstart are set
+    explicitly, so that dtstart can be moved forward by whole periods.
+    """
+    freq = str(_first(rule['FREQ'])).upper()
+    try:
+        kw = {'freq': getattr(dateutil.rrule, freq)}
+    except AttributeError:
+        raise ValueError(f'Unknown frequency in recurrence rule: {freq}')
+    if kw['freq'] not in range(7):
+        raise ValueError(f'Unknown frequency in recurrence rule: {freq}')
+    if 'INTERVAL' in rule:
+        kw['interval'] = int(_first(rule['INTERVAL']))
+    if 'COUNT' in rule:
+        kw['count'] = int(_first(rule['COUNT']))
+    if 'UNTIL' in rule:
+        until = _first(rule['UNTIL'])
+        until = getattr(until, 'dt', until)
+        if not isinstance(until, datetime):
+            # the whole day is included
+            until = datetime.combine(until, time.max)
+        kw['until'] = _local_time(until, tzinfo)
+    for name, argument in _INTEGER_PARTS.items():
+        if name in rule:
+            kw[argument] = [int(value) for value in _as_list(rule[name])]
+    weekdays = rule.get('BYDAY', rule.get('BYWEEKDAY'))
+    if weekdays is not None:
+        kw['byweekday'] = [_weekday(day) for day in _as_list(weekdays)]
+    if 'WKST' in rule:
+        kw['wkst'] = _weekday(_first(rule['WKST']))
+
+    # the defaults of dateutil.rrule.rrule
+    if not ('byweekno' in kw or 'byyearday' in kw or 'bymonthday' in kw
+            or 'byweekday' in kw):
+        if kw['freq'] == dateutil.rrule.YEARLY:
+            kw.setdefault('bymonth', [dtstart.month])
+            kw['bymonthday'] = [dtstart.day]
+        elif kw['freq'] == dateutil.rrule.MONTHLY:
+            kw['bymonthday'] = [dtstart.day]
+        elif kw['freq'] == dateutil.rrule.WEEKLY:
+            kw['byweekday'] = [dtstart.weekday()]
+    return kw
+
+
+def _fast_forward(kw, dtstart, start):
+    """Return a dtstart of the rule close before the naive start.
+
+    The result is aligned to the periods of the rule and at least one
+    period before start. Rules with COUNT are not moved.
+    """
+    if 'count' in kw or start <= dtstart:
+        return dtstart
+    freq = kw['freq']
+    interval = kw.get('interval', 1)
+    if freq in (dateutil.rrule.YEARLY, dateutil.rrule.MONTHLY):
+        months = (start.year - dtstart.year) * 12 + start.month - \
+            dtstart.month
+        if freq == dateutil.rrule.YEARLY:
+            steps = months // 12 // interval - 1
+            if steps <= 0:
+                return dtstart
+            return dtstart.replace(
+                year=dtstart.year + steps * interval, month=1, day=1)
+        steps = months // interval - 1
+        if steps <= 0:
+            return dtstart
+        months = dtstart.month - 1 + steps * interval
+        return dtstart.replace(
+            year=dtstart.year + months // 12, month=months % 12 + 1, day=1)
+    period = _PERIODS[freq] * interval
+    steps = (start - dtstart) // period - 1
+    if steps <= 0:
+        return dtstart
+    return dtstart + steps * period
+
+
+def _date_like(value, template):
+    """Return a naive datetime as value of the type of template."""
+    if isinstance(template, datetime):
+        return localize(value, template.tzinfo)
+    return value.date()
+
+
+class _Exclusions:
+    """The start values that are excluded from the occurrences."""
+
+    def __init__(self, values, tzinfo):
+        self.tzinfo = tzinfo
+        self.dates = set()
+        self.datetimes = set()
+        for value in values:
+            if isinstance(value, datetime):
+                self.datetimes.add(self._key(value))
+            elif isinstance(value, date):
+                self.dates.add(value)
+
+    def _key(self, value):
+        if isinstance(value, datetime):
+            if self.tzinfo is None:
+                return value.replace(tzinfo=None)
+            if value.tzinfo is None:
+                return localize(value, self.tzinfo)
+            return value
+        return value
+
+    def __contains__(self, value):
+        if isinstance(value, datetime):
+            return self._key(value) in self.datetimes or \
+                value.date() in self.dates
+        return value in self.dates
+
+    def __bool__(self):
+        return bool(self.dates or self.datetimes)
+
+
+def _overlaps(start, end, window_start, window_end):
+    """Whether the occurrence [start, end) is in the window.
+
+    Occurrences without duration are in the window if they start in it.
+    """
+    return start < window_end and (end > window_start or
+                                   start == end == window_start)
+
+
+def occurrences(component, start, end, overrides=()):
+    """Generate the occurrences of the component in a time window.
+
+    :param component: a component with a DTSTART, e.g. an Event
+    :param start: the start of the window, a date or datetime
+    :param end: the end of the window, excluded
+    :param overrides: components with the same UID and a RECURRENCE-ID that
+                      replace occurrences of component
+    :returns: a generator of Occurrence sorted by start
+    """
+    dtstart = _value(component, 'DTSTART')
+    if dtstart is None:
+        return iter(())
+    tzinfo = to_datetime(start).tzinfo
+    window_start = normalize(start, tzinfo)
+    window_end = normalize(end, tzinfo)
+    overrides = list(overrides)
+    replaced = _Exclusions(
+        [_value(override, 'RECURRENCE-ID') for override in overrides],
+        getattr(dtstart, 'tzinfo', None))
+    generators = [_expand(component, dtstart, window_start, window_end,
+                          tzinfo, replaced)]
+    for override in overrides:
+        generators.append(_expand_single(override, window_start, window_end,
+                                         tzinfo))
+    if len(generators) == 1:
+        return generators[0]
+    return merge(*generators,
+                 key=lambda occurrence: normalize(occurrence.start, tzinfo))
+
+
+def _expand_single(component, window_start, window_end, tzinfo):
+    """The occurrence of a component without recurrence."""
+    start = _value(component, 'DTSTART')
+    if start is None:
+        return
+    end = _occurrence_end(start, _duration(component, start))
+    if _overlaps(normalize(start, tzinfo), normalize(end, tzinfo),
+                 window_start, window_end):
+        yield Occurrence(start, end, component)
+
+
+def _occurrence_end(start, duration):
+    if isinstance(start, datetime) and start.tzinfo is not None:
+        return localize(start.replace(tzinfo=None) + duration, start.tzinfo)
+    return start + duration
+
+
+def _expand(component, dtstart, window_start, window_end, tzinfo, replaced):
+    """Generate the occurrences of RRULE, RDATE and DTSTART in order."""
+    duration = _duration(component, dtstart)
+    event_tz = getattr(dtstart, 'tzinfo', None)
+    excluded = _Exclusions(_values(component, 'EXDATE'), event_tz)
+    naive_start = to_datetime(dtstart).replace(tzinfo=None)
+    # the first start of an occurrence that can overlap the window
+    local_start = _local_time(window_start, event_tz) - duration - \
+        timedelta(days=1)
+
+    starts = [[(naive_start, duration)]]
+    rules = component.get('RRULE', [])
+    for rule in _as_list(rules):
+        if not rule:
+            continue
+        kw = rrule_arguments(rule, naive_start, event_tz)
+        kw['dtstart'] = _fast_forward(kw, naive_start, local_start)
+        rrule = dateutil.rrule.rrule(cache=False, **kw)
+        starts.append((value, duration) for value in rrule)
+    rdates = []
+    for rdate in _values(component, 'RDATE'):
+        if isinstance(rdate, tuple):
+            rdate, end = rdate
+            if isinstance(end, timedelta):
+                rdate_duration = end
+            else:
+                rdate_duration = _local_time(end, event_tz) - \
+                    _local_time(rdate, event_tz)
+        else:
+            rdate_duration = duration
+        rdates.append((_local_time(rdate, event_tz), rdate_duration))
+    rdates.sort()
+    starts.append(rdates)
+
+    last = None
+    for value, value_duration in merge(*starts, key=lambda item: item[0]):
+        if value == last:
+            continue
+        last = value
+        start = _date_like(value, dtstart)
+        if normalize(start, tzinfo) >= window_end:
+            return
+        if start in excluded or (replaced and start in replaced):
+            continue
+        end = _occurrence_end(start, value_duration)
+        if _overlaps(normalize(start, tzinfo), normalize(end, tzinfo),
+                     window_start, window_end):
+            yield Occurrence(start, end, component)
+
+
+def calendar_occurrences(components, start, end):
+    """Generate the occurrences of all components sorted by their start.
+
+    Components with a RECURRENCE-ID replace occurrences of the component
+    with the same UID and without RECURRENCE-ID.
+    """
+    masters = []
+    overrides = {}
+    for component in components:
+        if 'DTSTART' not in component:
+            continue
+        if 'RECURRENCE-ID' in component:
+            overrides.setdefault(str(component.get('UID')), []).append(
+                component)
+        else:
+            masters.append(component)
+    generators = []
+    for master in masters:
+        uid = str(master.get('UID'))
+        generators.append(
+            occurrences(master, start, end, overrides.pop(uid, ())))
+    # replacements of occurrences of unknown components
+    for components in overrides.values():
+        for component in components:
+            generators.append(occurrences(component, start, end))
+    tzinfo = to_datetime(start).tzinfo
+    return merge(*generators,
+                 key=lambda occurrence: normalize(occurrence.start, tzinfo))
@@ -44,6 +44,28 @@ class DataSource:
         """Return a list of all components parsed."""
         return self.__class__(self._data_source_folder, lambda data: self._parser(data, multiple=True))
 
+def new_event(**properties):
+    """Return an Event with the properties, e.g. dtstart=datetime(...).
+
+    Underscores in the names are hyphens, e.g. recurrence_id. Properties
+    that are None are left out.
+    """
+    event = icalendar.Event()
+    for name, value in properties.items():
+        if value is not None:
+            event.add(name.replace('_', '-'), value)
+    return event
+
+def calendar_of(*components, **properties):
+    """Return a Calendar with the components and properties, see new_event().
+    """
+    calendar = icalendar.Calendar()
+    for name, value in properties.items():
+        calendar.add(name.replace('_', '-'), value)
+    for component in components:
+        calendar.add_component(component)
+    return calendar
+
 HERE = os.path.dirname(__file__)
 CALENDARS_FOLDER = os.path.join(HERE, 'calendars')
 CALENDARS = DataSource(CALENDARS_FOLDER, icalendar.Calendar.from_ical)
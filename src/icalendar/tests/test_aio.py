@@ -0,0 +1,113 @@
+"""Test parsing calendars from asyncio streams with aiter_components."""
+import asyncio
+import os
+import random
+
+import pytest
+
+from icalendar import Calendar, aiter_components
+from icalendar.tests.conftest import CALENDARS_FOLDER
+
+
+async def chunks_of(data, sizes):
+    """An asynchronous iterator of the data in chunks of random sizes."""
+    position = 0
+    while position < len(data):
+        size = next(sizes)
+        yield data[position:position + size]
+        position += size
+        await asyncio.sleep(0)
+
+
+async def stream_of(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+async def components_of(reader, **kwargs):
+    return [component async for component in aiter_components(reader,
+                                                              **kwargs)]
+
+
+def read_calendar(name):
+    with open(os.path.join(CALENDARS_FOLDER, name + ".ics"), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("calendar_name", [
+    "example",
+    "timezoned",
+    "calendar_with_unicode",
+    "issue_526_calendar_with_events",
+    "multiple_calendar_components",
+])
+def test_stream_reader(calendar_name):
+    data = read_calendar(calendar_name)
+    expected = list(Calendar.iter_components(data.splitlines()))
+
+    async def parse():
+        return await components_of(await stream_of(data))
+
+    assert asyncio.run(parse()) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("as_text", [False, True])
+def test_chunks_end_anywhere(seed, as_text):
+    """Folded lines and multi-byte characters can be split by chunks."""
+    data = read_calendar("calendar_with_unicode") + read_calendar("timezoned")
+    if as_text:
+        data = data.decode("utf-8")
+    rng = random.Random(seed)
+    sizes = iter(lambda: rng.randrange(1, 80), None)
+    expected = list(Calendar.iter_components(data.splitlines()))
+    components = asyncio.run(components_of(chunks_of(data, sizes)))
+    assert components == expected
+
+
+def test_folded_line_at_the_end_of_a_chunk():
+    chunks = [b"BEGIN:VEVENT\r\nSUMMARY:a", b"b\r\n", b" c\r\n",
+              b"\r\n", b" d", b"\r\nEND:VEVENT"]
+
+    async def reader():
+        for chunk in chunks:
+            yield chunk
+
+    components = asyncio.run(components_of(reader(), lazy=True))
+    assert [component["SUMMARY"] for component in components] == ["abcd"]
+
+
+def test_the_event_loop_is_not_blocked():
+    """Other tasks run while a large stream is parsed."""
+    data = b"BEGIN:VCALENDAR\r\n" + b"".join(
+        b"BEGIN:VEVENT\r\nUID:%d\r\nSUMMARY:event\r\nEND:VEVENT\r\n" % i
+        for i in range(1000)) + b"END:VCALENDAR\r\n"
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def parse():
+        task = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        ticks.clear()
+        components = await components_of(await stream_of(data),
+                                         yield_every=100)
+        task.cancel()
+        return components
+
+    assert len(asyncio.run(parse())) == 1000
+    # the stream is read at once, 4000 lines are parsed in batches of 100
+    assert len(ticks) >= 40
+
+
+def test_invalid_input():
+    async def parse():
+        return await components_of(await stream_of(b"END:VEVENT\r\n"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(parse())
@@ -0,0 +1,109 @@
+"""Test the free and busy time of many calendars with batch_freebusy()."""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytz
+
+from icalendar import Calendar, batch_freebusy
+from icalendar.tests import conftest
+from icalendar.tests.conftest import new_event
+
+UTC = pytz.utc
+DAY = datetime(2024, 1, 2, tzinfo=UTC)
+
+
+def at(hour, minute=0):
+    return DAY + timedelta(hours=hour, minutes=minute)
+
+
+def event(start, hours, **properties):
+    return new_event(uid=f"{start.isoformat()}@example.com", dtstart=start,
+                     duration=timedelta(hours=hours), **properties)
+
+
+def calendar_of(*events):
+    return conftest.calendar_of(*events, prodid="-//test//EN", version="2.0")
+
+
+@pytest.fixture
+def calendars():
+    alice = calendar_of(event(at(9), 1), event(at(13), 1, status="TENTATIVE"))
+    bob = calendar_of(
+        event(at(8), 2),
+        event(at(15), 1, transp="TRANSPARENT"),
+        event(at(16), 1, organizer="mailto:carol@example.com",
+              attendee="mailto:bob@example.com"))
+    return {
+        "mailto:alice@example.com": alice,
+        "mailto:bob@example.com": bob.to_ical(),
+    }
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ThreadPoolExecutor(2) as executor:
+        yield executor
+
+
+def test_busy_and_free_time(calendars, executor):
+    availability = batch_freebusy(calendars, at(7), at(18), executor=executor)
+    assert availability.busy == {
+        "mailto:alice@example.com": {
+            "BUSY": [(at(9), at(10))],
+            "BUSY-TENTATIVE": [(at(13), at(14))],
+        },
+        "mailto:bob@example.com": {
+            "BUSY": [(at(8), at(10))],
+            "BUSY-TENTATIVE": [(at(16), at(17))],
+        },
+    }
+    assert availability.free == [
+        (at(7), at(8)), (at(10), at(13)), (at(14), at(16)), (at(17), at(18))]
+
+
+def test_tentative_time_can_be_free(calendars, executor):
+    availability = batch_freebusy(calendars, at(7), at(18), tentative=False,
+                                  executor=executor)
+    assert availability.free == [(at(7), at(8)), (at(10), at(18))]
+
+
+def test_minimal_duration(calendars, executor):
+    availability = batch_freebusy(calendars, at(7), at(18),
+                                  duration=timedelta(hours=2),
+                                  executor=executor)
+    assert availability.free == [(at(10), at(13)), (at(14), at(16))]
+
+
+def test_the_result_of_calendar_freebusy(calendars, executor):
+    availability = batch_freebusy(calendars, date(2024, 1, 2),
+                                  date(2024, 1, 3), executor=executor)
+    for attendee, calendar in calendars.items():
+        if not isinstance(calendar, Calendar):
+            calendar = Calendar.from_ical(calendar)
+        freebusy = calendar.freebusy(date(2024, 1, 2), date(2024, 1, 3),
+                                     attendee)
+        periods = freebusy.get("FREEBUSY", [])
+        expected = {"BUSY": [], "BUSY-TENTATIVE": []}
+        for period in periods:
+            expected[period.params.get("FBTYPE", "BUSY")].append(
+                (period.start, period.end))
+        assert availability.busy[attendee] == expected
+
+
+def test_process_pool(calendars):
+    availability = batch_freebusy(calendars, at(7), at(18), max_workers=2)
+    assert availability.free == [
+        (at(7), at(8)), (at(10), at(13)), (at(14), at(16)), (at(17), at(18))]
+
+
+def test_no_calendars(executor):
+    availability = batch_freebusy({}, at(0), at(24), executor=executor)
+    assert availability.busy == {}
+    assert availability.free == [(at(0), at(24))]
+
+
+def test_invalid_calendars_raise_errors(executor):
+    with pytest.raises(ValueError):
+        batch_freebusy({"mailto:alice@example.com": b"END:VCALENDAR\r\n"},
+                       at(0), at(24), executor=executor)
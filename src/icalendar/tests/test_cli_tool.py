@@ -1,4 +1,8 @@
+import os
+import sys
+import tempfile
 import unittest
+from unittest import mock
 
 from datetime import tzinfo, datetime
 from icalendar import Calendar, cli
@@ -100,6 +104,19 @@ class CLIToolTest(unittest.TestCase):
             output += cli.view(event) + '\n\n'
         self.assertEqual(PROPER_OUTPUT, output)
 
+    def test_main_reads_the_files(self):
+        self.maxDiff = None
+        with tempfile.TemporaryDirectory() as directory:
+            calendar_file = os.path.join(directory, 'calendar.ics')
+            output_file = os.path.join(directory, 'output.txt')
+            with open(calendar_file, 'w') as f:
+                f.write(INPUT)
+            with mock.patch.object(sys, 'argv', [
+                    'icalendar', calendar_file, '-o', output_file]):
+                cli.main()
+            with open(output_file) as f:
+                self.assertEqual(PROPER_OUTPUT, f.read())
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,113 @@
+"""Test the export of properties as columns."""
+from array import array
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytz
+
+from icalendar import Calendar, Event, Todo
+from icalendar.columns import MISSING, to_columns
+
+BERLIN = pytz.timezone("Europe/Berlin")
+
+
+def microseconds(dt):
+    return int(dt.timestamp()) * 1000000
+
+
+@pytest.fixture
+def calendar():
+    calendar = Calendar()
+    first = Event()
+    first.add("uid", "first")
+    first.add("summary", "Meeting")
+    first.add("dtstart", BERLIN.localize(datetime(2024, 1, 2, 10)))
+    first.add("dtend", BERLIN.localize(datetime(2024, 1, 2, 11)))
+    first.add("sequence", 2)
+    first.add("attendee", "mailto:a@example.com")
+    first.add("attendee", "mailto:b@example.com")
+    first.add("categories", ["work", "planning"])
+    calendar.add_component(first)
+    second = Event()
+    second.add("uid", "second")
+    second.add("dtstart", date(2024, 1, 3))
+    second.add("duration", timedelta(days=1))
+    calendar.add_component(second)
+    third = Event()
+    third.add("uid", "third")
+    third.add("dtstart", datetime(2024, 1, 4, 12))
+    third.add("attendee", "mailto:c@example.com")
+    calendar.add_component(third)
+    todo = Todo()
+    todo.add("uid", "todo")
+    calendar.add_component(todo)
+    return calendar
+
+
+def test_columns(calendar):
+    columns = calendar.to_columns(
+        ["uid", "SUMMARY", "DTSTART", "dtend", "duration", "sequence",
+         "ATTENDEE", "CATEGORIES"])
+    assert list(columns) == ["uid", "SUMMARY", "DTSTART", "dtend",
+                             "duration", "sequence", "ATTENDEE", "CATEGORIES"]
+    assert columns["uid"] == ["first", "second", "third"]
+    assert columns["SUMMARY"] == ["Meeting", None, None]
+    assert columns["DTSTART"] == array("q", [
+        microseconds(BERLIN.localize(datetime(2024, 1, 2, 10))),
+        microseconds(datetime(2024, 1, 3, tzinfo=pytz.utc)),
+        microseconds(datetime(2024, 1, 4, 12, tzinfo=pytz.utc)),
+    ])
+    assert columns["dtend"] == array("q", [
+        microseconds(BERLIN.localize(datetime(2024, 1, 2, 11))),
+        MISSING, MISSING])
+    assert columns["duration"] == array("q", [
+        MISSING, 24 * 3600 * 1000000, MISSING])
+    assert columns["sequence"] == [2, None, None]
+    assert columns["ATTENDEE"] == [
+        ["mailto:a@example.com", "mailto:b@example.com"], None,
+        "mailto:c@example.com"]
+    assert columns["CATEGORIES"] == [["work", "planning"], None, None]
+
+
+def test_texts_are_plain_strings(calendar):
+    for text in calendar.to_columns(["UID"])["UID"]:
+        assert type(text) is str
+
+
+def test_floating_times_and_dates_in_a_timezone(calendar):
+    columns = calendar.to_columns(["DTSTART"], tzinfo=BERLIN)
+    assert list(columns["DTSTART"])[1:] == [
+        microseconds(BERLIN.localize(datetime(2024, 1, 3))),
+        microseconds(BERLIN.localize(datetime(2024, 1, 4, 12))),
+    ]
+
+
+def test_other_components(calendar):
+    assert calendar.to_columns(["UID"], name="VTODO") == {"UID": ["todo"]}
+    assert calendar.to_columns(["UID", "DTSTART"], name="VJOURNAL") == {
+        "UID": [], "DTSTART": array("q")}
+
+
+def test_columns_of_test_calendars(ics_file):
+    """The columns contain the decoded values."""
+    if not isinstance(ics_file, Calendar):
+        return
+    events = ics_file.walk("VEVENT")
+    columns = to_columns(events, ["DTSTART", "SUMMARY"])
+    assert len(columns["DTSTART"]) == len(events)
+    for event, start, summary in zip(
+            events, columns["DTSTART"], columns["SUMMARY"]):
+        if "DTSTART" not in event:
+            assert start == MISSING
+            continue
+        dtstart = event.decoded("DTSTART")
+        if isinstance(dtstart, list):
+            dtstart = dtstart[0]
+        if not isinstance(dtstart, datetime):
+            dtstart = datetime(dtstart.year, dtstart.month, dtstart.day)
+        if dtstart.tzinfo is None:
+            dtstart = pytz.utc.localize(dtstart)
+        assert start == (dtstart - datetime(1970, 1, 1, tzinfo=pytz.utc)) \
+            // timedelta(microseconds=1)
+        if "SUMMARY" in event and not isinstance(event["SUMMARY"], list):
+            assert summary == str(event["SUMMARY"])
@@ -0,0 +1,141 @@
+"""Test the content hash of components and the diff of their subcomponents."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from icalendar import Alarm, Event
+from icalendar.cal import Component
+from icalendar.tests.conftest import calendar_of, new_event
+
+
+def event(uid, summary="meeting", **properties):
+    return new_event(uid=uid, summary=summary, **properties)
+
+
+def uids(components):
+    return [str(component["UID"]) for component in components]
+
+
+def test_order_does_not_change_the_hash():
+    first = Event()
+    first.add("summary", "meeting")
+    first.add("location", "room")
+    second = Event()
+    second.add("location", "room")
+    second.add("summary", "meeting")
+    assert first.content_hash() == second.content_hash()
+    assert calendar_of(event("a"), event("b")).content_hash() == \
+        calendar_of(event("b"), event("a")).content_hash()
+    assert calendar_of(event("a"), event("b")).content_hash() != \
+        calendar_of(event("a"), event("c")).content_hash()
+
+
+def test_name_and_values_change_the_hash():
+    assert Event().content_hash() != Alarm().content_hash()
+    assert event("a").content_hash() != event("a", "other").content_hash()
+    assert event("a").content_hash() != event("b").content_hash()
+
+
+@pytest.mark.parametrize("change", [
+    lambda e: e.add("location", "room"),
+    lambda e: e.__setitem__("summary", "changed"),
+    lambda e: e.__delitem__("summary"),
+    lambda e: e.pop("summary"),
+    lambda e: e.popitem(),
+    lambda e: e.clear(),
+    lambda e: e.setdefault("location", "room"),
+    lambda e: e.update({"summary": "changed"}),
+    lambda e: e.add_component(Alarm()),
+])
+def test_changes_update_the_hash(change):
+    component = event("a")
+    content_hash = component.content_hash()
+    change(component)
+    assert component.content_hash() != content_hash
+
+
+def test_the_hash_of_the_properties_is_remembered():
+    component = event("a")
+    component.content_hash()
+    component["SUMMARY"].params["LANGUAGE"] = "en"
+    assert component.content_hash() == event("a").content_hash()
+    component["SUMMARY"] = component["SUMMARY"]
+    assert component.content_hash() != event("a").content_hash()
+
+
+def test_parsed_calendars_have_the_same_hash_if_parsed_again(ics_file):
+    copy_of_calendar = ics_file.__class__.from_ical(ics_file.to_ical())
+    assert copy_of_calendar.content_hash() == ics_file.content_hash()
+    lazy = ics_file.__class__.from_ical(ics_file.raw_ics, lazy=True)
+    assert lazy.content_hash() == ics_file.content_hash()
+
+
+@pytest.mark.parametrize("component", [
+    lambda: event("a", "changed in place"),
+    lambda: Alarm(),
+])
+def test_equal_components_with_different_hashes(component):
+    first = component()
+    first.add("description", "text")
+    second = component()
+    second.add("description", "text")
+    first.content_hash()
+    first["DESCRIPTION"].params["LANGUAGE"] = "en"
+    second["DESCRIPTION"].params["LANGUAGE"] = "en"
+    assert first.content_hash() != second.content_hash()
+    assert calendar_of(first) == calendar_of(second)
+    assert calendar_of(first).diff(calendar_of(second)) == ([], [], [])
+
+
+def test_equality_of_many_subcomponents_takes_linear_time(monkeypatch):
+    """Each subcomponent is only compared to the ones with the same hash."""
+    start = datetime(2024, 1, 1)
+    events = [event(str(i), dtstart=start + timedelta(hours=i))
+              for i in range(300)]
+    calendar = calendar_of(*events)
+    reversed_calendar = calendar_of(*reversed(events))
+    comparisons = []
+
+    def eq(self, other):
+        comparisons.append(self)
+        return Component.__eq__(self, other)
+
+    monkeypatch.setattr(Event, "__eq__", eq)
+    assert calendar == reversed_calendar
+    assert len(comparisons) == len(events)
+    comparisons.clear()
+    assert calendar != calendar_of(*events[:-1], event("other"))
+    # comparing each event with each other one needs about 45000
+    assert len(comparisons) < 3 * len(events)
+
+
+def test_diff():
+    unchanged = event("unchanged")
+    old = calendar_of(unchanged, event("changed"), event("removed"))
+    new = calendar_of(event("added"), event("changed", "new summary"),
+                      unchanged)
+    diff = old.diff(new)
+    assert uids(diff.added) == ["added"]
+    assert uids(diff.removed) == ["removed"]
+    assert [(str(a["SUMMARY"]), str(b["SUMMARY"])) for a, b in diff.changed] \
+        == [("meeting", "new summary")]
+    assert new.diff(new) == ([], [], [])
+
+
+def test_diff_of_recurrences_and_duplicates():
+    recurrence = event("a", recurrence_id=datetime(2024, 1, 1))
+    moved = event("a", "moved", recurrence_id=datetime(2024, 1, 1))
+    old = calendar_of(event("a"), recurrence, Alarm(), Alarm())
+    new = calendar_of(event("a"), moved, Alarm())
+    diff = old.diff(new)
+    assert diff.added == []
+    assert [component.name for component in diff.removed] == ["VALARM"]
+    assert diff.changed == [(recurrence, moved)]
+    # components without UID are never changed
+    old = calendar_of(Alarm())
+    alarm = Alarm()
+    alarm.add("action", "DISPLAY")
+    diff = old.diff(calendar_of(alarm))
+    assert diff.added == [alarm]
+    assert diff.removed == old.subcomponents
+    assert diff.changed == []
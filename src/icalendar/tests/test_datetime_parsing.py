@@ -0,0 +1,65 @@
+"""Test the fast path of parsing dates and datetimes."""
+from datetime import date, datetime
+
+import pytest
+import pytz
+
+from icalendar.prop import vDate, vDatetime, vDDDTypes
+from icalendar.prop import _localize, _parse_date, _parse_datetime
+
+
+@pytest.mark.parametrize("ical,expected", [
+    ("20240102T030405", datetime(2024, 1, 2, 3, 4, 5)),
+    ("20240102T030405Z", datetime(2024, 1, 2, 3, 4, 5, tzinfo=pytz.utc)),
+    ("00010101T000000", datetime(1, 1, 1)),
+    ("99991231T235959Z", datetime(9999, 12, 31, 23, 59, 59, tzinfo=pytz.utc)),
+])
+def test_datetime(ical, expected):
+    value = vDatetime.from_ical(ical)
+    assert value == expected
+    assert value.tzinfo is expected.tzinfo
+
+
+def test_datetime_with_tzid():
+    value = vDatetime.from_ical("20240701T100000", "Europe/Berlin")
+    assert value == pytz.timezone("Europe/Berlin").localize(
+        datetime(2024, 7, 1, 10))
+    assert value.tzinfo.zone == "Europe/Berlin"
+    assert vDatetime.from_ical("20240701T100000", "Europe/Berlin") is value
+
+
+@pytest.mark.parametrize("ical", [
+    "20241301T100000",
+    "20240230T100000Z",
+    "20240101T250000",
+    "2024-01-01T10:00:00",
+    "",
+])
+def test_invalid_datetime(ical):
+    with pytest.raises(ValueError, match="Wrong datetime format"):
+        vDatetime.from_ical(ical)
+    with pytest.raises(ValueError, match="Wrong datetime format"):
+        vDatetime.from_ical(ical, "Europe/Berlin")
+
+
+@pytest.mark.parametrize("ical", ["20241301", "20240230", "2024010X", ""])
+def test_invalid_date(ical):
+    with pytest.raises(ValueError, match="Wrong date format"):
+        vDate.from_ical(ical)
+
+
+def test_date():
+    assert vDate.from_ical("20240229") == date(2024, 2, 29)
+    assert vDDDTypes.from_ical("20240229") == date(2024, 2, 29)
+
+
+@pytest.mark.parametrize("ical", ["P1D", "-P1W", "+PT1H"])
+def test_durations_are_recognized(ical):
+    assert vDDDTypes.from_ical(ical) is not None
+
+
+def test_parse_helpers_agree_with_slicing():
+    assert _parse_date("20240102") == date(2024, 1, 2)
+    assert _parse_datetime("20240102T030405") == datetime(2024, 1, 2, 3, 4, 5)
+    assert _localize(pytz.utc, "20240102T030405") == \
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=pytz.utc)
@@ -0,0 +1,70 @@
+"""Test folding content lines on their UTF-8 bytes and unfolding them."""
+import random
+
+import pytest
+
+from icalendar.parser import Contentline, _fold_characters, fold_bytes
+from icalendar.parser import Contentlines, FOLD, foldline, uFOLD, unfold
+
+ALPHABETS = {
+    "ascii": "abcdefghij ,;:\\",
+    "latin": "aäöüßéèñ ",
+    "cjk": "会議予定회의",
+    "emoji": "📅✅👍🏽",
+    "mixed": "aä会📅 ",
+}
+
+
+@pytest.mark.parametrize("alphabet", ALPHABETS.values(), ids=list(ALPHABETS))
+def test_fold_like_character_by_character(alphabet):
+    rng = random.Random(alphabet)
+    for limit in range(5, 81):
+        for length in (0, 1, limit - 1, limit, rng.randrange(500)):
+            line = "".join(rng.choice(alphabet) for _ in range(length))
+            expected = _fold_characters(line, limit, "\r\n ")
+            assert foldline(line, limit=limit) == expected
+            assert fold_bytes(line.encode(), limit) == expected.encode()
+
+
+def test_folded_lines_are_not_longer_than_the_limit():
+    line = "DESCRIPTION:" + "会📅ä" * 1000
+    for folded in fold_bytes(line.encode()).split(b"\r\n "):
+        assert len(folded) <= 74
+        folded.decode()
+
+
+def test_small_limits_fold_like_before():
+    assert fold_bytes("привет".encode(), limit=4, fold_sep=b"\r\n ") == \
+        _fold_characters("привет", 4, "\r\n ").encode()
+
+
+def test_contentline_to_ical():
+    line = Contentline("DESCRIPTION:" + "Überprüfung 会議 " * 20)
+    assert line.to_ical() == foldline(line).encode()
+
+
+UNFOLD_PIECES = ["a", "ä", "\r\n", "\n", "\r", " ", "\t", "\r\n ", "\r\n\t",
+                 "\r\n\r\n ", "\n\n\t"]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_unfold_like_the_regular_expression(seed):
+    rng = random.Random(seed)
+    pieces = UNFOLD_PIECES if seed % 2 else ["a", "ä", "\r\n", "\r\n "]
+    text = "".join(rng.choice(pieces) for _ in range(rng.randrange(30)))
+    assert unfold(text) == uFOLD.sub("", text)
+    assert unfold(text.encode()) == FOLD.sub(b"", text.encode())
+
+
+def test_content_lines_of_bytes_and_str_are_equal():
+    ical = ("BEGIN:VEVENT\r\nSUMMARY:Besprechung über \r\n den 会"
+            "\r\n 議\r\nDESCRIPTION:line\r\n\tcontinued\r\nEND:VEVENT\r\n")
+    lines = Contentlines.from_ical(ical.encode())
+    assert lines == Contentlines.from_ical(ical)
+    assert lines[1] == "SUMMARY:Besprechung über den 会議"
+    assert lines[2] == "DESCRIPTION:linecontinued"
+
+
+def test_invalid_utf_8_is_replaced_in_its_line():
+    lines = Contentlines.from_ical(b"SUMMARY:\xff\r\nUID:1\r\n")
+    assert lines == ["SUMMARY:�", "UID:1", ""]
@@ -0,0 +1,178 @@
+"""Test the free and busy time of calendars with Calendar.freebusy()."""
+from datetime import date, datetime, timedelta
+import random
+
+import pytest
+import pytz
+
+from icalendar import Calendar, FreeBusy
+from icalendar.freebusy import busy_periods, free_periods, merge_periods
+from icalendar.freebusy import subtract_periods
+from icalendar.prop import vCalAddress
+from icalendar.tests.conftest import calendar_of, new_event
+
+UTC = pytz.utc
+DAY = datetime(2024, 1, 2, tzinfo=UTC)
+
+
+def at(hour, minute=0):
+    return DAY + timedelta(hours=hour, minutes=minute)
+
+
+def event(start, hours=1, **properties):
+    return new_event(dtstart=start, duration=timedelta(hours=hours),
+                     **properties)
+
+
+def periods_of(freebusy):
+    """The (start, end, fbtype) of the FREEBUSY periods."""
+    periods = freebusy.get("FREEBUSY", [])
+    if not isinstance(periods, list):
+        periods = [periods]
+    return [(period.start, period.end, period.params.get("FBTYPE", "BUSY"))
+            for period in periods]
+
+
+def test_overlapping_events_are_merged():
+    calendar = calendar_of(event(at(9), 2), event(at(10)), event(at(11)),
+                           event(at(14)), event(at(12, 30), 0.5))
+    freebusy = calendar.freebusy(at(0), at(24))
+    assert isinstance(freebusy, FreeBusy)
+    assert periods_of(freebusy) == [
+        (at(9), at(12), "BUSY"),
+        (at(12, 30), at(13), "BUSY"),
+        (at(14), at(15), "BUSY"),
+    ]
+
+
+def test_the_component_can_be_serialized():
+    calendar = calendar_of(event(at(9)), event(at(10), status="TENTATIVE"))
+    freebusy = calendar.freebusy(at(0), at(24), "mailto:Me@example.com")
+    assert freebusy.is_broken is False
+    ical = freebusy.to_ical()
+    assert b"FREEBUSY:20240102T090000Z/20240102T100000Z\r\n" in ical
+    assert b"FREEBUSY;FBTYPE=BUSY-TENTATIVE:20240102T100000Z/" in ical
+    parsed = FreeBusy.from_ical(ical)
+    assert parsed["DTSTART"].dt == at(0)
+    assert parsed["DTEND"].dt == at(24)
+    assert parsed["ATTENDEE"] == "mailto:Me@example.com"
+    assert "UID" in parsed and "DTSTAMP" in parsed
+
+
+def test_transparent_and_cancelled_events_are_free():
+    calendar = calendar_of(event(at(9), transp="TRANSPARENT"),
+                           event(at(10), status="CANCELLED"),
+                           event(at(11), transp="OPAQUE", status="CONFIRMED"))
+    assert periods_of(calendar.freebusy(at(0), at(24))) == [
+        (at(11), at(12), "BUSY")]
+
+
+def test_tentative_time_is_not_busy_time():
+    calendar = calendar_of(event(at(9), 3, status="TENTATIVE"),
+                           event(at(10)),
+                           event(at(15), status="TENTATIVE"))
+    assert periods_of(calendar.freebusy(at(0), at(24))) == [
+        (at(9), at(10), "BUSY-TENTATIVE"),
+        (at(10), at(11), "BUSY"),
+        (at(11), at(12), "BUSY-TENTATIVE"),
+        (at(15), at(16), "BUSY-TENTATIVE"),
+    ]
+
+
+def test_recurrences_are_expanded():
+    daily = event(datetime(2023, 12, 1, 10, tzinfo=UTC),
+                   rrule={"freq": "daily", "count": 40},
+                   uid="daily@example.com")
+    moved = event(at(16), uid="daily@example.com",
+                  **{"recurrence-id": datetime(2024, 1, 3, 10, tzinfo=UTC)})
+    cancelled = event(datetime(2024, 1, 4, 10, tzinfo=UTC),
+                      uid="daily@example.com", status="CANCELLED",
+                      **{"recurrence-id": datetime(2024, 1, 4, 10,
+                                                   tzinfo=UTC)})
+    calendar = calendar_of(daily, moved, cancelled)
+    freebusy = calendar.freebusy(DAY, DAY + timedelta(days=4))
+    assert [start for start, end, fbtype in periods_of(freebusy)] == [
+        at(10), at(16), datetime(2024, 1, 5, 10, tzinfo=UTC)]
+
+
+def test_periods_are_clipped_to_the_window():
+    calendar = calendar_of(event(at(-1), 3), event(at(23), 2))
+    assert periods_of(calendar.freebusy(at(0), at(24))) == [
+        (at(0), at(2), "BUSY"), (at(23), at(24), "BUSY")]
+
+
+def test_periods_are_in_utc():
+    berlin = pytz.timezone("Europe/Berlin")
+    calendar = calendar_of(event(berlin.localize(datetime(2024, 1, 2, 10))),
+                           event(datetime(2024, 1, 2, 12)))
+    freebusy = calendar.freebusy(date(2024, 1, 2), date(2024, 1, 3),
+                                 tzinfo=berlin)
+    assert freebusy["DTSTART"].dt == datetime(2024, 1, 1, 23, tzinfo=UTC)
+    assert periods_of(freebusy) == [(at(9), at(10), "BUSY"),
+                                    (at(11), at(12), "BUSY")]
+
+
+def test_an_empty_calendar_is_free():
+    freebusy = Calendar().freebusy(at(0), at(24))
+    assert "FREEBUSY" not in freebusy
+    assert "ATTENDEE" not in freebusy
+
+
+@pytest.mark.parametrize("partstat,expected", [
+    ("ACCEPTED", "BUSY"),
+    ("TENTATIVE", "BUSY-TENTATIVE"),
+    ("NEEDS-ACTION", "BUSY-TENTATIVE"),
+    ("DECLINED", None),
+    ("DELEGATED", None),
+])
+def test_attendee(partstat, expected):
+    invitation = event(at(9))
+    invitation.add("organizer", "mailto:boss@example.com")
+    invitation.add("attendee", vCalAddress("MAILTO:me@example.com"),
+                   parameters={"PARTSTAT": partstat})
+    invitation.add("attendee", "mailto:you@example.com")
+    other = event(at(11), attendee="mailto:you@example.com")
+    calendar = calendar_of(invitation, other)
+    freebusy = calendar.freebusy(at(0), at(24), "me@example.com")
+    expected = [(at(9), at(10), expected)] if expected else []
+    assert periods_of(freebusy) == expected
+    organizer = calendar.freebusy(at(0), at(24), "mailto:boss@example.com")
+    assert periods_of(organizer) == [(at(9), at(10), "BUSY")]
+
+
+def test_merge_periods():
+    assert merge_periods([]) == []
+    assert merge_periods([(5, 6), (1, 3), (2, 4), (4, 5), (8, 9)]) == [
+        (1, 6), (8, 9)]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_merge_and_subtract_periods_like_sets(seed):
+    rng = random.Random(seed)
+
+    def random_periods():
+        periods = []
+        for _ in range(rng.randrange(20)):
+            start = rng.randrange(100)
+            periods.append((start, start + rng.randrange(1, 10)))
+        return periods
+
+    def points(periods):
+        return {point for start, end in periods for point in range(start, end)}
+
+    periods, other = random_periods(), random_periods()
+    merged = merge_periods(periods)
+    assert points(merged) == points(periods)
+    assert all(end < start for (_, end), (start, _) in zip(merged,
+                                                            merged[1:]))
+    difference = subtract_periods(merged, merge_periods(other))
+    assert points(difference) == points(periods) - points(other)
+    free = free_periods(merged, 0, 100)
+    assert points(free) == set(range(100)) - points(periods)
+
+
+def test_busy_periods():
+    periods = busy_periods([event(at(9)), event(at(8), status="TENTATIVE")],
+                           at(0), at(24))
+    assert periods == {"BUSY": [(at(9), at(10))],
+                       "BUSY-TENTATIVE": [(at(8), at(9))]}
@@ -0,0 +1,66 @@
+"""Test parsing calendars from files with Calendar.from_file()."""
+import os
+import tracemalloc
+
+import pytest
+
+from icalendar import Calendar, Event
+from icalendar.tests.conftest import CALENDARS_FOLDER
+
+
+@pytest.fixture(params=[True, False], ids=["mmap", "file"])
+def mmap(request):
+    return request.param
+
+
+@pytest.mark.parametrize("calendar_name", [
+    "example",
+    "timezoned",
+    "calendar_with_unicode",
+    "issue_526_calendar_with_events",
+])
+def test_from_file_equals_from_ical(calendar_name, mmap):
+    path = os.path.join(CALENDARS_FOLDER, calendar_name + ".ics")
+    with open(path, "rb") as f:
+        expected = Calendar.from_ical(f.read())
+    calendar = Calendar.from_file(path, mmap=mmap)
+    assert calendar == expected
+    assert calendar.to_ical() == expected.to_ical()
+    lazy = Calendar.from_file(path, mmap=mmap, lazy=True)
+    assert lazy == expected
+
+
+def test_multiple(mmap):
+    path = os.path.join(CALENDARS_FOLDER, "multiple_calendar_components.ics")
+    calendars = Calendar.from_file(path, mmap=mmap, multiple=True)
+    assert len(calendars) == 2
+    with pytest.raises(ValueError, match="multiple components"):
+        Calendar.from_file(path, mmap=mmap)
+
+
+def test_empty_file(tmp_path, mmap):
+    path = tmp_path / "empty.ics"
+    path.write_bytes(b"")
+    assert Calendar.from_file(path, mmap=mmap, multiple=True) == []
+    with pytest.raises(ValueError, match="Found no components"):
+        Calendar.from_file(path, mmap=mmap)
+
+
+def test_the_file_is_not_copied(tmp_path, mmap):
+    """Only the components need memory, not the content of the file."""
+    calendar = Calendar()
+    for number in range(300):
+        event = Event()
+        event.add("uid", str(number))
+        event.add("description", "a long description " * 40)
+        calendar.add_component(event)
+    path = tmp_path / "large.ics"
+    path.write_bytes(calendar.to_ical())
+    tracemalloc.start()
+    try:
+        parsed = Calendar.from_file(path, mmap=mmap, lazy=True)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(parsed.subcomponents) == 300
+    assert peak - current < os.path.getsize(path) / 10
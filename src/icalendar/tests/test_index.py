@@ -0,0 +1,136 @@
+"""Test time-range queries with the CalendarIndex."""
+from datetime import date, datetime, timedelta
+import random
+
+import pytest
+import pytz
+
+from icalendar import Calendar, CalendarIndex
+from icalendar.tests.conftest import calendar_of, new_event
+
+
+def event(start, end=None, **properties):
+    return new_event(dtstart=start, dtend=end, **properties)
+
+
+def summaries(occurrences):
+    return [str(occurrence.component["SUMMARY"]) for occurrence in occurrences]
+
+
+@pytest.fixture
+def index():
+    return CalendarIndex(calendar_of(
+        event(datetime(2024, 1, 2, 8), datetime(2024, 1, 2, 10),
+              summary="early"),
+        event(datetime(2024, 1, 2, 9, 30), datetime(2024, 1, 2, 9, 45),
+              summary="short"),
+        event(datetime(2024, 1, 2, 16), datetime(2024, 1, 2, 18),
+              summary="late"),
+        event(datetime(2024, 1, 2, 12), summary="instant"),
+        event(date(2024, 1, 2), summary="all day"),
+        event(date(2023, 12, 1), date(2024, 2, 1), summary="long"),
+    ))
+
+
+def test_overlapping(index):
+    assert summaries(index.overlapping(datetime(2024, 1, 2, 9),
+                                       datetime(2024, 1, 2, 17))) == [
+        "long", "all day", "early", "short", "instant", "late"]
+    assert summaries(index.overlapping(datetime(2024, 1, 2, 10),
+                                       datetime(2024, 1, 2, 12))) == [
+        "long", "all day"]
+    assert summaries(index.overlapping(datetime(2024, 1, 3),
+                                       datetime(2024, 1, 4))) == ["long"]
+
+
+def test_within(index):
+    assert summaries(index.within(datetime(2024, 1, 2, 9),
+                                  datetime(2024, 1, 2, 17))) == [
+        "short", "instant"]
+    assert summaries(index.within(date(2024, 1, 2), date(2024, 1, 3))) == [
+        "all day", "early", "short", "instant", "late"]
+
+
+def test_queries_with_timezones(index):
+    """Floating times are in the timezone of the index."""
+    berlin = pytz.timezone("Europe/Berlin")
+    start = berlin.localize(datetime(2024, 1, 2, 10, 30))
+    assert summaries(index.overlapping(start, start + timedelta(hours=1))) \
+        == ["long", "all day", "early", "short"]
+    index = CalendarIndex(calendar_of(
+        event(datetime(2024, 1, 2, 10), datetime(2024, 1, 2, 11),
+              summary="local")), tzinfo=berlin)
+    assert summaries(index.overlapping(
+        datetime(2024, 1, 2, 9, tzinfo=pytz.utc),
+        datetime(2024, 1, 2, 9, 30, tzinfo=pytz.utc))) == ["local"]
+
+
+def test_add_and_remove(index):
+    added = event(datetime(2024, 1, 2, 11), datetime(2024, 1, 2, 13),
+                  summary="added")
+    index.add(added)
+    assert summaries(index.overlapping(datetime(2024, 1, 2, 10),
+                                       datetime(2024, 1, 2, 12))) == [
+        "long", "all day", "added"]
+    index.remove(added)
+    assert "added" not in summaries(index.overlapping(
+        datetime(2024, 1, 2, 10), datetime(2024, 1, 2, 12)))
+    with pytest.raises(ValueError):
+        index.remove(added)
+
+
+def test_recurring_events_are_expanded():
+    weekly = event(datetime(2024, 1, 1, 10), datetime(2024, 1, 1, 11),
+                   summary="weekly", uid="weekly",
+                   rrule={"freq": "weekly"})
+    moved = event(datetime(2024, 1, 9, 10), datetime(2024, 1, 9, 11),
+                  summary="moved", uid="weekly")
+    moved.add("recurrence-id", datetime(2024, 1, 8, 10))
+    index = CalendarIndex(calendar_of(weekly, moved))
+    assert len(index) == 2
+    occurrences = index.overlapping(date(2024, 1, 1), date(2024, 1, 16))
+    assert [o.start.day for o in occurrences] == [1, 9, 15]
+    assert summaries(occurrences) == ["weekly", "moved", "weekly"]
+    index.remove(moved)
+    assert [o.start.day for o in index.within(
+        date(2024, 1, 1), date(2024, 1, 16))] == [1, 8, 15]
+
+
+def test_index_of_test_calendars(ics_file):
+    """The index finds the same occurrences as Calendar.occurrences()."""
+    if not isinstance(ics_file, Calendar):
+        return
+    index = CalendarIndex(ics_file)
+    start = datetime(2000, 1, 1, tzinfo=pytz.utc)
+    end = datetime(2030, 1, 1, tzinfo=pytz.utc)
+    events = calendar_of(*ics_file.walk("VEVENT"))
+    found = [id(o.component) for o in index.overlapping(start, end)
+             if o.component.name == "VEVENT"]
+    expected = [id(o.component) for o in events.occurrences(start, end)]
+    assert sorted(found) == sorted(expected)
+
+
+def test_random_queries():
+    rng = random.Random(42)
+    components = []
+    for i in range(300):
+        start = datetime(2024, 1, 1, tzinfo=pytz.utc) + \
+            timedelta(minutes=rng.randrange(60 * 24 * 30))
+        duration = timedelta(minutes=rng.choice([0, 15, 90, 60 * 24 * 5]))
+        components.append(event(start, start + duration, summary=str(i)))
+    index = CalendarIndex()
+    for component in components:
+        index.add(component)
+    for _ in range(200):
+        start = datetime(2024, 1, 1, tzinfo=pytz.utc) + \
+            timedelta(minutes=rng.randrange(60 * 24 * 31))
+        end = start + timedelta(minutes=rng.choice([0, 30, 60 * 24]))
+        expected = [
+            component for component in components
+            if component.decoded("DTSTART") < end and (
+                component.decoded("DTEND") > start or
+                component.decoded("DTSTART") == component.decoded("DTEND")
+                == start)
+        ]
+        found = [o.component for o in index.overlapping(start, end)]
+        assert sorted(map(id, found)) == sorted(map(id, expected))
@@ -0,0 +1,69 @@
+"""Test parsing calendars from a stream with Calendar.iter_components."""
+import io
+import os
+
+import pytest
+
+from icalendar import Calendar, Event
+from icalendar.parser import unfold_lines
+from icalendar.tests.conftest import CALENDARS_FOLDER
+
+
+@pytest.mark.parametrize("calendar_name", [
+    "example",
+    "timezoned",
+    "calendar_with_unicode",
+    "issue_526_calendar_with_events",
+    "multiple_calendar_components",
+])
+@pytest.mark.parametrize("mode", ["rb", "r"])
+def test_iter_components_yields_the_subcomponents(calendar_name, mode):
+    """The stream yields the same components as parsing the whole file."""
+    path = os.path.join(CALENDARS_FOLDER, calendar_name + ".ics")
+    with open(path, "rb") as f:
+        calendars = Calendar.from_ical(f.read(), multiple=True)
+    expected = [
+        component for calendar in calendars
+        for component in calendar.subcomponents
+    ]
+    with open(path, mode, encoding=None if "b" in mode else "utf-8") as f:
+        components = list(Calendar.iter_components(f))
+    assert components == expected
+
+
+def test_iter_components_is_lazy():
+    """A component is yielded before the rest of the stream is read."""
+    lines = iter([
+        b"BEGIN:VCALENDAR\r\n",
+        b"BEGIN:VEVENT\r\n",
+        b"UID:1\r\n",
+        b"END:VEVENT\r\n",
+    ])
+    components = Calendar.iter_components(lines)
+    event = next(components)
+    assert isinstance(event, Event)
+    assert event["UID"] == "1"
+    with pytest.raises(StopIteration):
+        next(lines)
+
+
+def test_iter_components_yields_top_level_components():
+    """Components outside of a VCALENDAR are yielded as a whole."""
+    stream = io.BytesIO(
+        b"BEGIN:VEVENT\r\nUID:1\r\nBEGIN:VALARM\r\nACTION:DISPLAY\r\n"
+        b"END:VALARM\r\nEND:VEVENT\r\n")
+    events = list(Calendar.iter_components(stream))
+    assert len(events) == 1
+    assert events[0]["UID"] == "1"
+    assert [alarm.name for alarm in events[0].subcomponents] == ["VALARM"]
+
+
+@pytest.mark.parametrize("lines,expected", [
+    (["A:1\r\n", "B:2\r\n"], ["A:1", "B:2"]),
+    (["A:1\r\n", " 23\r\n", "\t4\r\n", "B:2"], ["A:1234", "B:2"]),
+    ([b"A:1\n", b" 2\n", b"\n", b" 3\n"], ["A:123"]),
+    # a multi-byte character is folded in the middle
+    ([b"A:\xc3\r\n", b" \xbc\r\n"], ["A:\u00fc"]),
+])
+def test_unfold_lines(lines, expected):
+    assert list(unfold_lines(lines)) == expected
@@ -0,0 +1,150 @@
+"""Test parsing with from_ical(lazy=True)."""
+from datetime import date
+
+import pytest
+
+from icalendar import Calendar, Event, vText
+from icalendar.cal import _LazyValue
+from icalendar.parser import Contentlines
+
+
+def test_lazy_parsing_gives_equal_components(ics_file):
+    lazy = ics_file.__class__.from_ical(ics_file.raw_ics, lazy=True)
+    assert lazy == ics_file
+    assert lazy.to_ical() == ics_file.to_ical()
+
+
+def test_values_are_decoded_on_first_access(calendars):
+    calendar = Calendar.from_ical(calendars.example.raw_ics, lazy=True)
+    event = calendar.walk("VEVENT")[0]
+    assert isinstance(dict.__getitem__(event, "SUMMARY"), _LazyValue)
+    assert event["SUMMARY"] == vText("New Year's Day")
+    assert isinstance(dict.__getitem__(event, "SUMMARY"), vText)
+    assert isinstance(dict.__getitem__(event, "DTSTART"), _LazyValue)
+    assert event.decoded("DTSTART") == date(2022, 1, 1)
+    assert event.get("UID") == "636a0cc1dbd5a1667894465@icalendar"
+
+
+@pytest.mark.parametrize("copy", [
+    dict,
+    lambda event: {**event},
+    lambda event: dict(event.items()),
+    lambda event: dict(zip(event, event.values())),
+])
+def test_copies_of_the_properties_are_decoded(calendars, copy):
+    calendar = Calendar.from_ical(calendars.example.raw_ics, lazy=True)
+    event = calendar.walk("VEVENT")[0]
+    properties = copy(event)
+    assert properties["SUMMARY"] == vText("New Year's Day")
+    assert not any(isinstance(value, _LazyValue)
+                   for value in properties.values())
+
+
+def test_update_of_a_dict_decodes_the_values():
+    event = Event.from_ical(
+        "BEGIN:VEVENT\r\nSUMMARY:Meeting\r\nEND:VEVENT\r\n", lazy=True)
+    properties = {}
+    dict.update(properties, event)
+    assert properties == {"SUMMARY": vText("Meeting")}
+    assert isinstance(properties["SUMMARY"], vText)
+
+
+def test_untouched_values_are_written_as_read():
+    ics = (
+        b"BEGIN:VEVENT\r\n"
+        b"dtstart;value=date-time;tzid=Europe/Berlin:20240101T100000\r\n"
+        b"SUMMARY:Meeting\\, planning\r\n"
+        b"END:VEVENT\r\n")
+    event = Event.from_ical(ics, lazy=True)
+    assert event.to_ical(sorted=False) == ics
+    event["SUMMARY"]  # accessing a value decodes it
+    assert event.to_ical(sorted=False) == (
+        b"BEGIN:VEVENT\r\n"
+        b"dtstart;value=date-time;tzid=Europe/Berlin:20240101T100000\r\n"
+        b"SUMMARY:Meeting\\, planning\r\n"
+        b"END:VEVENT\r\n")
+    event["DTSTART"]
+    assert b"DTSTART;TZID=Europe/Berlin;VALUE=date-time:20240101T100000" \
+        in event.to_ical()
+
+
+def test_multiple_values_are_decoded_together():
+    event = Event.from_ical(
+        "BEGIN:VEVENT\r\nATTENDEE:mailto:a@example.com\r\n"
+        "ATTENDEE:mailto:b@example.com\r\nEND:VEVENT\r\n", lazy=True)
+    assert event["ATTENDEE"] == ["mailto:a@example.com", "mailto:b@example.com"]
+
+
+def test_errors_are_raised_on_access():
+    calendar = Calendar.from_ical(
+        "BEGIN:VCALENDAR\r\nDTSTAMP:not a date\r\nEND:VCALENDAR\r\n", lazy=True)
+    assert "DTSTAMP" in calendar
+    with pytest.raises(ValueError):
+        calendar["DTSTAMP"]
+
+
+def test_errors_are_recorded_for_components_that_ignore_them():
+    event = Event.from_ical(
+        "BEGIN:VEVENT\r\nDTSTART:not a date\r\nUID:1\r\nEND:VEVENT\r\n",
+        lazy=True)
+    assert not event.is_broken
+    with pytest.raises(KeyError):
+        event["DTSTART"]
+    assert event.get("DTSTART") is None
+    assert "DTSTART" not in event
+    assert event.errors == [
+        ("DTSTART", "Expected datetime, date, or time, got: 'not a date'")]
+
+
+def test_iter_components_lazy(calendars):
+    lines = Contentlines.from_ical(calendars.timezoned.raw_ics)
+    components = list(Calendar.iter_components(lines, lazy=True))
+    assert components == calendars.timezoned.subcomponents
+
+
+def test_invalid_parameters_are_found_on_access():
+    event = Event.from_ical(
+        "BEGIN:VEVENT\r\nDTSTART;;VALUE=DATE-TIME:20140409T093000\r\n"
+        "UID:1\r\nEND:VEVENT\r\n", lazy=True)
+    assert "DTSTART" in event
+    assert event.get("DTSTART") is None
+    assert [name for name, error in event.errors] == ["DTSTART"]
+
+
+def calendar_in(tzid, offset):
+    return (
+        "BEGIN:VCALENDAR\r\n"
+        "BEGIN:VTIMEZONE\r\n"
+        f"TZID:{tzid}\r\n"
+        "BEGIN:STANDARD\r\n"
+        "DTSTART:19700101T000000\r\n"
+        f"TZOFFSETFROM:{offset}\r\n"
+        f"TZOFFSETTO:{offset}\r\n"
+        "END:STANDARD\r\n"
+        "END:VTIMEZONE\r\n"
+        "BEGIN:VEVENT\r\n"
+        f"DTSTART;TZID={tzid}:20240101T100000\r\n"
+        "END:VEVENT\r\n"
+        "END:VCALENDAR\r\n"
+    )
+
+
+def test_the_timezone_is_bound_when_parsing():
+    """A later calendar that defines the TZID differently does not change
+    the values that are not decoded yet."""
+    tzid = "test_lazy_parsing/Bound"
+    lazy = Calendar.from_ical(calendar_in(tzid, "+0300"), lazy=True)
+    Calendar.from_ical(calendar_in(tzid, "+0400"))
+    event = lazy.walk("VEVENT")[0]
+    assert isinstance(dict.__getitem__(event, "DTSTART"), _LazyValue)
+    assert event.decoded("DTSTART").utcoffset().total_seconds() == 3 * 3600
+
+
+def test_unknown_timezones_are_decoded_when_parsing():
+    tzid = "test_lazy_parsing/Unknown"
+    event = Event.from_ical(
+        "BEGIN:VEVENT\r\n"
+        f"DTSTART;TZID={tzid}:20240101T100000\r\n"
+        "END:VEVENT\r\n", lazy=True)
+    Calendar.from_ical(calendar_in(tzid, "+0400"))
+    assert event.decoded("DTSTART").tzinfo is None
@@ -0,0 +1,104 @@
+"""Test the memory that parsed calendars use.
+
+The memory is compared to the one of plain dictionaries of the content
+lines, as the sizes of objects differ between Python versions. A parsed
+event uses about 1.2 times as much on CPython 3.11. Before values had
+__slots__ and empty Parameters were created for every value, it used more
+than twice as much as now.
+"""
+import gc
+import platform
+import tracemalloc
+
+import pytest
+
+from icalendar import Calendar
+
+EVENTS = 1000
+
+
+def calendar_ics(events=EVENTS):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//test//memory//EN"]
+    for i in range(events):
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{i:08}@example.com",
+            "DTSTAMP:20240101T120000Z",
+            f"DTSTART;TZID=Europe/Berlin:202402{i % 28 + 1:02}T100000",
+            f"DTEND;TZID=Europe/Berlin:202402{i % 28 + 1:02}T110000",
+            f"SUMMARY:Meeting {i}",
+            "LOCATION:Room 1",
+            "ORGANIZER;CN=Organizer:mailto:organizer@example.com",
+            "ATTENDEE;PARTSTAT=ACCEPTED;ROLE=REQ-PARTICIPANT:"
+            f"mailto:a{i}@example.com",
+            "ATTENDEE;PARTSTAT=TENTATIVE;ROLE=OPT-PARTICIPANT:"
+            f"mailto:b{i}@example.com",
+            "SEQUENCE:0",
+            "STATUS:CONFIRMED",
+            "TRANSP:OPAQUE",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def content_lines(ics):
+    """The content lines of each event in a dictionary by their name."""
+    events = []
+    event = None
+    for line in ics.split("\r\n"):
+        if line == "BEGIN:VEVENT":
+            event = {}
+        elif line == "END:VEVENT":
+            events.append(event)
+            event = None
+        elif event is not None:
+            name = line.partition(":")[0].partition(";")[0]
+            event.setdefault(name, []).append(line)
+    return events
+
+
+def bytes_per_event(parse, ics, **kwargs):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        events = parse(ics, **kwargs)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    if isinstance(events, Calendar):
+        events = events.subcomponents
+    assert len(events) == EVENTS
+    return size / EVENTS
+
+
+@pytest.mark.skipif(platform.python_implementation() != "CPython",
+                    reason="the memory is measured with tracemalloc")
+def test_memory_budget():
+    ics = calendar_ics()
+    reference = bytes_per_event(content_lines, ics)
+    eager = bytes_per_event(Calendar.from_ical, ics)
+    lazy = bytes_per_event(Calendar.from_ical, ics, lazy=True)
+    assert eager < 1.6 * reference
+    # lazily parsed values only keep their content line
+    assert lazy < eager
+
+
+def test_parameters_are_created_when_used():
+    event = Calendar.from_ical(calendar_ics(1)).subcomponents[0]
+    summary = event["SUMMARY"]
+    assert summary._params is None
+    assert event.to_ical().count(b"SUMMARY:Meeting 0") == 1
+    assert summary._params is None
+    summary.params["LANGUAGE"] = "en"
+    assert b"SUMMARY;LANGUAGE=en:Meeting 0" in event.to_ical()
+    assert event["ATTENDEE"][0].params["PARTSTAT"] == "ACCEPTED"
+
+
+def test_values_have_no_dict():
+    event = Calendar.from_ical(calendar_ics(1)).subcomponents[0]
+    for name in ("UID", "DTSTART", "SUMMARY", "ORGANIZER"):
+        assert not hasattr(event[name], "__dict__")
+    with pytest.raises(AttributeError):
+        event["SUMMARY"].other = 1
@@ -0,0 +1,207 @@
+"""Test the expansion of recurring events into occurrences."""
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytz
+
+from icalendar import Calendar, Event
+from icalendar import recurrence
+from icalendar.recurrence import _fast_forward
+
+
+def event_from(*lines):
+    return Event.from_ical(
+        "BEGIN:VEVENT\r\n" + "\r\n".join(lines) + "\r\nEND:VEVENT\r\n")
+
+
+def starts(occurrences):
+    return [occurrence.start for occurrence in occurrences]
+
+
+def test_event_without_recurrence():
+    event = event_from("DTSTART:20240101T100000", "DTEND:20240101T110000")
+    occurrences = list(event.occurrences(datetime(2024, 1, 1),
+                                         datetime(2024, 1, 2)))
+    assert occurrences == [(datetime(2024, 1, 1, 10),
+                            datetime(2024, 1, 1, 11), event)]
+    assert list(event.occurrences(datetime(2024, 1, 1, 11),
+                                  datetime(2024, 1, 2))) == []
+
+
+def test_rrule_is_expanded_in_the_window():
+    event = event_from("DTSTART:20240101T100000", "DURATION:PT1H",
+                       "RRULE:FREQ=DAILY;COUNT=5")
+    assert starts(event.occurrences(datetime(2024, 1, 2),
+                                    datetime(2024, 1, 4, 10))) == [
+        datetime(2024, 1, 2, 10), datetime(2024, 1, 3, 10)]
+
+
+def test_occurrences_overlapping_the_start_of_the_window():
+    event = event_from("DTSTART:20240101T230000", "DTEND:20240102T010000",
+                       "RRULE:FREQ=DAILY")
+    occurrences = list(event.occurrences(datetime(2024, 1, 3),
+                                         datetime(2024, 1, 3, 12)))
+    assert occurrences == [(datetime(2024, 1, 2, 23),
+                            datetime(2024, 1, 3, 1), event)]
+
+
+def test_rdate_and_exdate():
+    event = event_from(
+        "DTSTART;VALUE=DATE:20240101",
+        "RRULE:FREQ=WEEKLY;BYDAY=MO",
+        "RDATE;VALUE=DATE:20240103,20240104",
+        "EXDATE;VALUE=DATE:20240108",
+    )
+    assert starts(event.occurrences(date(2024, 1, 1), date(2024, 1, 20))) == [
+        date(2024, 1, 1), date(2024, 1, 3), date(2024, 1, 4),
+        date(2024, 1, 15)]
+
+
+def test_rdate_period():
+    event = event_from(
+        "DTSTART:20240101T100000Z", "DTEND:20240101T110000Z",
+        "RDATE;VALUE=PERIOD:20240105T080000Z/PT3H")
+    occurrences = list(event.occurrences(datetime(2024, 1, 2, tzinfo=pytz.utc),
+                                         datetime(2024, 1, 9, tzinfo=pytz.utc)))
+    assert occurrences == [(datetime(2024, 1, 5, 8, tzinfo=pytz.utc),
+                            datetime(2024, 1, 5, 11, tzinfo=pytz.utc), event)]
+
+
+def test_local_time_is_kept_across_daylight_saving_time():
+    event = event_from(
+        "DTSTART;TZID=Europe/Berlin:20240301T100000",
+        "DTEND;TZID=Europe/Berlin:20240301T110000",
+        "RRULE:FREQ=MONTHLY")
+    berlin = pytz.timezone("Europe/Berlin")
+    occurrences = list(event.occurrences(
+        datetime(2024, 3, 2, tzinfo=pytz.utc),
+        datetime(2024, 4, 2, tzinfo=pytz.utc)))
+    assert len(occurrences) == 1
+    start, end, _ = occurrences[0]
+    assert start == berlin.localize(datetime(2024, 4, 1, 10))
+    assert start.utcoffset() == timedelta(hours=2)
+    assert end == berlin.localize(datetime(2024, 4, 1, 11))
+
+
+def test_exdate_in_another_timezone():
+    event = event_from(
+        "DTSTART;TZID=Europe/Berlin:20240101T100000",
+        "RRULE:FREQ=DAILY;COUNT=3",
+        "EXDATE:20240102T090000Z")
+    assert [start.day for start in starts(event.occurrences(
+        date(2024, 1, 1), date(2024, 1, 10)))] == [1, 3]
+
+
+@pytest.mark.parametrize("start,end,expected", [
+    # floating events happen in the timezone of the window
+    (datetime(2024, 1, 1, 9, tzinfo=pytz.utc),
+     datetime(2024, 1, 1, 11, tzinfo=pytz.utc), 1),
+    (datetime(2024, 1, 1, 11, tzinfo=pytz.utc),
+     datetime(2024, 1, 1, 12, tzinfo=pytz.utc), 0),
+    (date(2024, 1, 1), date(2024, 1, 2), 1),
+])
+def test_floating_events_in_aware_windows(start, end, expected):
+    event = event_from("DTSTART:20240101T100000", "DTEND:20240101T110000")
+    assert len(list(event.occurrences(start, end))) == expected
+
+
+def test_aware_events_in_naive_windows_use_their_local_time():
+    event = event_from("DTSTART;TZID=America/New_York:20240101T100000")
+    assert len(list(event.occurrences(datetime(2024, 1, 1, 10),
+                                      datetime(2024, 1, 1, 11)))) == 1
+
+
+def test_until():
+    event = event_from("DTSTART;TZID=Europe/Berlin:20240101T100000",
+                       "RRULE:FREQ=DAILY;UNTIL=20240103T090000Z")
+    assert len(list(event.occurrences(date(2024, 1, 1),
+                                      date(2025, 1, 1)))) == 3
+
+
+def test_open_ended_rule_costs_the_window(monkeypatch):
+    """A rule from the distant past is not expanded from its start."""
+    dtstarts = []
+
+    def fast_forward(*args):
+        dtstarts.append(_fast_forward(*args))
+        return dtstarts[-1]
+
+    monkeypatch.setattr(recurrence, "_fast_forward", fast_forward)
+    event = event_from("DTSTART:17000101T100000", "RRULE:FREQ=MINUTELY")
+    occurrences = list(event.occurrences(datetime(2024, 1, 1, 10),
+                                         datetime(2024, 1, 1, 11)))
+    assert len(occurrences) == 60
+    assert occurrences[0].start == datetime(2024, 1, 1, 10)
+    # the rule starts about a day before the window
+    assert datetime(2023, 12, 31, 9) <= dtstarts[0] <= datetime(2024, 1, 1, 10)
+
+
+def test_occurrences_are_generated_lazily():
+    event = event_from("DTSTART:20240101T100000", "RRULE:FREQ=DAILY")
+    occurrences = event.occurrences(date(2024, 1, 1), date(9999, 1, 1))
+    assert next(occurrences).start == datetime(2024, 1, 1, 10)
+    assert next(occurrences).start == datetime(2024, 1, 2, 10)
+
+
+CALENDAR = """BEGIN:VCALENDAR
+BEGIN:VEVENT
+UID:weekly
+SUMMARY:weekly
+DTSTART:20240101T100000
+DTEND:20240101T110000
+RRULE:FREQ=WEEKLY
+END:VEVENT
+BEGIN:VEVENT
+UID:weekly
+SUMMARY:moved
+RECURRENCE-ID:20240108T100000
+DTSTART:20240109T150000
+DTEND:20240109T160000
+END:VEVENT
+BEGIN:VEVENT
+UID:weekly
+SUMMARY:moved out of the window
+RECURRENCE-ID:20240115T100000
+DTSTART:20240301T100000
+DTEND:20240301T110000
+END:VEVENT
+BEGIN:VEVENT
+UID:single
+SUMMARY:single
+DTSTART:20240110T090000
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_calendar_occurrences_apply_recurrence_id():
+    calendar = Calendar.from_ical(CALENDAR)
+    occurrences = list(calendar.occurrences(date(2024, 1, 1),
+                                            date(2024, 1, 23)))
+    assert [(o.start, o.component["SUMMARY"]) for o in occurrences] == [
+        (datetime(2024, 1, 1, 10), "weekly"),
+        (datetime(2024, 1, 9, 15), "moved"),
+        (datetime(2024, 1, 10, 9), "single"),
+        (datetime(2024, 1, 22, 10), "weekly"),
+    ]
+
+
+def test_calendar_occurrences_of_moved_occurrences():
+    calendar = Calendar.from_ical(CALENDAR)
+    occurrences = list(calendar.occurrences(date(2024, 3, 1),
+                                            date(2024, 3, 2)))
+    assert [o.component["SUMMARY"] for o in occurrences] == [
+        "moved out of the window"]
+
+
+def test_calendar_occurrences_of_test_calendars(ics_file):
+    """All calendars can be expanded."""
+    if not isinstance(ics_file, Calendar):
+        return
+    occurrences = list(ics_file.occurrences(date(2000, 1, 1),
+                                            date(2030, 1, 1)))
+    keys = [o.start if isinstance(o.start, datetime) else
+            datetime(o.start.year, o.start.month, o.start.day)
+            for o in occurrences]
+    keys = [key.replace(tzinfo=None) for key in keys]
+    assert keys == sorted(keys)
@@ -0,0 +1,151 @@
+"""Test parsing calendars in several processes with from_ical_parallel()."""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import os
+import pickle
+
+import pytest
+
+from icalendar import Calendar
+from icalendar.tests.conftest import CALENDARS_FOLDER
+from icalendar.timezone_cache import _timezone_cache
+
+
+def read_calendar(name):
+    with open(os.path.join(CALENDARS_FOLDER, name + ".ics"), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("calendar_name", [
+    "example",
+    "timezoned",
+    "pacific_fiji",
+    "calendar_with_unicode",
+    "issue_526_calendar_with_events",
+    "issue_466_respect_unique_timezone",
+])
+@pytest.mark.parametrize("chunksize", [None, 1])
+def test_parallel_parsing_gives_the_same_calendar(
+        calendars, calendar_name, chunksize, executor):
+    expected = calendars[calendar_name]
+    calendar = Calendar.from_ical_parallel(
+        expected.raw_ics, executor=executor, chunksize=chunksize)
+    assert calendar == expected
+    assert calendar.to_ical() == expected.to_ical()
+    assert [c.name for c in calendar.walk()] == \
+        [c.name for c in expected.walk()]
+
+
+def test_multiple_components_are_parsed_in_parallel(executor):
+    raw_ics = read_calendar("multiple_calendar_components")
+    expected = Calendar.from_ical(raw_ics, multiple=True)
+    parsed = Calendar.from_ical_parallel(raw_ics, multiple=True,
+                                         executor=executor)
+    assert parsed == expected
+
+
+def test_multiple_components_are_not_allowed(executor):
+    with pytest.raises(ValueError):
+        Calendar.from_ical_parallel(
+            read_calendar("multiple_calendar_components"), executor=executor)
+
+
+@pytest.mark.parametrize("ics", [
+    "BEGIN:VCALENDAR\r\nEND:VEVENT\r\n",
+    "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nEND:VCALENDAR\r\n",
+    "END:VCALENDAR\r\n",
+    "",
+])
+def test_unbalanced_components_are_parsed_like_from_ical(ics):
+    try:
+        expected = Calendar.from_ical(ics, multiple=True)
+    except Exception as error:
+        with pytest.raises(type(error)):
+            Calendar.from_ical_parallel(ics, multiple=True)
+    else:
+        assert Calendar.from_ical_parallel(ics, multiple=True) == expected
+
+
+def test_max_workers(calendars):
+    calendar = Calendar.from_ical_parallel(
+        calendars.timezoned.raw_ics, max_workers=2)
+    assert calendar == calendars.timezoned
+
+
+def test_timezones_of_the_workers_are_cached(calendars, executor):
+    """Timezones that are defined in a worker process are known here."""
+    tzid = "custom_Pacific/Fiji"
+    _timezone_cache.pop(tzid, None)
+    raw_ics = calendars.pacific_fiji.raw_ics
+    Calendar.from_ical_parallel(raw_ics + raw_ics, multiple=True,
+                                executor=executor)
+    assert tzid in _timezone_cache
+
+
+def test_custom_timezones_can_be_pickled(calendars):
+    calendar = calendars.pacific_fiji
+    copy = pickle.loads(pickle.dumps(calendar))
+    assert copy == calendar
+    dtstart = copy.walk("VEVENT")[0]["DTSTART"][0].dt
+    assert dtstart.utcoffset() == \
+        calendar.walk("VEVENT")[0]["DTSTART"][0].dt.utcoffset()
+
+
+def test_unpickled_timezones_are_not_cached():
+    """Timezones of the workers do not change the TZIDs of this process."""
+    tzid = "test_parallel_parsing/Unpickled"
+    calendar = Calendar.from_ical(redefined_calendar(tzid))
+    timezone = calendar.walk("VTIMEZONE")[0]
+    data = pickle.dumps(timezone.to_tz())
+    _timezone_cache.pop(tzid)
+    copy = pickle.loads(data)
+    assert tzid not in _timezone_cache
+    assert copy.zone == tzid
+    assert copy.utcoffset(datetime(2024, 1, 1)) == timedelta(hours=3)
+
+
+def redefined_calendar(tzid):
+    def vtimezone(offset):
+        return (
+            "BEGIN:VTIMEZONE\r\n"
+            f"TZID:{tzid}\r\n"
+            "BEGIN:STANDARD\r\n"
+            "DTSTART:19700101T000000\r\n"
+            f"TZOFFSETFROM:{offset}\r\n"
+            f"TZOFFSETTO:{offset}\r\n"
+            "END:STANDARD\r\n"
+            "END:VTIMEZONE\r\n"
+        )
+
+    def event(uid):
+        return (
+            "BEGIN:VEVENT\r\n"
+            f"UID:{uid}\r\n"
+            f"DTSTART;TZID={tzid}:20240101T100000\r\n"
+            "END:VEVENT\r\n"
+        )
+
+    return ("BEGIN:VCALENDAR\r\n" + vtimezone("+0300") + event(1)
+            + vtimezone("+0400") + event(2) + "END:VCALENDAR\r\n")
+
+
+def test_redefined_timezones_are_used_like_when_parsing_serially(executor):
+    """The last VTIMEZONE before a component defines its TZID."""
+    tzid = "test_parallel_parsing/Redefined"
+    ics = redefined_calendar(tzid)
+    expected = Calendar.from_ical(ics)
+    calendar = Calendar.from_ical_parallel(ics, executor=executor,
+                                           chunksize=1)
+    offsets = [event.decoded("DTSTART").utcoffset().total_seconds()
+               for event in calendar.walk("VEVENT")]
+    assert offsets == [3 * 3600, 4 * 3600]
+    assert calendar == expected
+    assert _timezone_cache[tzid].localize(
+        calendar.walk("VEVENT")[0].decoded("DTSTART").replace(tzinfo=None)
+    ).utcoffset().total_seconds() == 4 * 3600
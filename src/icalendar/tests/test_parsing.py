@@ -3,7 +3,7 @@ import pytest
 import base64
 from icalendar import Calendar, vRecur, vBinary, Event
 from datetime import datetime
-from icalendar.parser import Contentline, Parameters
+from icalendar.parser import Contentline, Contentlines, Parameters
 
 @pytest.mark.parametrize('calendar_name', [
     # Issue #178 - A component with an unknown/invalid name is represented
@@ -187,3 +187,39 @@ def test_escaped_characters_read(event_name, expected_cn, expected_ics, events):
     assert event['ORGANIZER'].params['CN'] == expected_cn
     assert event['ORGANIZER'].to_ical() == expected_ics.encode('utf-8')
 
+
+
+def _parts_or_error(parts):
+    try:
+        name, params, value = parts()
+    except ValueError as error:
+        return str(error)
+    return name, list(params.items()), value
+
+
+def test_tokenizer_splits_lines_like_the_scan(ics_file):
+    """The fast path of Contentline.parts() must give the same result as
+    scanning the line character by character."""
+    for strict in (False, True):
+        for line in Contentlines.from_ical(ics_file.raw_ics):
+            if not line:
+                continue
+            line = Contentline(line, strict=strict)
+            assert _parts_or_error(line.parts) == \
+                _parts_or_error(line._scan_parts)
+
+
+@pytest.mark.parametrize('raw_content_line', [
+    'A;X="a,b",c;Y=:v',
+    'A;X=,:v',
+    'A;X="":v',
+    'A;X=a b\t:v%3A',
+    'A;X="c:d";Y=e:f:g"h',
+    # escaped characters are handled by the character by character scan
+    'A;X=a\\,b:v',
+    'A:\\,\\;\\\\n',
+    'A;;X=1:v',
+])
+def test_tokenizer_edge_cases(raw_content_line):
+    line = Contentline(raw_content_line)
+    assert _parts_or_error(line.parts) == _parts_or_error(line._scan_parts)
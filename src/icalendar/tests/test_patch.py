@@ -0,0 +1,128 @@
+"""Test the diff of calendars and applying the patches."""
+from datetime import datetime
+
+import pytest
+
+from icalendar import Alarm, Calendar, CalendarPatch, Timezone
+from icalendar.patch import component_key
+from icalendar.tests import conftest
+from icalendar.tests.conftest import new_event
+
+
+def event(uid, summary="meeting", **properties):
+    return new_event(uid=uid, summary=summary, **properties)
+
+
+def calendar_of(*components):
+    return conftest.calendar_of(*components, prodid="-//test//patch//EN")
+
+
+def copy_of(calendar):
+    return Calendar.from_ical(calendar.to_ical())
+
+
+@pytest.fixture
+def old():
+    return copy_of(calendar_of(
+        event("unchanged"),
+        event("changed", location="room 1"),
+        event("removed"),
+        event("recurring", rrule={"freq": "daily"}),
+        event("recurring", "moved",
+              recurrence_id=datetime(2024, 1, 2, 10)),
+    ))
+
+
+def test_diff(old):
+    new = copy_of(old)
+    new.subcomponents[1]["SUMMARY"] = "new summary"
+    new.subcomponents[1].pop("LOCATION")
+    new.subcomponents[1].add("sequence", 1)
+    del new.subcomponents[2]
+    new.subcomponents[3]["SUMMARY"] = "moved again"
+    new.add_component(event("added"))
+    new["X-WR-CALNAME"] = "Work"
+
+    patch = old.make_patch(new)
+    assert [str(component["UID"]) for component in patch.added] == ["added"]
+    assert patch.removed == [("VEVENT", "removed", None)]
+    assert [(change.key, change.sequence, change.properties)
+            for change in patch.modified] == [
+        (("VEVENT", "changed", None), 1,
+         {"SUMMARY": "new summary", "SEQUENCE": 1, "LOCATION": None}),
+        (("VEVENT", "recurring", datetime(2024, 1, 2, 10)), None,
+         {"SUMMARY": "moved again"}),
+    ]
+    assert patch.properties == {"X-WR-CALNAME": "Work"}
+
+    old.apply_patch(patch)
+    assert old == new
+
+
+def test_no_changes(old):
+    patch = old.make_patch(copy_of(old))
+    assert not patch
+    assert patch == CalendarPatch()
+    old.apply_patch(patch)
+    assert old == copy_of(old)
+
+
+def test_changed_subcomponents(old):
+    new = copy_of(old)
+    alarm = Alarm()
+    alarm.add("action", "DISPLAY")
+    new.subcomponents[0].add_component(alarm)
+    patch = old.make_patch(new)
+    assert len(patch.modified) == 1
+    assert patch.modified[0].properties == {}
+    assert patch.modified[0].subcomponents == [alarm]
+    old.apply_patch(patch)
+    assert old.subcomponents[0].subcomponents == [alarm]
+
+
+def test_keys():
+    assert component_key(event("a")) == ("VEVENT", "a", None)
+    timezone = Timezone()
+    timezone.add("tzid", "Custom/Zone")
+    assert component_key(timezone) == ("VTIMEZONE", "Custom/Zone")
+    assert component_key(Alarm()) == ("VALARM", Alarm().content_hash())
+
+
+def test_newer_components_are_not_changed(old):
+    new = copy_of(old)
+    new.subcomponents[1]["SUMMARY"] = "new summary"
+    new.subcomponents[1]["SEQUENCE"] = 1
+    patch = old.make_patch(new)
+    old.subcomponents[1]["SEQUENCE"] = 2
+    old.apply_patch(patch)
+    assert old.subcomponents[1]["SUMMARY"] == "meeting"
+
+
+@pytest.mark.parametrize("change", [
+    lambda calendar: calendar.subcomponents.pop(2),
+    lambda calendar: calendar.subcomponents.pop(1),
+    lambda calendar: calendar.add_component(event("added")),
+])
+def test_patches_that_do_not_fit(old, change):
+    new = copy_of(old)
+    new.subcomponents[1]["SUMMARY"] = "new summary"
+    del new.subcomponents[2]
+    new.add_component(event("added"))
+    patch = old.make_patch(new)
+    change(old)
+    calendar = copy_of(old)
+    with pytest.raises(ValueError):
+        old.apply_patch(patch)
+    assert old == calendar
+
+
+def test_lazy_calendars(old):
+    new = copy_of(old)
+    new.subcomponents[1]["SUMMARY"] = "new summary"
+    lazy_old = Calendar.from_ical(old.to_ical(), lazy=True)
+    lazy_new = Calendar.from_ical(new.to_ical(), lazy=True)
+    patch = lazy_old.make_patch(lazy_new)
+    assert [change.properties for change in patch.modified] == [
+        {"SUMMARY": "new summary"}]
+    old.apply_patch(patch)
+    assert old == new
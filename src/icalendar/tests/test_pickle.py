@@ -0,0 +1,77 @@
+"""Test that components can be pickled and that pickles of earlier versions
+can be loaded, although the values have __slots__ now.
+
+The pickles in the pickles folder were made by icalendar 5.0.11 with
+pickle.dump(Event.from_ical(EVENT), f, protocol=protocol).
+"""
+import os
+import pickle
+
+import pytest
+
+from icalendar import Event
+from icalendar.prop import vGeo, vText
+
+HERE = os.path.dirname(__file__)
+PICKLES_FOLDER = os.path.join(HERE, "pickles")
+PROTOCOLS = range(pickle.HIGHEST_PROTOCOL + 1)
+
+EVENT = (
+    b"BEGIN:VEVENT\r\n"
+    b"UID:pickle@example.com\r\n"
+    b"SUMMARY:Meeting\r\n"
+    b"DTSTART;TZID=Europe/Berlin:20240102T100000\r\n"
+    b"DURATION:PT1H\r\n"
+    b"RRULE:FREQ=WEEKLY;COUNT=3\r\n"
+    b"ATTENDEE;CN=Alice:mailto:alice@example.com\r\n"
+    b"GEO:48.1;11.5\r\n"
+    b"CATEGORIES:Work,Meeting\r\n"
+    b"PRIORITY:1\r\n"
+    b"END:VEVENT\r\n"
+)
+
+
+def assert_same_event(event):
+    expected = Event.from_ical(EVENT)
+    assert event == expected
+    assert event.to_ical() == expected.to_ical()
+    for name, value in expected.items():
+        assert event[name].params == value.params
+    assert event["DTSTART"].dt == expected["DTSTART"].dt
+    assert event["DTSTART"].dt.utcoffset() == \
+        expected["DTSTART"].dt.utcoffset()
+    assert event["SUMMARY"].encoding == "utf-8"
+    assert event["GEO"].latitude == 48.1
+
+
+@pytest.mark.parametrize("protocol", range(5))
+def test_pickles_of_5_0_11_can_be_loaded(protocol):
+    path = os.path.join(PICKLES_FOLDER,
+                        f"event_5.0.11_protocol_{protocol}.pickle")
+    with open(path, "rb") as f:
+        assert_same_event(pickle.load(f))
+
+
+@pytest.mark.parametrize("protocol", PROTOCOLS)
+@pytest.mark.parametrize("lazy", [False, True])
+def test_components_can_be_pickled(protocol, lazy):
+    event = Event.from_ical(EVENT, lazy=lazy)
+    assert_same_event(pickle.loads(pickle.dumps(event, protocol=protocol)))
+
+
+@pytest.mark.parametrize("protocol", PROTOCOLS)
+def test_values_are_pickled_like_in_earlier_versions(protocol):
+    """The state is a dictionary with params, like without __slots__."""
+    text = vText("Meeting")
+    assert text.__getstate__() == {"encoding": "utf-8", "params": {}}
+    geo = pickle.loads(pickle.dumps(vGeo((48.1, 11.5)), protocol=protocol))
+    assert (geo.latitude, geo.longitude) == (48.1, 11.5)
+    assert geo.params == {}
+
+
+def test_parameters_are_pickled():
+    text = vText("Meeting")
+    text.params["LANGUAGE"] = "en"
+    copy = pickle.loads(pickle.dumps(text))
+    assert copy == "Meeting"
+    assert copy.params == {"LANGUAGE": "en"}
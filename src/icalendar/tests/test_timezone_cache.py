@@ -0,0 +1,211 @@
+"""Test the cache of timezones compiled from VTIMEZONE components and the
+resolution of TZIDs."""
+from datetime import datetime, timedelta
+import pickle
+
+import pytest
+import pytz
+
+from icalendar import Calendar, Timezone
+from icalendar.timezone_cache import TimezoneCache, _timezone_cache
+from icalendar.timezone_cache import _tzdb_timezone, resolve_tzid
+from icalendar.timezone_cache import timezone_from_json, timezone_hash
+from icalendar.timezone_cache import timezone_to_json
+
+
+def vtimezone(tzid="Custom/Zone", offset="+0500", *extra):
+    return Timezone.from_ical("\r\n".join([
+        "BEGIN:VTIMEZONE",
+        f"TZID:{tzid}",
+        *extra,
+        "BEGIN:STANDARD",
+        "DTSTART:19700101T000000",
+        f"TZOFFSETFROM:{offset}",
+        f"TZOFFSETTO:{offset}",
+        "TZNAME:CUSTOM",
+        "END:STANDARD",
+        "END:VTIMEZONE",
+    ]) + "\r\n")
+
+
+def calendar_with(tzid, offset):
+    return (
+        "BEGIN:VCALENDAR\r\n"
+        + vtimezone(tzid, offset).to_ical().decode() +
+        "BEGIN:VEVENT\r\n"
+        f"DTSTART;TZID={tzid}:20240101T100000\r\n"
+        "END:VEVENT\r\n"
+        "END:VCALENDAR\r\n"
+    )
+
+
+def test_same_content_is_compiled_once():
+    cache = TimezoneCache()
+    first = cache.compile(vtimezone())
+    assert cache.cache_info() == (0, 1, 1024, 1)
+    assert cache.compile(vtimezone()) is first
+    assert cache.cache_info() == (1, 1, 1024, 1)
+
+
+def test_hash_ignores_irrelevant_properties():
+    assert timezone_hash(vtimezone()) == timezone_hash(
+        vtimezone("Custom/Zone", "+0500", "LAST-MODIFIED:20240101T000000Z",
+                  "X-LIC-LOCATION:Custom/Zone"))
+    assert timezone_hash(vtimezone()) != timezone_hash(
+        vtimezone("Custom/Zone", "+0600"))
+    assert timezone_hash(vtimezone()) != timezone_hash(vtimezone("Other"))
+
+
+def test_least_recently_used_timezones_are_removed():
+    cache = TimezoneCache(maxsize=2)
+    cache["a"] = cache.compile(vtimezone("a"))
+    cache["b"] = cache.compile(vtimezone("b"))
+    cache["a"]
+    cache["c"] = cache.compile(vtimezone("c"))
+    # only the compiled timezones are limited, not the TZIDs
+    assert list(cache) == ["a", "b", "c"]
+    assert cache.cache_info().currsize == 2
+    # the compiled timezones are used in the order a, b, c
+    cache.compile(vtimezone("c"))
+    assert cache.cache_info().hits == 1
+    cache.compile(vtimezone("a"))
+    assert cache.cache_info().misses == 4
+
+
+def test_mapping_interface():
+    cache = TimezoneCache()
+    tz = cache.compile(vtimezone())
+    cache["Custom/Zone"] = tz
+    assert "Custom/Zone" in cache
+    assert cache.get("Custom/Zone") is tz
+    assert cache.get("unknown") is None
+    assert len(cache) == 1
+    del cache["Custom/Zone"]
+    assert "Custom/Zone" not in cache
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 1024, 0)
+
+
+def test_parsing_repeated_vtimezones_hits_the_cache():
+    tzid = "test_timezone_cache/Repeated"
+    ics = calendar_with(tzid, "+0300")
+    Calendar.from_ical(ics)
+    hits = _timezone_cache.hits
+    misses = _timezone_cache.misses
+    for _ in range(3):
+        calendar = Calendar.from_ical(ics)
+    assert _timezone_cache.hits == hits + 3
+    assert _timezone_cache.misses == misses
+    dtstart = calendar.walk("VEVENT")[0].decoded("DTSTART")
+    assert dtstart.utcoffset() == timedelta(hours=3)
+
+
+def test_the_last_vtimezone_defines_the_tzid():
+    tzid = "test_timezone_cache/Redefined"
+    first = Calendar.from_ical(calendar_with(tzid, "+0300"))
+    second = Calendar.from_ical(calendar_with(tzid, "+0400"))
+    assert first.walk("VEVENT")[0].decoded("DTSTART").utcoffset() == \
+        timedelta(hours=3)
+    assert second.walk("VEVENT")[0].decoded("DTSTART").utcoffset() == \
+        timedelta(hours=4)
+
+
+@pytest.mark.parametrize("tzid,zone", [
+    ("Europe/Berlin", "Europe/Berlin"),
+    ("/Europe/Berlin", "Europe/Berlin"),
+    ("/Europe/Berlin/", "Europe/Berlin"),
+    ("Eastern Standard Time", "America/New_York"),
+    ("UTC", "UTC"),
+])
+def test_resolve_tzid_of_the_tz_database(tzid, zone):
+    assert resolve_tzid(tzid).zone == zone
+
+
+def test_resolve_tzid_of_vtimezones():
+    tzid = "test_timezone_cache/Resolved"
+    assert resolve_tzid(tzid) is None
+    Calendar.from_ical(calendar_with(tzid, "+0300"))
+    assert resolve_tzid(tzid) is _timezone_cache[tzid]
+    # the timezones of the tz database are preferred
+    Calendar.from_ical(calendar_with("Eastern Standard Time", "+0300"))
+    assert resolve_tzid("Eastern Standard Time").zone == "America/New_York"
+
+
+def test_resolve_tzid_is_memoized():
+    _tzdb_timezone.cache_clear()
+    for _ in range(3):
+        resolve_tzid("Europe/Vienna")
+    assert _tzdb_timezone.cache_info().hits == 2
+
+
+@pytest.mark.parametrize("calendar_name", [
+    "pacific_fiji",
+    "america_new_york",
+    "issue_237_fail_to_parse_timezone_with_non_ascii_tzid",
+    "timezone_rdate",
+])
+def test_json_of_vtimezones(calendars, calendar_name):
+    timezone = calendars[calendar_name].walk("VTIMEZONE")[0]
+    tz = timezone.to_tz()
+    loaded = timezone_from_json(timezone_to_json(tz))
+    assert loaded.zone == tz.zone
+    assert loaded._utc_transition_times == tz._utc_transition_times
+    assert loaded._transition_info == tz._transition_info
+    local = datetime(2017, 7, 1, 12)
+    assert loaded.localize(local).utcoffset() == \
+        tz.localize(local).utcoffset()
+    assert pickle.loads(pickle.dumps(loaded.localize(local))) == \
+        tz.localize(local)
+
+
+def test_json_of_the_tz_database():
+    tz = pytz.timezone("Europe/Berlin")
+    loaded = timezone_from_json(timezone_to_json(tz).encode("utf-8"))
+    assert loaded._utc_transition_times == tz._utc_transition_times
+    assert loaded._transition_info == tz._transition_info
+
+
+def test_json_errors():
+    with pytest.raises(TypeError):
+        timezone_to_json(pytz.utc)
+    with pytest.raises(ValueError, match="version 2"):
+        timezone_from_json('{"version": 2, "zone": "a", "transitions": []}')
+    with pytest.raises(ValueError):
+        timezone_from_json("not json")
+    with pytest.raises(ValueError, match="not an object"):
+        timezone_from_json("[]")
+
+
+def test_directory_cache(tmp_path, monkeypatch):
+    compiled = TimezoneCache(directory=str(tmp_path)).compile(vtimezone())
+    assert [path.suffix for path in tmp_path.iterdir()] == [".json"]
+
+    def to_tz(self):
+        raise AssertionError("the timezone is loaded from the directory")
+
+    monkeypatch.setattr(Timezone, "to_tz", to_tz)
+    cache = TimezoneCache(directory=str(tmp_path))
+    loaded = cache.compile(vtimezone())
+    assert loaded._transition_info == compiled._transition_info
+    assert cache.cache_info() == (0, 1, 1024, 1)
+    assert cache.compile(vtimezone()) is loaded
+
+
+@pytest.mark.parametrize("content", ['{"version": 1, "zone"', "[]", "1"])
+def test_broken_files_are_compiled_again(tmp_path, content):
+    cache = TimezoneCache(directory=str(tmp_path))
+    cache.compile(vtimezone())
+    [path] = tmp_path.iterdir()
+    path.write_text(content)
+    cache.clear()
+    tz = cache.compile(vtimezone())
+    assert tz.zone == "Custom/Zone"
+    assert timezone_from_json(path.read_bytes())._transition_info == \
+        tz._transition_info
+
+
+def test_the_directory_does_not_need_to_be_writable(tmp_path):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    cache = TimezoneCache(directory=str(not_a_directory))
+    assert cache.compile(vtimezone()).zone == "Custom/Zone"
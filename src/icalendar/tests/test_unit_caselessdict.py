@@ -97,3 +97,25 @@ class TestCaselessdict(unittest.TestCase):
 
         keys = sorted(ncd.keys())
         self.assertEqual(keys, ['KEY1', 'KEY2', 'KEY3', 'KEY5', 'KEY6'])
+
+    def test_caselessdict_keeps_the_order_of_keys(self):
+        CaselessDict = icalendar.caselessdict.CaselessDict
+
+        ncd = CaselessDict([('b', 1), ('A', 2), ('c', 3)])
+        self.assertEqual(list(ncd), ['B', 'A', 'C'])
+        self.assertEqual(ncd.popitem(), ('C', 3))
+
+    def test_caselessdict_keys_of_other_types(self):
+        CaselessDict = icalendar.caselessdict.CaselessDict
+
+        ncd = CaselessDict()
+        ncd[b'key'] = 'bytes'
+        ncd['Ünïcode'] = 'text'
+        self.assertEqual(list(ncd), ['KEY', 'ÜNÏCODE'])
+        self.assertEqual(ncd['key'], 'bytes')
+        self.assertEqual(ncd[b'KEY'], 'bytes')
+        self.assertEqual(ncd.get(b'key'), 'bytes')
+        self.assertTrue(b'Key' in ncd)
+        self.assertEqual(ncd['ünïcode'], 'text')
+        with self.assertRaises(KeyError):
+            ncd['missing']
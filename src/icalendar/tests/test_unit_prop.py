@@ -544,6 +544,61 @@ def test_inequality_with_different_types(v_type):
     assert v_type != 42
     assert v_type != 'test'
 
+def test_types_factory_for_property():
+    from ..prop import TypesFactory, vCalAddress, vText
+    factory = TypesFactory()
+    assert factory.for_property('DTSTART') is vDDDTypes
+    assert factory.for_property('attendee') is vCalAddress
+    assert factory.for_property('X-UNKNOWN') is vText
+    factory['cal-address'] = vText
+    assert factory.for_property('ATTENDEE') is vText
+
+
+def test_types_factory_register():
+    from ..prop import TypesFactory, vText, vTime
+    factory = TypesFactory()
+    other = TypesFactory()
+    assert factory.for_property('X-SOMETIME') is vText
+    assert other.for_property('X-SOMETIME') is vText
+    factory.register('x-sometime', 'time')
+    try:
+        assert factory.for_property('X-SOMETIME') is vTime
+        # the types_map is shared by all factories
+        assert other.for_property('X-SOMETIME') is vTime
+    finally:
+        factory.types_map.pop('X-SOMETIME')
+    assert factory.for_property('X-SOMETIME') is vText
+    assert other.for_property('X-SOMETIME') is vText
+    with pytest.raises(ValueError):
+        factory.register('X-SOMETIME', 'no-such-type')
+
+
+def test_types_factory_class_types_map():
+    from ..prop import TypesFactory, vText, vTime
+    factory = TypesFactory()
+    assert factory.for_property('X-SOMETIME') is vText
+    TypesFactory.types_map['X-SOMETIME'] = 'time'
+    try:
+        assert factory.for_property('X-SOMETIME') is vTime
+    finally:
+        del TypesFactory.types_map['X-SOMETIME']
+    assert factory.for_property('X-SOMETIME') is vText
+
+
+def test_types_factory_is_encoded():
+    from ..prop import TypesFactory, vText
+
+    class MyText(vText):
+        pass
+
+    factory = TypesFactory()
+    assert factory.is_encoded(vText('a'))
+    assert factory.is_encoded(MyText('a'))
+    assert factory.is_encoded(vDDDTypes(date(2024, 1, 1)))
+    assert not factory.is_encoded('a')
+    assert not factory.is_encoded(date(2024, 1, 1))
+
+
 class TestPropertyValues(unittest.TestCase):
 
     def test_vDDDLists_timezone(self):
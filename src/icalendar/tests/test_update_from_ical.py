@@ -0,0 +1,145 @@
+"""Test updating a calendar incrementally from a changed string."""
+from datetime import datetime
+
+import pytest
+
+from icalendar import Calendar, Event
+from icalendar.tests.conftest import new_event
+from icalendar.timezone_cache import _timezone_cache
+
+
+def event(uid, summary):
+    event = new_event(uid=uid, summary=summary)
+    event.add("dtstart", datetime(2024, 1, 1, 10),
+              parameters={"TZID": "Custom/Update"})
+    return event.to_ical().decode()
+
+
+def calendar(*events, name="Calendar", offset="+0100"):
+    return (
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        f"X-WR-CALNAME:{name}\r\n"
+        "BEGIN:VTIMEZONE\r\n"
+        "TZID:Custom/Update\r\n"
+        "BEGIN:STANDARD\r\n"
+        "DTSTART:19700101T000000\r\n"
+        f"TZOFFSETFROM:{offset}\r\n"
+        f"TZOFFSETTO:{offset}\r\n"
+        "END:STANDARD\r\n"
+        "END:VTIMEZONE\r\n"
+        + "".join(events) +
+        "END:VCALENDAR\r\n"
+    )
+
+
+def summaries(cal):
+    return [str(e["SUMMARY"]) for e in cal.walk("VEVENT")]
+
+
+def test_first_update_parses_everything():
+    ics = calendar(event(1, "one"), event(2, "two"))
+    cal = Calendar()
+    parsed = cal.update_from_ical(ics)
+    assert len(parsed) == 3
+    assert cal == Calendar.from_ical(ics)
+    assert cal["X-WR-CALNAME"] == "Calendar"
+
+
+def test_only_changed_subcomponents_are_parsed():
+    cal = Calendar()
+    cal.update_from_ical(calendar(event(1, "one"), event(2, "two"),
+                                  event(3, "three")))
+    timezone, one, two, three = cal.subcomponents
+    parsed = cal.update_from_ical(calendar(
+        event(1, "one"), event(2, "changed"), event(4, "four"),
+        name="Renamed"))
+    assert summaries(cal) == ["one", "changed", "four"]
+    assert [str(e["SUMMARY"]) for e in parsed] == ["changed", "four"]
+    assert cal.subcomponents[0] is timezone
+    assert cal.subcomponents[1] is one
+    assert cal["X-WR-CALNAME"] == "Renamed"
+    assert cal == Calendar.from_ical(calendar(
+        event(1, "one"), event(2, "changed"), event(4, "four"),
+        name="Renamed"))
+
+
+def test_reordered_and_repeated_subcomponents():
+    cal = Calendar()
+    cal.update_from_ical(calendar(event(1, "one"), event(2, "two")))
+    one, two = cal.subcomponents[1:]
+    assert cal.update_from_ical(calendar(
+        event(2, "two"), event(1, "one"), event(1, "one"))) == \
+        cal.subcomponents[3:]
+    assert cal.subcomponents[1:3] == [two, one]
+    assert cal.subcomponents[1] is two
+    assert cal.subcomponents[2] is one
+    assert cal.subcomponents[3] is not one
+
+
+def test_components_that_were_not_updated_before():
+    cal = Calendar.from_ical(calendar(event(1, "one"), event(2, "two")))
+    one = cal.subcomponents[1]
+    assert cal.update_from_ical(cal.to_ical()) == []
+    assert cal.subcomponents[1] is one
+    added = new_event(uid="added")
+    cal.add_component(added)
+    assert cal.update_from_ical(cal.to_ical()) == []
+    assert cal.subcomponents[-1] is added
+
+
+def test_unchanged_timezones_define_their_tzid():
+    cal = Calendar()
+    cal.update_from_ical(calendar(event(1, "one")))
+    Calendar.from_ical(calendar(event(1, "one"), offset="+0500"))
+    cal.update_from_ical(calendar(event(1, "changed")))
+    start = cal.walk("VEVENT")[0].decoded("DTSTART")
+    assert start.utcoffset().total_seconds() == 3600
+    assert _timezone_cache["Custom/Update"] is not None
+
+
+def test_changed_timezones_parse_their_events_again():
+    cal = Calendar()
+    cal.update_from_ical(calendar(event(1, "one")))
+    floating = new_event(uid="floating")
+    cal.add_component(floating)
+    ics = calendar(event(1, "one"), floating.to_ical().decode(),
+                   offset="+0500")
+    parsed = cal.update_from_ical(ics)
+    assert [component.name for component in parsed] == ["VTIMEZONE",
+                                                         "VEVENT"]
+    assert cal.subcomponents[2] is floating
+    start = cal.walk("VEVENT")[0].decoded("DTSTART")
+    assert start.utcoffset().total_seconds() == 5 * 3600
+    assert cal == Calendar.from_ical(ics)
+
+
+def test_changes_in_memory_are_compared():
+    cal = Calendar()
+    cal.update_from_ical(calendar(event(1, "one"), event(2, "two")))
+    one, two = cal.subcomponents[1:]
+    one["SUMMARY"] = "changed"
+    two.add_component(Event())
+    parsed = cal.update_from_ical(calendar(event(1, "one"), event(2, "two")))
+    assert summaries(cal) == ["one", "two"]
+    assert len(parsed) == 2
+    assert cal.subcomponents[1] is not one
+    assert cal.subcomponents[2].subcomponents == []
+
+
+def test_lazy_update():
+    cal = Calendar()
+    parsed = cal.update_from_ical(calendar(event(1, "one")), lazy=True)
+    assert parsed[1]._lazy
+    assert summaries(cal) == ["one"]
+
+
+@pytest.mark.parametrize("ics", [
+    "",
+    calendar() + calendar(),
+    "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nEND:VCALENDAR\r\n",
+    event(1, "one"),
+])
+def test_invalid_updates(ics):
+    with pytest.raises(ValueError):
+        Calendar().update_from_ical(ics)
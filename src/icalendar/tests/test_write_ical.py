@@ -0,0 +1,43 @@
+"""Test writing components in chunks with iter_ical() and write_ical()."""
+import io
+
+import pytest
+
+from icalendar import Calendar, Event
+
+
+@pytest.mark.parametrize("sorted", [True, False])
+def test_write_ical_is_the_same_as_to_ical(ics_file, sorted):
+    stream = io.BytesIO()
+    ics_file.write_ical(stream, sorted=sorted)
+    assert stream.getvalue() == ics_file.to_ical(sorted=sorted)
+
+
+def test_lazy_components_are_written_as_read(calendars):
+    calendar = Calendar.from_ical(calendars.timezoned.raw_ics, lazy=True)
+    assert b"".join(calendar.iter_ical()) == calendar.to_ical()
+
+
+def test_iter_ical_yields_one_chunk_per_component():
+    calendar = Calendar()
+    calendar.add("prodid", "-//test//")
+    for uid in ("1", "2"):
+        event = Event()
+        event.add("uid", uid)
+        calendar.add_component(event)
+    assert list(calendar.iter_ical()) == [
+        b"BEGIN:VCALENDAR\r\nPRODID:-//test//\r\n",
+        b"BEGIN:VEVENT\r\nUID:1\r\n",
+        b"END:VEVENT\r\n",
+        b"BEGIN:VEVENT\r\nUID:2\r\n",
+        b"END:VEVENT\r\n",
+        b"END:VCALENDAR\r\n",
+    ]
+
+
+def test_long_lines_are_folded():
+    event = Event()
+    event.add("description", "ü" * 100)
+    chunks = list(event.iter_ical())
+    assert b"\r\n " in chunks[0]
+    assert b"".join(chunks) == event.to_ical()
@@ -1,2 +1,318 @@
+from collections import OrderedDict, namedtuple
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from functools import lru_cache
+from hashlib import sha256
+from icalendar.windows_to_olson import WINDOWS_TO_OLSON
+
+import json
+import os
+import pytz
+import tempfile
+from pytz.tzinfo import DstTzInfo
+
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+# the version of the JSON format of timezone_to_json()
+JSON_VERSION = 1
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+
+# the properties of VTIMEZONE, STANDARD and DAYLIGHT that define a timezone
+TIMEZONE_PROPERTIES = (
+    'TZID', 'DTSTART', 'TZOFFSETFROM', 'TZOFFSETTO', 'TZNAME', 'RRULE',
+    'RDATE',
+)
+
+
+def timezone_hash(timezone):
+    """Return a hash of the content of a VTIMEZONE component.
+
+    Only the properties which define the timezone are included, in a
+    normalized order. Properties like LAST-MODIFIED do not change the hash.
+    """
+    components = []
+    for component in timezone.walk():
+        lines = sorted(
+            component.content_line(name, value)
+            for name, value in component.property_items(recursive=False)
+            if name.upper() in TIMEZONE_PROPERTIES
+        )
+        components.append('\n'.join([component.name] + lines))
+    content = '\n\n'.join(components[:1] + sorted(components[1:]))
+    return sha256(content.encode('utf-8')).hexdigest()
+
+
+class TimezoneCache(MutableMapping):
+    """The timezones of VTIMEZONE components that are not in the tz database.
+
+    This maps a TZID to its timezone. Timezones are compiled by
+    compile() only once for VTIMEZONEs with the same content, as the
+    compiled timezones are cached by timezone_hash(). The compiled
+    timezones are limited to maxsize entries and the least recently used
+    ones are removed first. The TZIDs are never removed, as values with
+    the TZID of a removed timezone would be parsed without timezone.
+
+    If directory is set, compiled timezones are also saved there as JSON
+    files named after their hash, see timezone_to_json(). Other processes
+    that use the same directory load them instead of expanding the rules
+    of the VTIMEZONE again. The directory of the cache of icalendar is
+    taken from the environment variable ICALENDAR_TIMEZONE_CACHE, so that
+    worker processes use it, too.
+    """
+
+    def __init__(self, maxsize=1024, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._timezones = {}
+        self._compiled = OrderedDict()
+
+    @staticmethod
+    def _use(cache, key):
+        """Mark the key as recently used."""
+        try:
+            cache.move_to_end(key)
+        except KeyError:
+            pass
+
+    def _limit(self, cache):
+        while self.maxsize is not None and len(cache) > self.maxsize:
+            cache.popitem(last=False)
+
+    def __getitem__(self, tzid):
+        return self._timezones[tzid]
+
+    def __setitem__(self, tzid, tz):
+        self._timezones[tzid] = tz
+
+    def __delitem__(self, tzid):
+        del self._timezones[tzid]
+
+    def __contains__(self, tzid):
+        return tzid in self._timezones
+
+    def __iter__(self):
+        return iter(list(self._timezones))
+
+    def __len__(self):
+        return len(self._timezones)
+
+    def compile(self, timezone):
+        """Return the timezone of a VTIMEZONE component.
+
+        The timezone is created with Timezone.to_tz() if no VTIMEZONE with
+        the same content was compiled before.
+        """
+        key = timezone_hash(timezone)
+        tz = self._compiled.get(key)
+        if tz is None:
+            self.misses += 1
+            tz = self._load(key)
+            if tz is None:
+                tz = timezone.to_tz()
+                self._save(key, tz)
+            self._compiled[key] = tz
+            self._limit(self._compiled)
+        else:
+            self.hits += 1
+            self._use(self._compiled, key)
+        return tz
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def _load(self, key):
+        """Return the timezone saved in the directory or None."""
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                return timezone_from_json(f.read())
+        except (OSError, ValueError, KeyError, TypeError):
+            # missing, unreadable or broken files are compiled again
+            return None
+
+    def _save(self, key, tz):
+        """Save a timezone in the directory if it is set.
+
+        The file is written under another name and renamed, so that other
+        processes never read it half written.
+        """
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(timezone_to_json(tz))
+                os.replace(path, self._path(key))
+            except BaseException:
+                os.unlink(path)
+                raise
+        except OSError:
+            # the directory is only a cache
+            pass
+
+    def cache_info(self):
+        """Return the hits, misses, maxsize and number of compiled timezones.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize,
+                         len(self._compiled))
+
+    def clear(self):
+        """Remove all timezones and reset the counters."""
+        self._timezones.clear()
+        self._compiled.clear()
+        self.hits = self.misses = 0
+
+
 # we save all timezone with TZIDs unknown to the TZDB in here
-_timezone_cache = {}
+_timezone_cache = TimezoneCache(
+    directory=os.environ.get('ICALENDAR_TIMEZONE_CACHE') or None)
+
+
+@lru_cache(maxsize=4096)
+def _tzdb_timezone(tzid):
+    """Return the timezone of the tz database for a TZID or None."""
+    tzid = tzid.strip('/')
+    try:
+        return pytz.timezone(tzid)
+    except pytz.UnknownTimeZoneError:
+        pass
+    if tzid in WINDOWS_TO_OLSON:
+        return pytz.timezone(WINDOWS_TO_OLSON[tzid])
+    return None
+
+
+def resolve_tzid(tzid):
+    """Return the timezone for the value of a TZID parameter.
+
+    Olson names, also with leading or trailing slashes, and Windows names
+    are looked up in the tz database and the result is remembered. Other
+    TZIDs are looked up in the timezones of the parsed VTIMEZONEs.
+
+    :returns: a tzinfo or None if the TZID is unknown
+    """
+    tz = _tzdb_timezone(tzid)
+    if tz is None:
+        tz = _timezone_cache.get(tzid)
+    return tz
+
+
+def _make_timezone(zone, transition_times, transition_info):
+    """Create a pytz timezone from its transitions.
+
+    :param zone: the name of the timezone
+    :param transition_times: the UTC times of the transitions
+    :param transition_info: (utcoffset, dstoffset, name) for each transition
+    """
+    cls = type(zone, (DstTzInfo,), {
+        'zone': zone,
+        '_utc_transition_times': transition_times,
+        '_transition_info': transition_info,
+        '__reduce__': _reduce_timezone,
+    })
+
+    return cls()
+
+
+def _reduce_timezone(tz):
+    """Pickle a timezone created by Timezone.to_tz() together with its
+    transitions, as it is not known to pytz.
+    """
+    return _unpickle_timezone, (
+        tz.zone, tz._utc_transition_times, tz._transition_info,
+        tz._utcoffset, tz._dst, tz._tzname)
+
+
+def _unpickle_timezone(zone, transition_times, transition_info,
+                       utcoffset, dstoffset, tzname):
+    """Restore a pickled timezone, see _reduce_timezone().
+
+    The cached timezone is used if it has the same transitions. Otherwise,
+    a new timezone is returned without adding it to the _timezone_cache,
+    as unpickling must not change how TZIDs are parsed.
+    """
+    tz = _timezone_cache.get(zone)
+    if tz is None or tz._utc_transition_times != transition_times or \
+            tz._transition_info != transition_info:
+        tz = _make_timezone(zone, transition_times, transition_info)
+    # like pytz._p()
+    inf = (utcoffset, dstoffset, tzname)
+    try:
+        return tz._tzinfos[inf]
+    except KeyError:
+        pass
+    for localized_tz in tz._tzinfos.values():
+        if localized_tz._utcoffset == utcoffset and \
+                localized_tz._dst == dstoffset:
+            return localized_tz
+    tz._tzinfos[inf] = tz.__class__(inf, tz._tzinfos)
+    return tz._tzinfos[inf]
+
+
+def timezone_to_json(tz):
+    """Return the transitions of a timezone as JSON.
+
+    The JSON contains the zone, the UTC transition times in seconds since
+    the epoch and the UTC offset, DST offset and name after each
+    transition. timezone_from_json() creates the timezone again without
+    expanding the rules of its VTIMEZONE.
+
+    >>> from icalendar import Calendar
+    >>> calendar = Calendar.from_ical('''BEGIN:VCALENDAR
+    ... BEGIN:VTIMEZONE
+    ... TZID:Custom/Kathmandu
+    ... BEGIN:STANDARD
+    ... DTSTART:19700101T000000
+    ... TZOFFSETFROM:+0545
+    ... TZOFFSETTO:+0545
+    ... TZNAME:+0545
+    ... END:STANDARD
+    ... END:VTIMEZONE
+    ... END:VCALENDAR''')
+    >>> tz = calendar.walk('VTIMEZONE')[0].to_tz()
+    >>> timezone_to_json(tz)
+    '{"version":1,"zone":"Custom/Kathmandu","transitions":[[-20700,20700,0,"+0545"]]}'
+
+    :param tz: a pytz timezone with transitions, e.g. of Timezone.to_tz()
+    :raises TypeError: if the timezone has no transitions
+    """
+    if not isinstance(tz, DstTzInfo):
+        raise TypeError(f'{tz!r} is not a timezone with transitions')
+    transitions = [
+        [(transition_time - EPOCH) // SECOND, utcoffset // SECOND,
+         dstoffset // SECOND, name]
+        for transition_time, (utcoffset, dstoffset, name)
+        in zip(tz._utc_transition_times, tz._transition_info)
+    ]
+    return json.dumps({
+        'version': JSON_VERSION,
+        'zone': tz.zone,
+        'transitions': transitions,
+    }, ensure_ascii=False, separators=(',', ':'))
+
+
+def timezone_from_json(data):
+    """Create a timezone from the JSON of timezone_to_json().
+
+    :param data: the JSON as str or bytes
+    :raises ValueError: if the data is not JSON of a supported version
+    """
+    content = json.loads(data)
+    if not isinstance(content, dict):
+        raise ValueError('The timezone JSON is not an object.')
+    if content.get('version') != JSON_VERSION:
+        raise ValueError(
+            f'Unsupported timezone JSON version {content.get("version")!r}')
+    transition_times = []
+    transition_info = []
+    for transition_time, utcoffset, dstoffset, name in content['transitions']:
+        transition_times.append(EPOCH + transition_time * SECOND)
+        transition_info.append(
+            (utcoffset * SECOND, dstoffset * SECOND, name))
+    return _make_timezone(content['zone'], transition_times, transition_info)